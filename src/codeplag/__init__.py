@@ -3,7 +3,6 @@ from codeplag.types import ExitCode
 
 def main() -> ExitCode:
     import argcomplete
-    import pandas as pd
 
     from codeplag.codeplagcli import CodeplagCLI
     from codeplag.config import read_settings_conf
@@ -13,9 +12,6 @@ def main() -> ExitCode:
     from codeplag.translate import get_translations
     from codeplag.utils import CodeplagEngine
 
-    pd.set_option("display.float_format", "{:,.2%}".format)
-    pd.set_option("display.max_colwidth", None)
-
     translations = get_translations()
     translations.install()
 
@@ -23,7 +19,7 @@ def main() -> ExitCode:
     argcomplete.autocomplete(cli)
     parsed_args = vars(cli.parse_args())
     settings_conf = read_settings_conf()
-    set_handlers(logger, LOG_PATH, settings_conf["log_level"])
+    set_handlers(logger, LOG_PATH, settings_conf["log_level"], settings_conf["log_trace_sampling"])
     try:
         codeplag_util = CodeplagEngine(parsed_args)
         code = codeplag_util.run()
@@ -4,20 +4,83 @@ from datetime import datetime
 
 import numpy as np
 
-from codeplag.algorithms.featurebased import counter_metric, struct_compare
-from codeplag.algorithms.tokenbased import value_jakkar_coef
-from codeplag.consts import DEFAULT_MAX_DEPTH, DEFAULT_NGRAMS_LENGTH, DEFAULT_WEIGHTS
+from codeplag.algorithms.featurebased import (
+    compare_sections,
+    counter_metric,
+    counter_metric_upper_bound,
+    get_structure_view,
+    identical_compare_sections,
+)
+from codeplag.algorithms.tokenbased import (
+    generate_ngrams,
+    jakkar_coef_from_ngrams,
+    jakkar_coef_upper_bound,
+    value_fingerprints_coef,
+    value_jakkar_coef,
+)
+from codeplag.consts import (
+    DEFAULT_MAX_DEPTH,
+    DEFAULT_NGRAMS_LENGTH,
+    DEFAULT_STRUCTURE_ASSIGNMENT,
+    DEFAULT_STRUCTURE_CANDIDATES,
+    DEFAULT_WEIGHTS,
+)
+from codeplag.stats import (
+    PAIRS_IDENTICAL,
+    STAGE_FAST_METRICS,
+    STAGE_STRUCTURE_METRICS,
+    run_stats,
+)
 from codeplag.types import (
     ASTFeatures,
     FastCompareInfo,
     FullCompareInfo,
     MaxDepth,
     NgramsLength,
+    StructureAssignment,
     StructureCompareInfo,
+    StructureView,
     Threshold,
 )
 
 
+def get_features_structure_view(features: ASTFeatures, max_depth: MaxDepth) -> StructureView:
+    """Returns the structure view of the work for the max depth and caches it in the work.
+
+    The view is calculated once per work instead of on each comparison, and when it is
+    calculated before the work is sent to a worker process, the process gets it ready.
+
+    Args:
+    ----
+        features (ASTFeatures): The features of the work.
+        max_depth (MaxDepth): Max depth of the AST structure which play role in
+          calculations.
+
+    """
+    view = features.structure_view
+    if view is None or view.max_depth != max_depth:
+        view = get_structure_view(features.structure, max_depth)
+        features.structure_view = view
+    return view
+
+
+def is_same_structure(features1: ASTFeatures, features2: ASTFeatures) -> bool:
+    """Returns True when the works have the same structure of the AST.
+
+    The hashes of the structures are compared first, so the structures themselves are
+    compared only for the probable copies.
+
+    Args:
+    ----
+        features1 (ASTFeatures): The features of the first work.
+        features2 (ASTFeatures): The features of the second work.
+
+    """
+    return bool(features1.sha256) and (
+        features1.sha256 == features2.sha256 and features1.structure == features2.structure
+    )
+
+
 def fast_compare(
     features1: ASTFeatures,
     features2: ASTFeatures,
@@ -27,7 +90,8 @@ def fast_compare(
     """Returns comparison result of two works compared by fast algorithms.
 
     Calculates the similarity of features of two programs using four algorithms, calculates their
-    weighted average, and returns all of this  in 'FastCompareInfo' structure.
+    weighted average, and returns all of this  in 'FastCompareInfo' structure. The overlap of
+    winnowing fingerprints is returned too, but it doesn't participate in the weighted average.
 
     Args:
     ----
@@ -46,30 +110,144 @@ def fast_compare(
     ops_res = counter_metric(features1.operators, features2.operators)
     kw_res = counter_metric(features1.keywords, features2.keywords)
     lits_res = counter_metric(features1.literals, features2.literals)
-    weighted_average = np.average(
-        np.array([jakkar_coef, ops_res, kw_res, lits_res]), weights=weights
-    )
+    fingerprints_res = value_fingerprints_coef(features1.fingerprints, features2.fingerprints)
+    weighted_average = _get_weighted_average([jakkar_coef, ops_res, kw_res, lits_res], weights)
 
     fast_metrics = FastCompareInfo(
         jakkar=jakkar_coef,
         operators=ops_res,
         keywords=kw_res,
         literals=lits_res,
-        weighted_average=float(weighted_average),
+        fingerprints=fingerprints_res,
+        weighted_average=weighted_average,
     )
 
     return fast_metrics
 
 
+def calc_min_ngrams_ratio(
+    threshold: Threshold | None,
+    weights: tuple[float, float, float, float] = DEFAULT_WEIGHTS,
+) -> float:
+    """Returns the minimal ratio of the unique N-grams counts of works which may be similar.
+
+    The Jakkar coefficient can't be greater than the ratio of the smaller N-grams set size to
+    the bigger one, and the other fast metrics can't be greater than 1.0, so the works with
+    the lower ratio can't reach the threshold.
+
+    Args:
+    ----
+        threshold (Threshold | None): The threshold of plagiarism searcher alarm.
+        weights: Weights of fast metrics that participate in
+          counting total similarity coefficient.
+
+    """
+    if not threshold or weights[0] == 0:
+        return 0.0
+    ratio = (threshold / 100.0 * sum(weights) - sum(weights[1:])) / weights[0]
+    # Keeps the bound conservative with respect to the floating point rounding.
+    return max(ratio - 1e-9, 0.0)
+
+
+def _get_weighted_average(
+    values: list[float], weights: tuple[float, float, float, float]
+) -> float:
+    # Equal to 'np.average' of the four values, but without the conversions to arrays
+    weighted_sum = sum(value * weight for value, weight in zip(values, weights, strict=True))
+    return weighted_sum / sum(weights)
+
+
+def _is_below_threshold(weighted_average: float, threshold: Threshold) -> bool:
+    """Returns True when the works with the weighted average of fast metrics aren't similar.
+
+    The same check is used by the early termination of 'bounded_fast_compare' and by
+    'compare_works', so they never disagree because of the floating point rounding.
+    """
+    return (weighted_average * 100.0) < threshold
+
+
+def _create_fast_compare_info(
+    values: list[float],
+    weights: tuple[float, float, float, float],
+    fingerprints_res: float = 1.0,
+) -> FastCompareInfo:
+    jakkar_coef, ops_res, kw_res, lits_res = values
+    return FastCompareInfo(
+        jakkar=jakkar_coef,
+        operators=ops_res,
+        keywords=kw_res,
+        literals=lits_res,
+        fingerprints=fingerprints_res,
+        weighted_average=_get_weighted_average(values, weights),
+    )
+
+
+def bounded_fast_compare(
+    features1: ASTFeatures,
+    features2: ASTFeatures,
+    threshold: Threshold,
+    ngrams_length: NgramsLength = DEFAULT_NGRAMS_LENGTH,
+    weights: tuple[float, float, float, float] = DEFAULT_WEIGHTS,
+) -> FastCompareInfo:
+    """Returns comparison result of two works calculated only as far as the threshold requires.
+
+    The metrics are calculated from the cheapest to the most expensive one: totals of the
+    counters, the counter metrics, sizes of the N-grams sets, and the Jakkar coefficient.
+    Not calculated metrics are replaced with their upper bounds, and the evaluation stops
+    as soon as the weighted average of the bounds can't reach the threshold. In that case
+    the returned 'FastCompareInfo' holds the upper bounds instead of the skipped metrics
+    (1.0 for the fingerprints), so its weighted average is an upper bound too. Otherwise,
+    the result is equal to the 'fast_compare' one.
+
+    Args:
+    ----
+        features1 (ASTFeatures): The features of the first source file.
+        features2 (ASTFeatures): The features of the second source file.
+        threshold (Threshold): The threshold of plagiarism searcher alarm.
+        ngrams_length (NgramsLength): N-grams length.
+        weights: Weights of fast metrics that participate in
+          counting total similarity coefficient.
+
+    """
+    counters = (
+        (features1.operators, features2.operators),
+        (features1.keywords, features2.keywords),
+        (features1.literals, features2.literals),
+    )
+    values = [1.0, *(counter_metric_upper_bound(first, second) for first, second in counters)]
+    if _is_below_threshold(_get_weighted_average(values, weights), threshold):
+        return _create_fast_compare_info(values, weights)
+
+    values[1:] = [counter_metric(first, second) for first, second in counters]
+    if _is_below_threshold(_get_weighted_average(values, weights), threshold):
+        return _create_fast_compare_info(values, weights)
+
+    ngrams_first = generate_ngrams(features1.tokens, ngrams_length, hashit=True, unique=True)
+    ngrams_second = generate_ngrams(features2.tokens, ngrams_length, hashit=True, unique=True)
+    values[0] = jakkar_coef_upper_bound(len(ngrams_first), len(ngrams_second))
+    if _is_below_threshold(_get_weighted_average(values, weights), threshold):
+        return _create_fast_compare_info(values, weights)
+
+    values[0] = jakkar_coef_from_ngrams(ngrams_first, ngrams_second)
+    fingerprints_res = value_fingerprints_coef(features1.fingerprints, features2.fingerprints)
+    return _create_fast_compare_info(values, weights, fingerprints_res)
+
+
 def compare_works(
     features1: ASTFeatures,
     features2: ASTFeatures,
     ngrams_length: NgramsLength = DEFAULT_NGRAMS_LENGTH,
     max_depth: MaxDepth = DEFAULT_MAX_DEPTH,
     threshold: Threshold | None = None,
+    bounded: bool = False,
+    structure_candidates: int = DEFAULT_STRUCTURE_CANDIDATES,
+    structure_assignment: StructureAssignment = DEFAULT_STRUCTURE_ASSIGNMENT,
 ) -> FastCompareInfo | FullCompareInfo:
     """The function returns the complex result of comparing two works.
 
+    When the works have the same structure, its similarity is 1.0 without comparison and
+    the compliance matrix matches each top-level node with itself.
+
     Args:
     ----
         features1 (ASTFeatures): The features of the first work.
@@ -78,6 +256,14 @@ def compare_works(
         max_depth (MaxDepth | None): Max depth of the AST structure which play role in
           calculations.
         threshold (Threshold | None): The threshold of plagiarism searcher alarm.
+        bounded (bool): When True and the threshold is set, fast metrics are calculated
+          with early termination, so the returned 'FastCompareInfo' of the works that
+          don't reach the threshold may contain upper bounds of the skipped metrics.
+        structure_candidates (int): When greater than zero, the structure similarity is
+          calculated approximately, comparing each top-level node only with this count
+          of the most likely matching nodes (see 'struct_compare').
+        structure_assignment (StructureAssignment): The algorithm of matching of the
+          top-level nodes of the works (see 'matrix_value').
 
     Returns:
     -------
@@ -88,19 +274,36 @@ def compare_works(
         metric anywhere (FullCompareInfo).
 
     """
-    fast_compare_info = fast_compare(features1, features2, ngrams_length)
-    if threshold and (fast_compare_info.weighted_average * 100.0) < threshold:
+    with run_stats.timer(STAGE_FAST_METRICS):
+        if bounded and threshold:
+            fast_compare_info = bounded_fast_compare(
+                features1, features2, threshold, ngrams_length
+            )
+        else:
+            fast_compare_info = fast_compare(features1, features2, ngrams_length)
+    if threshold and _is_below_threshold(fast_compare_info.weighted_average, threshold):
         return fast_compare_info
 
     features1, features2 = sorted([features1, features2])
-    compliance_matrix = np.empty(
-        (len(features1.head_nodes), len(features2.head_nodes), 2), dtype=np.int64
-    )
-    struct_res = struct_compare(
-        [node for node in features1.structure if node.depth <= max_depth],
-        [node for node in features2.structure if node.depth <= max_depth],
-        compliance_matrix,
-    )
+    with run_stats.timer(STAGE_STRUCTURE_METRICS):
+        compliance_matrix = np.empty(
+            (len(features1.head_nodes), len(features2.head_nodes), 2), dtype=np.int64
+        )
+        view1 = get_features_structure_view(features1, max_depth)
+        view2 = get_features_structure_view(features2, max_depth)
+        if is_same_structure(features1, features2):
+            run_stats.increase(PAIRS_IDENTICAL)
+            struct_res = identical_compare_sections(view1.children_indexes, compliance_matrix)
+        else:
+            struct_res = compare_sections(
+                view1.structure,
+                view1.children_indexes,
+                view2.structure,
+                view2.children_indexes,
+                compliance_matrix,
+                candidates=structure_candidates,
+                assignment=structure_assignment,
+            )
     struct_res = struct_res[0] / struct_res[1]
 
     structure_info = StructureCompareInfo(
@@ -1,8 +1,9 @@
-from typing import Mapping
+from typing import Callable, Final, Mapping
 
 import numpy as np
 
-from codeplag.types import NodeStructurePlace
+from codeplag.consts import DEFAULT_STRUCTURE_ASSIGNMENT
+from codeplag.types import NodeStructurePlace, StructureAssignment, StructureView
 
 
 def counter_metric(counter1: Mapping[str, int], counter2: Mapping[str, int]) -> float:
@@ -38,6 +39,31 @@ def counter_metric(counter1: Mapping[str, int], counter2: Mapping[str, int]) ->
     return percent_of_same_numerator / percent_of_same_denominator
 
 
+def counter_metric_upper_bound(counter1: Mapping[str, int], counter2: Mapping[str, int]) -> float:
+    """Returns the upper bound of the 'counter_metric' value calculated from totals only.
+
+    The numerator of the metric can't be greater than the smaller total count and the
+    denominator can't be less than the bigger one.
+
+    Args:
+    ----
+        counter1 (Mapping[str, int]): dict object with counts of operators or keywords
+          or literals.
+        counter2 (Mapping[str, int]): dict object with counts of operators or keywords
+          or literals.
+
+    """
+    if len(counter1) == 0 and len(counter2) == 0:
+        return 1.0
+
+    total1 = sum(counter1.values())
+    total2 = sum(counter2.values())
+    if total1 == 0 or total2 == 0:
+        return 0.0
+
+    return min(total1, total2) / max(total1, total2)
+
+
 def op_shift_metric(ops1: list[str], ops2: list[str]) -> tuple[int, float]:
     """Return the maximum value of the operator match and the shift under this condition.
 
@@ -136,34 +162,142 @@ def find_max_index(array: np.ndarray) -> np.ndarray:
     return index
 
 
-def matrix_value(array: np.ndarray) -> tuple[list, list]:
-    """The function returns the value of the similarity of nodes from the compliance matrix.
+def get_ratios(array: np.ndarray) -> np.ndarray:
+    """The function returns similarity ratios of the cells of the compliance matrix.
 
     Args:
     ----
         array (np.ndarray): matrix of compliance.
 
+    """
+    ratios = np.zeros(array.shape[:2], dtype=np.float64)
+    if ratios.size == 0:
+        return ratios
+    np.divide(array[..., 0], array[..., 1], out=ratios, where=array[..., 1] != 0)
+    return ratios
+
+
+def greedy_assignment(ratios: np.ndarray) -> list[tuple[int, int]]:
+    """The function greedily matches rows with columns in descending order of the ratios.
+
+    The result is the same as repeated selection of the maximal ratio with the
+    'find_max_index' and zeroing of the selected row and column, but all cells are sorted
+    only once. Cells with zero ratios are not matched.
+
+    Args:
+    ----
+        ratios (np.ndarray): similarity ratios of the compliance matrix cells.
+
+    Complexity:
+        rows = ratios.shape[0]
+        columns = ratios.shape[1]
+        O(rows * columns * log(rows * columns))
+
+    """
+    count_of_pairs = min(ratios.shape)
+    # The stable sort keeps the row-major order of equal ratios like the 'find_max_index'
+    order = np.argsort(-ratios, axis=None, kind="stable")
+    order = order[: np.count_nonzero(ratios > 0)]
+    used_rows = [False] * ratios.shape[0]
+    used_columns = [False] * ratios.shape[1]
+    pairs = []
+    rows, columns = np.unravel_index(order, ratios.shape)
+    for row, column in zip(rows.tolist(), columns.tolist(), strict=True):
+        if used_rows[row] or used_columns[column]:
+            continue
+        used_rows[row] = True
+        used_columns[column] = True
+        pairs.append((row, column))
+        if len(pairs) == count_of_pairs:
+            break
+
+    return pairs
+
+
+def optimal_assignment(ratios: np.ndarray) -> list[tuple[int, int]]:
+    """The function matches rows with columns so that the sum of the ratios is maximal.
+
+    The Hungarian algorithm with potentials is used, the operations over all columns of
+    the matrix are vectorized. In case of several optimal assignments, the result is the
+    same on each call.
+
+    Args:
+    ----
+        ratios (np.ndarray): similarity ratios of the compliance matrix cells.
+
     Complexity:
-        rows = array.shape[0]
-        columns = array.shape[1]
-        O(min(rows, columns) * rows * columns)
+        rows = ratios.shape[0]
+        columns = ratios.shape[1]
+        O(min(rows, columns) ** 2 * max(rows, columns))
+
+    """
+    transposed = ratios.shape[0] > ratios.shape[1]
+    cost = -(ratios.T if transposed else ratios)
+    count_of_rows, count_of_columns = cost.shape
+    # Index 0 is the fictitious column, rows in 'matches' are numbered from 1.
+    row_potentials = np.zeros(count_of_rows + 1, dtype=np.float64)
+    column_potentials = np.zeros(count_of_columns + 1, dtype=np.float64)
+    matches = np.zeros(count_of_columns + 1, dtype=np.int64)
+    previous = np.zeros(count_of_columns + 1, dtype=np.int64)
+    for row in range(1, count_of_rows + 1):
+        matches[0] = row
+        column = 0
+        min_values = np.full(count_of_columns + 1, np.inf)
+        used = np.zeros(count_of_columns + 1, dtype=np.bool_)
+        while matches[column] != 0:
+            used[column] = True
+            current_row = matches[column]
+            reduced = cost[current_row - 1] - row_potentials[current_row] - column_potentials[1:]
+            update = ~used[1:] & (reduced < min_values[1:])
+            min_values[1:][update] = reduced[update]
+            previous[1:][update] = column
+            free_values = np.where(used[1:], np.inf, min_values[1:])
+            next_column = int(np.argmin(free_values)) + 1
+            delta = free_values[next_column - 1]
+            row_potentials[matches[used]] += delta
+            column_potentials[used] -= delta
+            min_values[1:][~used[1:]] -= delta
+            column = next_column
+        while column != 0:
+            previous_column = previous[column]
+            matches[column] = matches[previous_column]
+            column = previous_column
+
+    pairs = [
+        (int(matches[column]) - 1, column - 1)
+        for column in range(1, count_of_columns + 1)
+        if matches[column] != 0
+    ]
+    if transposed:
+        pairs = [(column, row) for row, column in pairs]
+
+    return sorted(pairs)
+
+
+ASSIGNMENTS: Final[dict[StructureAssignment, Callable[[np.ndarray], list[tuple[int, int]]]]] = {
+    "greedy": greedy_assignment,
+    "optimal": optimal_assignment,
+}
+
+
+def matrix_value(
+    array: np.ndarray, assignment: StructureAssignment = DEFAULT_STRUCTURE_ASSIGNMENT
+) -> tuple[list, list]:
+    """The function returns the value of the similarity of nodes from the compliance matrix.
+
+    Args:
+    ----
+        array (np.ndarray): matrix of compliance.
+        assignment (StructureAssignment): 'greedy' matches the most similar nodes first,
+          'optimal' maximizes the sum of similarities of the matched nodes.
 
     """
     same_struct_metric = [1, 1]
-    minimal = min(array.shape[0], array.shape[1])
     indexes = []
-    for _ in np.arange(0, minimal, 1):
-        ind = find_max_index(array)
-        indexes.append(ind)
-        same_struct_metric[0] += array[ind[0]][ind[1]][0]
-        same_struct_metric[1] += array[ind[0]][ind[1]][1]
-
-        # Zeroing row
-        for row in np.arange(0, array.shape[1], 1):
-            array[ind[0]][row] = [0, 0]
-        # Zeroing column
-        for col in np.arange(0, array.shape[0], 1):
-            array[col][ind[1]] = [0, 0]
+    for row, column in ASSIGNMENTS[assignment](get_ratios(array)):
+        indexes.append(np.array([row, column], dtype=np.int64))
+        same_struct_metric[0] += int(array[row][column][0])
+        same_struct_metric[1] += int(array[row][column][1])
 
     return same_struct_metric, indexes
 
@@ -200,10 +334,225 @@ def add_not_counted(
     return count
 
 
+def get_sections_histograms(
+    tree1: list[NodeStructurePlace],
+    key_indexes1: list[int],
+    tree2: list[NodeStructurePlace],
+    key_indexes2: list[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    """The function returns histograms of the nodes depths of top-level sections of two trees.
+
+    The section consists of the top-level node and all its descendants. The depths are
+    counted from the top level of the tree, so the histograms of both trees can be compared
+    with each other. Node identifiers are not used because they are numbered separately
+    in each work and the structure comparison doesn't depend on them.
+
+    Args:
+    ----
+        tree1 (list[NodeStructurePlace]): a simple structure of the first AST.
+        key_indexes1 (list[int]): indexes of top-level nodes in the first tree
+          and the count of its nodes.
+        tree2 (list[NodeStructurePlace]): a simple structure of the second AST.
+        key_indexes2 (list[int]): indexes of top-level nodes in the second tree
+          and the count of its nodes.
+
+    """
+    depths = [
+        np.array([node[0] for node in tree], dtype=np.int64) - tree[0][0]
+        for tree in (tree1, tree2)
+    ]
+    count_of_depths = max(int(tree_depths.max()) for tree_depths in depths) + 1
+    histograms = []
+    for key_indexes, tree_depths in zip((key_indexes1, key_indexes2), depths, strict=True):
+        sections_sizes = np.diff(key_indexes)
+        histogram = np.zeros((len(sections_sizes), count_of_depths), dtype=np.int64)
+        np.add.at(
+            histogram,
+            (np.repeat(np.arange(len(sections_sizes)), sections_sizes), tree_depths),
+            1,
+        )
+        histograms.append(histogram)
+
+    return histograms[0], histograms[1]
+
+
+def select_candidates(
+    histograms1: np.ndarray, histograms2: np.ndarray, candidates: int
+) -> list[np.ndarray]:
+    """The function returns the most similar sections of the second tree for each first one.
+
+    The sections are scored with the Jakkar coefficient of their multisets of nodes depths,
+    in case of equal scores the section with the lower index is preferred.
+
+    Args:
+    ----
+        histograms1 (np.ndarray): histograms of nodes depths of the first tree sections.
+        histograms2 (np.ndarray): histograms of nodes depths of the second tree sections.
+        candidates (int): count of the selected sections of the second tree.
+
+    """
+    totals2 = histograms2.sum(axis=1)
+    selected = []
+    for histogram in histograms1:
+        intersection = np.minimum(histogram, histograms2).sum(axis=1)
+        scores = intersection / (histogram.sum() + totals2 - intersection)
+        selected.append(np.argsort(-scores, kind="stable")[:candidates])
+
+    return selected
+
+
+def sparse_matrix_value(
+    cells: dict[tuple[int, int], list[int]],
+    shape: tuple[int, int],
+    assignment: StructureAssignment = DEFAULT_STRUCTURE_ASSIGNMENT,
+) -> tuple[list, list]:
+    """The function returns the value of the similarity of nodes from the sparse matrix.
+
+    The nodes are matched in the same way as the 'matrix_value' matches them, but only
+    among the calculated cells.
+
+    Args:
+    ----
+        cells (dict[tuple[int, int], list[int]]): calculated cells of the compliance matrix.
+        shape (tuple[int, int]): count of rows and columns of the compliance matrix.
+        assignment (StructureAssignment): algorithm of matching of the nodes.
+
+    """
+    ratios = np.zeros(shape, dtype=np.float64)
+    for (row, column), value in cells.items():
+        ratios[row][column] = value[0] / value[1]
+
+    same_struct_metric = [1, 1]
+    indexes = []
+    for row, column in ASSIGNMENTS[assignment](ratios):
+        value = cells.get((row, column))
+        if value is None:
+            continue
+        indexes.append(np.array([row, column], dtype=np.int64))
+        same_struct_metric[0] += value[0]
+        same_struct_metric[1] += value[1]
+
+    return same_struct_metric, indexes
+
+
+def approximate_compare_sections(
+    tree1: list[NodeStructurePlace],
+    key_indexes1: list[int],
+    tree2: list[NodeStructurePlace],
+    key_indexes2: list[int],
+    candidates: int,
+    assignment: StructureAssignment = DEFAULT_STRUCTURE_ASSIGNMENT,
+) -> tuple[list, list, dict[tuple[int, int], list[int]]]:
+    """The function compares top-level sections of two trees only with the likely matches.
+
+    Each section of the first tree is compared recursively only with the 'candidates'
+    sections of the second tree with the most similar distribution of nodes depths.
+    After the matching, the remaining unmatched sections are paired in order of their
+    positions.
+
+    Args:
+    ----
+        tree1 (list[NodeStructurePlace]): a simple structure of the first AST.
+        key_indexes1 (list[int]): indexes of top-level nodes in the first tree
+          and the count of its nodes.
+        tree2 (list[NodeStructurePlace]): a simple structure of the second AST.
+        key_indexes2 (list[int]): indexes of top-level nodes in the second tree
+          and the count of its nodes.
+        candidates (int): count of the compared sections of the second tree
+          for each section of the first tree.
+        assignment (StructureAssignment): algorithm of matching of the sections.
+
+    Returns:
+    -------
+        The similarity metric, indexes of the matched sections, and calculated cells
+        of the compliance matrix.
+
+    """
+    sections1 = [
+        tree1[key_indexes1[i] + 1 : key_indexes1[i + 1]] for i in range(len(key_indexes1) - 1)
+    ]
+    sections2 = [
+        tree2[key_indexes2[j] + 1 : key_indexes2[j + 1]] for j in range(len(key_indexes2) - 1)
+    ]
+    cells: dict[tuple[int, int], list[int]] = {}
+    histograms1, histograms2 = get_sections_histograms(tree1, key_indexes1, tree2, key_indexes2)
+    for i, columns in enumerate(select_candidates(histograms1, histograms2, candidates)):
+        for j in columns.tolist():
+            cells[(i, j)] = struct_compare(
+                sections1[i], sections2[j], candidates=candidates, assignment=assignment
+            )
+
+    same_struct_metric, indexes = sparse_matrix_value(
+        cells, (len(sections1), len(sections2)), assignment
+    )
+    matched_rows = {int(index[0]) for index in indexes}
+    matched_columns = {int(index[1]) for index in indexes}
+    for i, j in zip(
+        (i for i in range(len(sections1)) if i not in matched_rows),
+        (j for j in range(len(sections2)) if j not in matched_columns),
+        strict=False,
+    ):
+        cells[(i, j)] = struct_compare(
+            sections1[i], sections2[j], candidates=candidates, assignment=assignment
+        )
+        indexes.append(np.array([i, j], dtype=np.int64))
+        same_struct_metric[0] += cells[(i, j)][0]
+        same_struct_metric[1] += cells[(i, j)][1]
+
+    return same_struct_metric, indexes, cells
+
+
+def exact_compare_sections(
+    tree1: list[NodeStructurePlace],
+    key_indexes1: list[int],
+    tree2: list[NodeStructurePlace],
+    key_indexes2: list[int],
+    matrix: np.ndarray,
+    candidates: int = 0,
+    assignment: StructureAssignment = DEFAULT_STRUCTURE_ASSIGNMENT,
+) -> tuple[list, list]:
+    """The function compares each top-level section of the first tree with each second one.
+
+    Args:
+    ----
+        tree1 (list[NodeStructurePlace]): a simple structure of the first AST.
+        key_indexes1 (list[int]): indexes of top-level nodes in the first tree
+          and the count of its nodes.
+        tree2 (list[NodeStructurePlace]): a simple structure of the second AST.
+        key_indexes2 (list[int]): indexes of top-level nodes in the second tree
+          and the count of its nodes.
+        matrix (np.ndarray): compliance matrix of comparing trees.
+        candidates (int): count of the compared sections in the nested levels
+          (see 'struct_compare').
+        assignment (StructureAssignment): algorithm of matching of the sections.
+
+    """
+    count_of_children1 = len(key_indexes1) - 1
+    count_of_children2 = len(key_indexes2) - 1
+    array = np.empty((count_of_children1, count_of_children2, 2), dtype=np.int64)
+
+    for i in np.arange(0, count_of_children1, 1):
+        section1 = tree1[key_indexes1[i] + 1 : key_indexes1[i + 1]]
+        for j in np.arange(0, count_of_children2, 1):
+            section2 = tree2[key_indexes2[j] + 1 : key_indexes2[j + 1]]
+            array[i][j] = struct_compare(
+                section1, section2, candidates=candidates, assignment=assignment
+            )
+
+    if matrix.size != 0:
+        for i in np.arange(0, count_of_children1, 1):
+            for j in np.arange(0, count_of_children2, 1):
+                matrix[i][j] = array[i][j]
+
+    return matrix_value(array, assignment)
+
+
 def struct_compare(
     tree1: list[NodeStructurePlace],
     tree2: list[NodeStructurePlace],
     matrix: np.ndarray | None = None,
+    candidates: int = 0,
+    assignment: StructureAssignment = DEFAULT_STRUCTURE_ASSIGNMENT,
 ) -> list:
     """Function for compare structure of two trees.
 
@@ -212,6 +561,101 @@ def struct_compare(
         tree1 (list[NodeStructurePlace]): a simple structure of the first AST.
         tree2 (list[NodeStructurePlace]): a simple structure of the second AST.
         matrix (np.ndarray | None): compliance matrix of comparing trees.
+        candidates (int): When greater than zero, each top-level node of the first tree
+          is compared only with this count of the most likely matching nodes of the second
+          tree (see 'approximate_compare_sections'). The not calculated cells of the
+          compliance matrix are set to [0, 1].
+        assignment (StructureAssignment): algorithm of matching of the top-level nodes
+          of two trees (see 'matrix_value').
+
+    """
+    return compare_sections(
+        tree1,
+        get_sections_boundaries(tree1),
+        tree2,
+        get_sections_boundaries(tree2),
+        matrix,
+        candidates,
+        assignment,
+    )
+
+
+def get_sections_boundaries(tree: list[NodeStructurePlace]) -> list[int]:
+    """The function returns indexes of the top-level nodes followed by the count of nodes.
+
+    Args:
+    ----
+        tree (list[NodeStructurePlace]): a simple structure of the AST.
+
+    """
+    count_of_nodes = len(tree)
+    key_indexes, _ = get_children_indexes(tree, count_of_nodes)
+    key_indexes.append(count_of_nodes)
+    return key_indexes
+
+
+def get_structure_view(structure: list[NodeStructurePlace], max_depth: int) -> StructureView:
+    """The function returns the structure truncated by the max depth ready for comparison.
+
+    When the structure has no deeper nodes, the view refers to the same list.
+
+    Args:
+    ----
+        structure (list[NodeStructurePlace]): a simple structure of the AST.
+        max_depth (int): max depth of the nodes which play role in calculations.
+
+    """
+    if any(node[0] > max_depth for node in structure):
+        structure = [node for node in structure if node[0] <= max_depth]
+    return StructureView(max_depth, structure, get_sections_boundaries(structure))
+
+
+def identical_compare_sections(key_indexes: list[int], matrix: np.ndarray | None = None) -> list:
+    """The function returns the result of comparing the tree with itself without comparison.
+
+    Each top-level section is matched with itself, so only the diagonal cells of the
+    compliance matrix are filled with sizes of the sections; the other cells are set
+    to [0, 1] as not calculated ones.
+
+    Args:
+    ----
+        key_indexes (list[int]): indexes of top-level nodes in the tree
+          and the count of its nodes (see 'get_sections_boundaries').
+        matrix (np.ndarray | None): compliance matrix of comparing trees.
+
+    """
+    sizes = np.diff(np.array(key_indexes, dtype=np.int64))
+    if matrix is not None and matrix.size != 0:
+        matrix[:] = (0, 1)
+        diagonal = np.arange(sizes.size)
+        matrix[diagonal, diagonal] = sizes[:, np.newaxis]
+
+    count_of_nodes = key_indexes[-1] if key_indexes else 0
+    return [count_of_nodes + 1, count_of_nodes + 1]
+
+
+def compare_sections(
+    tree1: list[NodeStructurePlace],
+    key_indexes1: list[int],
+    tree2: list[NodeStructurePlace],
+    key_indexes2: list[int],
+    matrix: np.ndarray | None = None,
+    candidates: int = 0,
+    assignment: StructureAssignment = DEFAULT_STRUCTURE_ASSIGNMENT,
+) -> list:
+    """Function for compare structure of two trees with known boundaries of the sections.
+
+    Args:
+    ----
+        tree1 (list[NodeStructurePlace]): a simple structure of the first AST.
+        key_indexes1 (list[int]): indexes of top-level nodes in the first tree
+          and the count of its nodes (see 'get_sections_boundaries').
+        tree2 (list[NodeStructurePlace]): a simple structure of the second AST.
+        key_indexes2 (list[int]): indexes of top-level nodes in the second tree
+          and the count of its nodes.
+        matrix (np.ndarray | None): compliance matrix of comparing trees.
+        candidates (int): count of the compared sections (see 'struct_compare').
+        assignment (StructureAssignment): algorithm of matching of the sections.
 
     """
     if matrix is None:
@@ -227,26 +671,21 @@ def struct_compare(
     if count_of_nodes2 == 0:
         return [1, (count_of_nodes1 + 1)]
 
-    # Add counting of nodes
-    key_indexes1, count_of_children1 = get_children_indexes(tree1, count_of_nodes1)
-    key_indexes2, count_of_children2 = get_children_indexes(tree2, count_of_nodes2)
-    key_indexes1.append(count_of_nodes1)
-    key_indexes2.append(count_of_nodes2)
-
-    array = np.empty((count_of_children1, count_of_children2, 2), dtype=np.int64)
-
-    for i in np.arange(0, count_of_children1, 1):
-        section1 = tree1[key_indexes1[i] + 1 : key_indexes1[i + 1]]
-        for j in np.arange(0, count_of_children2, 1):
-            section2 = tree2[key_indexes2[j] + 1 : key_indexes2[j + 1]]
-            array[i][j] = struct_compare(section1, section2)
-
-    if matrix.size != 0:
-        for i in np.arange(0, count_of_children1, 1):
-            for j in np.arange(0, count_of_children2, 1):
-                matrix[i][j] = array[i][j]
+    count_of_children1 = len(key_indexes1) - 1
+    count_of_children2 = len(key_indexes2) - 1
+    if 0 < candidates < count_of_children2:
+        same_struct_metric, indexes, cells = approximate_compare_sections(
+            tree1, key_indexes1, tree2, key_indexes2, candidates, assignment
+        )
+        if matrix.size != 0:
+            matrix[:] = (0, 1)
+            for (i, j), value in cells.items():
+                matrix[i][j] = value
+    else:
+        same_struct_metric, indexes = exact_compare_sections(
+            tree1, key_indexes1, tree2, key_indexes2, matrix, candidates, assignment
+        )
 
-    same_struct_metric, indexes = matrix_value(array)
     if count_of_children1 > count_of_children2:
         same_struct_metric[1] += add_not_counted(
             tree1, count_of_children1, key_indexes1, indexes, axis=0
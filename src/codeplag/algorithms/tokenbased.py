@@ -6,12 +6,23 @@ Also provides the ability to get the length of the longest common subsequence
 of two token sequences.
 """
 
-import math
-from typing import Literal, Sequence, overload
+from typing import AbstractSet, Final, Literal, Sequence, overload
 
-from codeplag.consts import DEFAULT_NGRAMS_LENGTH
+import numpy as np
+import numpy.typing as npt
+from numpy.lib.stride_tricks import sliding_window_view
+
+from codeplag.consts import (
+    DEFAULT_NGRAMS_LENGTH,
+    FINGERPRINTS_NGRAMS_LENGTH,
+    FINGERPRINTS_WINDOW,
+)
 from codeplag.types import NgramsLength
 
+# Polynomial hash modulo 2 ** 63, so the values fit into signed 64-bit integers
+NGRAMS_HASH_BASE: Final[np.uint64] = np.uint64(0x100000001B3)
+NGRAMS_HASH_MASK: Final[np.uint64] = np.uint64((1 << 63) - 1)
+
 
 @overload
 def generate_ngrams(
@@ -55,16 +66,17 @@ def generate_ngrams(
         tokens (Sequence[int]): list of tokens.
         n (int): count of elements in ngrams.
         hashit (bool): If is True, then the function returns a list or set of
-          hashes of N-grams.
+          stable hashes of N-grams (see 'get_ngrams_hashes').
         unique (bool): If is True, then the function returns a set of N-grams or
           hashes of N-grams.
 
     """
     count_tokens = len(tokens)
     if hashit:
+        hashes: list[int] = get_ngrams_hashes(tokens, n).tolist()
         if unique:
-            return {hash(tuple(tokens[i : i + n])) for i in range(count_tokens - n + 1)}
-        return [hash(tuple(tokens[i : i + n])) for i in range(count_tokens - n + 1)]
+            return set(hashes)
+        return hashes
 
     if unique:
         return {tuple(tokens[i : i + n]) for i in range(count_tokens - n + 1)}
@@ -72,22 +84,101 @@ def generate_ngrams(
     return [tuple(tokens[i : i + n]) for i in range(count_tokens - n + 1)]
 
 
-def get_imprints_from_hashes(hashes: Sequence[int]) -> list[int]:
-    """The function return imprints of the given hashes.
+def get_ngrams_hashes(tokens: Sequence[int], n: int) -> npt.NDArray[np.uint64]:
+    """The function returns polynomial hashes of all N-grams of the tokens sequence.
+
+    The hashes are calculated with the Horner's scheme over shifted views of the tokens
+    array, so no N-gram is materialized. Unlike the built-in 'hash', the values don't
+    depend on the process and may be cached, sent to workers, and persisted.
+
+    Args:
+    ----
+        tokens (Sequence[int]): list of tokens.
+        n (int): count of elements in ngrams.
+
+    """
+    count_ngrams = len(tokens) - n + 1
+    if count_ngrams <= 0:
+        return np.empty(0, dtype=np.uint64)
+
+    array = np.asarray(tokens, dtype=np.uint64)
+    hashes = np.zeros(count_ngrams, dtype=np.uint64)
+    for offset in range(n):
+        # Overflow of the unsigned integers is the reduction modulo 2 ** 64
+        hashes *= NGRAMS_HASH_BASE
+        hashes += array[offset : offset + count_ngrams]
+    hashes &= NGRAMS_HASH_MASK
+
+    return hashes
+
+
+def winnow(hashes: Sequence[int] | npt.NDArray[np.uint64], window: int) -> list[int]:
+    """The function selects fingerprints from the hashes with the winnowing algorithm.
+
+    In each window of consecutive hashes the minimal hash is selected (the rightmost one
+    in case of ties), and it is recorded only once while it stays minimal. All windows
+    are processed at once over a sliding window view of the hashes array. It takes
+    O(len(hashes) * window) operations instead of the linear monotonic queue, but for
+    the small windows of fingerprints the vectorized passes are several times faster
+    than the loop over hashes in Python.
 
     Args:
     ----
-        hashes (Sequence[int]): list of hashes.
+        hashes (Sequence[int] | NDArray): list of hashes.
+        window (int): count of hashes in the window.
 
     Returns:
     -------
-        List of each k element in hashes, where k equal log(len(hashes))
+        Selected hashes in order of their positions.
 
     """
-    count_hashes = len(hashes)
-    k = math.floor(math.log(count_hashes, 2))
+    array = np.asarray(hashes, dtype=np.uint64)
+    window = min(window, len(array))
+    if window == 0:
+        return []
+
+    windows = sliding_window_view(array, window)
+    # The argmin over reversed windows finds the rightmost minimum
+    selected = np.arange(len(windows)) + (window - 1) - np.argmin(windows[:, ::-1], axis=1)
+    changed = np.empty(len(selected), dtype=np.bool_)
+    changed[0] = True
+    np.not_equal(selected[1:], selected[:-1], out=changed[1:])
+
+    return array[selected[changed]].tolist()
+
+
+def get_fingerprints(
+    tokens: Sequence[int],
+    ngrams_length: int = FINGERPRINTS_NGRAMS_LENGTH,
+    window: int = FINGERPRINTS_WINDOW,
+) -> list[int]:
+    """The function returns winnowing fingerprints of the tokens sequence.
 
-    return [hashes[index] for index in range(0, count_hashes, k)]
+    Every common subsequence of two works with length at least
+    'ngrams_length + window - 1' has a common fingerprint.
+
+    Args:
+    ----
+        tokens (Sequence[int]): list of tokens.
+        ngrams_length (int): count of tokens in the hashed N-grams.
+        window (int): count of hashes in the winnowing window.
+
+    """
+    return winnow(get_ngrams_hashes(tokens, ngrams_length), window)
+
+
+def value_fingerprints_coef(
+    fingerprints_first: Sequence[int], fingerprints_second: Sequence[int]
+) -> float:
+    """The function returns the Jakkar coefficient of fingerprints of two programs.
+
+    Args:
+    ----
+        fingerprints_first (Sequence[int]): fingerprints of the first program.
+        fingerprints_second (Sequence[int]): fingerprints of the second program.
+
+    """
+    return jakkar_coef_from_ngrams(set(fingerprints_first), set(fingerprints_second))
 
 
 def value_jakkar_coef(
@@ -104,15 +195,23 @@ def value_jakkar_coef(
         ngrams_length (NgramsLength): N-grams length.
 
     """
-    ngrams_first: set[tuple[int, ...]] = generate_ngrams(
-        tokens_first, ngrams_length, hashit=False, unique=True
-    )
-    ngrams_second: set[tuple[int, ...]] = generate_ngrams(
-        tokens_second, ngrams_length, hashit=False, unique=True
-    )
+    ngrams_first = generate_ngrams(tokens_first, ngrams_length, hashit=True, unique=True)
+    ngrams_second = generate_ngrams(tokens_second, ngrams_length, hashit=True, unique=True)
+
+    return jakkar_coef_from_ngrams(ngrams_first, ngrams_second)
+
 
-    intersection = len(ngrams_first.intersection(ngrams_second))
-    union = len(ngrams_first | ngrams_second)
+def jakkar_coef_from_ngrams(ngrams_first: AbstractSet, ngrams_second: AbstractSet) -> float:
+    """The function returns the value of the Jakkar coefficient of two sets of N-grams.
+
+    Args:
+    ----
+        ngrams_first (AbstractSet): N-grams of the first program.
+        ngrams_second (AbstractSet): N-grams of the second program.
+
+    """
+    intersection = len(ngrams_first & ngrams_second)
+    union = len(ngrams_first) + len(ngrams_second) - intersection
 
     if union == 0:
         return 0.0
@@ -120,6 +219,25 @@ def value_jakkar_coef(
     return intersection / union
 
 
+def jakkar_coef_upper_bound(count_ngrams_first: int, count_ngrams_second: int) -> float:
+    """The function returns the upper bound of the Jakkar coefficient by sizes of N-grams sets.
+
+    The intersection can't be greater than the smaller set and the union can't be less
+    than the bigger one.
+
+    Args:
+    ----
+        count_ngrams_first (int): count of unique N-grams of the first program.
+        count_ngrams_second (int): count of unique N-grams of the second program.
+
+    """
+    bigger = max(count_ngrams_first, count_ngrams_second)
+    if bigger == 0:
+        return 0.0
+
+    return min(count_ngrams_first, count_ngrams_second) / bigger
+
+
 # equal to the Levenshtein length
 def lcs(X: Sequence[int], Y: Sequence[int]) -> int:
     """The function returns the length of the longest common subsequence of two sequences X and Y.
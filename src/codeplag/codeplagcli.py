@@ -9,17 +9,24 @@ from typing import Self, Sequence
 from codeplag.consts import (
     DEFAULT_MODE,
     DEFAULT_REPORT_TYPE,
+    DEFAULT_TOP_K,
     EXTENSION_CHOICE,
+    GITHUB_CACHE_SIZE_CHOICE,
+    GITHUB_CONCURRENCY_CHOICE,
     LANGUAGE_CHOICE,
     LOG_LEVEL_CHOICE,
+    LOG_TRACE_SAMPLING_CHOICE,
     MAX_DEPTH_CHOICE,
     MODE_CHOICE,
     NGRAMS_LENGTH_CHOICE,
     REPORT_TYPE_CHOICE,
     REPORTS_EXTENSION_CHOICE,
+    STRUCTURE_ASSIGNMENT_CHOICE,
+    STRUCTURE_CANDIDATES_CHOICE,
     UTIL_NAME,
     UTIL_VERSION,
     WORKERS_CHOICE,
+    WORKERS_START_METHOD_CHOICE,
 )
 from codeplag.types import Settings
 from webparsers.types import GitHubContentUrl
@@ -89,6 +96,30 @@ class FilePath(Path):
         return path.resolve()
 
 
+class IntRange:
+    """Raises `argparse.ArgumentTypeError` if the value isn't an integer from the range.
+
+    Unlike the 'choices' of argparse, the error message doesn't list every allowed value.
+    """
+
+    def __init__(self: Self, values: range) -> None:
+        self.values = values
+
+    def __call__(self: Self, value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            number = None
+        if number is None or number not in self.values:
+            raise argparse.ArgumentTypeError(
+                _("The value '{value}' must be an integer from {start} to {end}.").format(
+                    value=value, start=self.values[0], end=self.values[-1]
+                )
+            )
+
+        return number
+
+
 class CodeplagCLI(argparse.ArgumentParser):
     """The argument parser of the codeplag util."""
 
@@ -190,6 +221,32 @@ class CodeplagCLI(argparse.ArgumentParser):
             type=int,
             choices=NGRAMS_LENGTH_CHOICE,
         )
+        settings_modify.add_argument(
+            "-sc",
+            "--structure-candidates",
+            help=_(
+                "When provided '0' each top-level node of the first work is compared with "
+                "each top-level node of the second work while calculating the structure "
+                "similarity. Otherwise, each node is compared only with the provided count "
+                "of nodes whose subtrees have the most similar shape, which is faster on big "
+                "works but gives approximate results."
+            ),
+            type=int,
+            choices=STRUCTURE_CANDIDATES_CHOICE,
+            metavar="{0, 1, ..., 100}",
+        )
+        settings_modify.add_argument(
+            "-sa",
+            "--structure-assignment",
+            help=_(
+                "The algorithm of matching of the top-level nodes of two works while "
+                "calculating the structure similarity. 'greedy' matches the most similar "
+                "nodes first, 'optimal' maximizes the total similarity of the matched nodes "
+                "and is slower on big works."
+            ),
+            type=str,
+            choices=STRUCTURE_ASSIGNMENT_CHOICE,
+        )
         settings_modify.add_argument(
             "-l",
             "--language",
@@ -206,6 +263,16 @@ class CodeplagCLI(argparse.ArgumentParser):
             type=str,
             choices=LOG_LEVEL_CHOICE,
         )
+        settings_modify.add_argument(
+            "-lts",
+            "--log-trace-sampling",
+            help=_(
+                "Only the first and then each N-th record of the same trace message is "
+                "written to the log. The value 1 writes all records."
+            ),
+            type=IntRange(LOG_TRACE_SAMPLING_CHOICE),
+            metavar="{1, 2, ..., 10000}",
+        )
         settings_modify.add_argument(
             "-w",
             "--workers",
@@ -213,6 +280,38 @@ class CodeplagCLI(argparse.ArgumentParser):
             type=int,
             choices=WORKERS_CHOICE,
         )
+        settings_modify.add_argument(
+            "-wsm",
+            "--workers-start-method",
+            help=_(
+                "The method of starting the processes that compare works. 'fork' starts "
+                "them faster, 'forkserver' and 'spawn' are safer when other threads are "
+                "running."
+            ),
+            type=str,
+            choices=WORKERS_START_METHOD_CHOICE,
+        )
+        settings_modify.add_argument(
+            "-gc",
+            "--github-concurrency",
+            help=_(
+                "The maximum number of simultaneous requests to the GitHub API while "
+                "getting works from GitHub."
+            ),
+            type=int,
+            choices=GITHUB_CONCURRENCY_CHOICE,
+            metavar="{1, 2, ..., 64}",
+        )
+        settings_modify.add_argument(
+            "-gcs",
+            "--github-cache-size",
+            help=_(
+                "The maximum size in megabytes of the on-disk cache of files and responses "
+                "from GitHub. The value 0 disables the cache."
+            ),
+            type=IntRange(GITHUB_CACHE_SIZE_CHOICE),
+            metavar="{0, 1, ..., 10240}",
+        )
         settings_modify.add_argument(
             "-mh",
             "--mongo-host",
@@ -294,6 +393,17 @@ class CodeplagCLI(argparse.ArgumentParser):
             action="store_true",
             help=_("Ignore the threshold when checking of works."),
         )
+        check.add_argument(
+            "--show-stats",
+            action="store_true",
+            help=_("Show time spent on each stage of the check and counters of compared pairs."),
+        )
+        check.add_argument(
+            "--stats-file",
+            metavar="FILE",
+            type=Path,
+            help=_("Path to the JSON file for saving statistics of the check."),
+        )
 
         check_required = check.add_argument_group("required options")
         check_required.add_argument(
@@ -312,6 +422,15 @@ class CodeplagCLI(argparse.ArgumentParser):
             help=_("Searching in all branches."),
             action="store_true",
         )
+        check_github.add_argument(
+            "-bc",
+            "--branch-commits",
+            help=_(
+                "Attribute the last commit of the branch to each file instead of searching "
+                "for the last commit of each file. It needs much fewer requests to GitHub."
+            ),
+            action="store_true",
+        )
         check_github.add_argument(
             "-re",
             "--repo-regexp",
@@ -332,6 +451,29 @@ class CodeplagCLI(argparse.ArgumentParser):
             default=[],
         )
 
+        check_archive = check.add_argument_group("archive options")
+        check_archive.add_argument(
+            "-a",
+            "--archive",
+            metavar="FILE",
+            type=Path,
+            help=_(
+                "Path to the index of archived works. Each checked work is compared only "
+                "with the most similar archived works instead of the other checked works."
+            ),
+        )
+        check_archive.add_argument(
+            "--top-k",
+            type=int,
+            help=_("Count of the most similar archived works compared with each checked work."),
+            default=DEFAULT_TOP_K,
+        )
+        check_archive.add_argument(
+            "--add-to-archive",
+            action="store_true",
+            help=_("Add the checked works to the archive after the check."),
+        )
+
     def __add_report_path(self: Self, subparsers: argparse._SubParsersAction) -> None:
         report = subparsers.add_parser(
             "report",
@@ -451,6 +593,12 @@ class CodeplagCLI(argparse.ArgumentParser):
                         "'github-user', or 'github-urls' options."
                     )
                 )
+            elif parsed_args.add_to_archive and parsed_args.archive is None:
+                self.error(
+                    _("The 'add-to-archive' option requires the provided 'archive' option.")
+                )
+            elif parsed_args.top_k < 1:
+                self.error(_("The 'top-k' option must be a positive number."))
         elif (
             root == "report"
             and command == "create"
@@ -4,16 +4,22 @@ from typing import Any, Literal, Mapping, overload
 
 from codeplag.consts import (
     CONFIG_PATH,
+    DEFAULT_GITHUB_CACHE_SIZE,
+    DEFAULT_GITHUB_CONCURRENCY,
     DEFAULT_LANGUAGE,
     DEFAULT_LOG_LEVEL,
+    DEFAULT_LOG_TRACE_SAMPLING,
     DEFAULT_MAX_DEPTH,
     DEFAULT_MONGO_HOST,
     DEFAULT_MONGO_PORT,
     DEFAULT_MONGO_USER,
     DEFAULT_NGRAMS_LENGTH,
     DEFAULT_REPORT_EXTENSION,
+    DEFAULT_STRUCTURE_ASSIGNMENT,
+    DEFAULT_STRUCTURE_CANDIDATES,
     DEFAULT_THRESHOLD,
     DEFAULT_WORKERS,
+    DEFAULT_WORKERS_START_METHOD,
 )
 from codeplag.logger import codeplag_logger as logger
 from codeplag.types import Settings, ShortOutput
@@ -87,12 +93,18 @@ DefaultSettingsConfig = Settings(
     threshold=DEFAULT_THRESHOLD,
     max_depth=DEFAULT_MAX_DEPTH,
     ngrams_length=DEFAULT_NGRAMS_LENGTH,
+    structure_candidates=DEFAULT_STRUCTURE_CANDIDATES,
+    structure_assignment=DEFAULT_STRUCTURE_ASSIGNMENT,
     show_progress=0,
     short_output=ShortOutput.SHOW_ALL,
     reports_extension=DEFAULT_REPORT_EXTENSION,
     language=DEFAULT_LANGUAGE,
     log_level=DEFAULT_LOG_LEVEL,
+    log_trace_sampling=DEFAULT_LOG_TRACE_SAMPLING,
     workers=DEFAULT_WORKERS,
+    workers_start_method=DEFAULT_WORKERS_START_METHOD,
+    github_concurrency=DEFAULT_GITHUB_CONCURRENCY,
+    github_cache_size=DEFAULT_GITHUB_CACHE_SIZE,
     mongo_host=DEFAULT_MONGO_HOST,
     mongo_port=DEFAULT_MONGO_PORT,
     mongo_user=DEFAULT_MONGO_USER,
@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import re
 from pathlib import Path
@@ -13,6 +14,8 @@ from codeplag.types import (
     NgramsLength,
     ReportsExtension,
     ReportType,
+    StartMethod,
+    StructureAssignment,
     Threshold,
 )
 
@@ -26,6 +29,11 @@ LIB_PATH: Final[Path] = Path("@LIB_PATH@")
 GENERAL_TEMPLATE_PATH: Final[Path] = LIB_PATH / "general.templ"
 SOURCES_TEMPLATE_PATH: Final[Path] = LIB_PATH / "sources.templ"
 TRANSLATIONS_PATH: Final[Path] = LIB_PATH / "translations"
+CACHE_PATH: Final[Path] = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / UTIL_NAME
+)
+GITHUB_CACHE_PATH: Final[Path] = CACHE_PATH / "github"
+TOOLCHAIN_CACHE_PATH: Final[Path] = CACHE_PATH / "toolchain.json"
 # =====
 
 # Default values
@@ -34,18 +42,38 @@ DEFAULT_NGRAMS_LENGTH: Final[NgramsLength] = 3
 DEFAULT_WEIGHTS: Final[tuple[float, float, float, float]] = (1.0, 0.4, 0.4, 0.4)
 DEFAULT_LANGUAGE: Final[Language] = "en"
 DEFAULT_LOG_LEVEL: Final[LogLevel] = "info"
+# Each trace record is logged by default
+DEFAULT_LOG_TRACE_SAMPLING: Final[int] = 1
 DEFAULT_REPORT_EXTENSION: Final[ReportsExtension] = "csv"
 DEFAULT_GENERAL_REPORT_NAME: Final[str] = "report.html"
 DEFAULT_SOURCES_REPORT_NAME: Final[str] = "sources.html"
 DEFAULT_WORKERS: Final[int] = os.cpu_count() or 1
+# The main process writes the log file in a background thread, so it isn't forked
+# when the workers may be started from the single-threaded server
+DEFAULT_WORKERS_START_METHOD: Final[StartMethod] = (
+    "forkserver"
+    if "forkserver" in multiprocessing.get_all_start_methods()
+    else multiprocessing.get_all_start_methods()[0]  # type: ignore
+)
 DEFAULT_MODE: Final[Mode] = "many_to_many"
 DEFAULT_MAX_DEPTH: Final[MaxDepth] = 999
+DEFAULT_TOP_K: Final[int] = 10
+DEFAULT_STRUCTURE_CANDIDATES: Final[int] = 0
+DEFAULT_STRUCTURE_ASSIGNMENT: Final[StructureAssignment] = "greedy"
+DEFAULT_GITHUB_CONCURRENCY: Final[int] = 8
+# In megabytes
+DEFAULT_GITHUB_CACHE_SIZE: Final[int] = 256
 DEFAULT_REPORT_TYPE: Final[ReportType] = "general"
 DEFAULT_MONGO_HOST: Final[str] = "host.docker.internal"
 DEFAULT_MONGO_USER: Final[str] = "root"
 DEFAULT_MONGO_PORT: Final[int] = 27017
 # =============
 
+# Winnowing
+FINGERPRINTS_NGRAMS_LENGTH: Final[int] = 5
+FINGERPRINTS_WINDOW: Final[int] = 4
+# =============
+
 GET_FRAZE: Final[str] = "Getting works features from"
 
 # CSV report
@@ -65,6 +93,7 @@ CSV_REPORT_COLUMNS: Final[tuple[str, ...]] = (
     "operators",
     "keywords",
     "literals",
+    "fingerprints",
     "weighted_average",
     "struct_similarity",
     "compliance_matrix",
@@ -77,8 +106,16 @@ EXTENSION_CHOICE: Final[tuple[Extension, ...]] = get_args(Extension)
 LANGUAGE_CHOICE: Final[tuple[Language, ...]] = get_args(Language)
 LOG_LEVEL_CHOICE: Final[tuple[LogLevel, ...]] = get_args(LogLevel)
 WORKERS_CHOICE: Final[tuple[int, ...]] = tuple(range(1, DEFAULT_WORKERS + 1))
+WORKERS_START_METHOD_CHOICE: Final[tuple[StartMethod, ...]] = tuple(
+    method for method in get_args(StartMethod) if method in multiprocessing.get_all_start_methods()
+)
 MAX_DEPTH_CHOICE: Final[tuple[int, ...]] = get_args(MaxDepth)
 NGRAMS_LENGTH_CHOICE: Final[tuple[int, ...]] = get_args(NgramsLength)
+STRUCTURE_CANDIDATES_CHOICE: Final[range] = range(0, 101)
+STRUCTURE_ASSIGNMENT_CHOICE: Final[tuple[StructureAssignment, ...]] = get_args(StructureAssignment)
+GITHUB_CONCURRENCY_CHOICE: Final[range] = range(1, 65)
+GITHUB_CACHE_SIZE_CHOICE: Final[range] = range(0, 10241)
+LOG_TRACE_SAMPLING_CHOICE: Final[range] = range(1, 10001)
 REPORT_TYPE_CHOICE: Final[tuple[ReportType, ...]] = get_args(ReportType)
 # =======
 
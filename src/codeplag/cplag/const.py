@@ -1,15 +1,23 @@
-import ccsyspath
+from functools import cache
+
 from clang.cindex import CursorKind
 
+from codeplag.cplag.toolchain import get_system_include_paths
+
 
+@cache
 def get_compile_args() -> list[str]:
-    syspath = ccsyspath.system_include_paths("clang++")
+    """Returns the arguments of the compiler.
+
+    The system include paths of the 'clang++' are taken from the toolchain cache
+    or are requested from the compiler on the first call.
+    """
+    syspath = get_system_include_paths("clang++")
     incargs = [b"-I" + inc for inc in syspath]
 
     return ["-x", "c++", "--std=c++11"] + incargs
 
 
-COMPILE_ARGS = get_compile_args()
 IGNORE = [
     CursorKind.PREPROCESSING_DIRECTIVE,  # type: ignore
     # CursorKind.MACRO_DEFINITION,
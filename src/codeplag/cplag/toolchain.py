@@ -0,0 +1,125 @@
+"""This module contains the discovery of the clang toolchain.
+
+The discovery launches the compiler and searches the file system, so its results are
+stored in a small on-disk cache. The cached results are reused by the next runs and by the
+worker processes until the compiler or the library file is changed.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Final
+
+import ccsyspath
+
+from codeplag.consts import TOOLCHAIN_CACHE_PATH
+from codeplag.logger import codeplag_logger
+
+LIBCLANG_DIR: Final[Path] = Path("/usr/lib/")
+LIBCLANG_PATTERN: Final[str] = "llvm-*/lib/libclang-*.so.1"
+
+
+def _get_file_key(path: Path) -> str | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    return f"{path}:{stat.st_mtime_ns}"
+
+
+def _load_cache(cache_path: Path) -> dict[str, Any]:
+    try:
+        with cache_path.open(mode="r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return cache if isinstance(cache, dict) else {}
+
+
+def _get_cached(cache_path: Path, name: str, key: str) -> Any:
+    entry = _load_cache(cache_path).get(name)
+    if not isinstance(entry, dict) or entry.get("key") != key:
+        return None
+
+    return entry.get("value")
+
+
+def _save_cached(cache_path: Path, name: str, key: str, value: Any) -> None:
+    cache = _load_cache(cache_path)
+    cache[name] = {"key": key, "value": value}
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # The file is renamed only after writing, so other processes
+        # never read a partially written file
+        with tempfile.NamedTemporaryFile(
+            mode="w", encoding="utf-8", dir=cache_path.parent, delete=False
+        ) as f:
+            json.dump(cache, f)
+        os.replace(f.name, cache_path)
+    except OSError as err:
+        codeplag_logger.debug(f"Failed to save '{name}' to the toolchain cache: {err}.")
+
+
+def get_system_include_paths(
+    compiler: str = "clang++", cache_path: Path = TOOLCHAIN_CACHE_PATH
+) -> list[bytes]:
+    """Returns the system include paths of the compiler.
+
+    The paths are cached by the path and the time of modification of the compiler,
+    and are found again when any of the cached paths no longer exists.
+
+    Args:
+    ----
+        compiler (str): The name or the path of the compiler.
+        cache_path (Path): The path to the file of the toolchain cache.
+
+    """
+    compiler_path = shutil.which(compiler)
+    if compiler_path is None:
+        return ccsyspath.system_include_paths(compiler)
+
+    name = f"include_paths:{compiler}"
+    key = _get_file_key(Path(compiler_path).resolve())
+    if key is None:
+        return ccsyspath.system_include_paths(compiler)
+    cached = _get_cached(cache_path, name, key)
+    # The paths also depend on the installed headers of the standard library,
+    # which may be upgraded without the compiler
+    if isinstance(cached, list) and all(os.path.isdir(path) for path in cached):
+        return [os.fsencode(path) for path in cached]
+
+    paths = ccsyspath.system_include_paths(compiler)
+    _save_cached(cache_path, name, key, [os.fsdecode(path) for path in paths])
+
+    return paths
+
+
+def find_libclang_library_file(cache_path: Path = TOOLCHAIN_CACHE_PATH) -> Path | None:
+    """Returns the path to the libclang so file or None if it is not found.
+
+    The found path is cached until the file is changed or removed.
+
+    Args:
+    ----
+        cache_path (Path): The path to the file of the toolchain cache.
+
+    """
+    entry = _load_cache(cache_path).get("libclang")
+    if isinstance(entry, dict) and isinstance(entry.get("value"), str):
+        cached_path = Path(entry["value"])
+        if _get_file_key(cached_path) == entry.get("key"):
+            return cached_path
+
+    try:
+        path = next(LIBCLANG_DIR.glob(LIBCLANG_PATTERN))
+    except StopIteration:
+        return None
+    key = _get_file_key(path)
+    if key is not None:
+        _save_cached(cache_path, "libclang", key, str(path))
+
+    return path
@@ -3,7 +3,7 @@ from pathlib import Path
 from clang.cindex import Cursor, TokenKind
 
 from codeplag.cplag.const import IGNORE, OPERATORS
-from codeplag.getfeatures import set_sha256
+from codeplag.getfeatures import set_fingerprints, set_sha256
 from codeplag.types import ASTFeatures, NodeStructurePlace
 
 
@@ -41,6 +41,7 @@ def generic_visit(node: Cursor, features: ASTFeatures, curr_depth: int = 0) -> N
 
 
 @set_sha256
+@set_fingerprints
 def get_features(tree: Cursor, filepath: Path | str = "") -> ASTFeatures:
     features = ASTFeatures(filepath or tree.displayname)
     for token in tree.get_tokens():
@@ -1,28 +1,33 @@
 import logging
 import sys
+from functools import cache
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Final
 
 from clang.cindex import Config, Cursor, Index, TranslationUnit
 from typing_extensions import Self
 
 from codeplag.consts import GET_FRAZE, SUPPORTED_EXTENSIONS
-from codeplag.cplag.const import COMPILE_ARGS
+from codeplag.cplag.const import get_compile_args
+from codeplag.cplag.toolchain import find_libclang_library_file
 from codeplag.cplag.tree import get_features
 from codeplag.featurescache import AbstractFeaturesCache
 from codeplag.getfeatures import AbstractGetter, get_files_path_from_directory
 from codeplag.logger import codeplag_logger, log_err
+from codeplag.stats import STAGE_CACHE, STAGE_PARSE, run_stats
 from codeplag.types import ASTFeatures, ExitCode
 from webparsers.types import WorkInfo
 
-# FIXME: Dirty hook for finding libclang so file
-try:
-    LIBCLANG_SO_FILE_PATH: Final[Path] = next(Path("/usr/lib/").glob("llvm-*/lib/libclang-*.so.1"))
-except StopIteration:
-    codeplag_logger.error("Failed to find libclang so file.")
-    sys.exit(ExitCode.EXIT_UNKNOWN)
-Config.set_library_file(LIBCLANG_SO_FILE_PATH)
+
+@cache
+def set_libclang_library_file() -> None:
+    """Finds the libclang so file before the first parsing."""
+    # FIXME: Dirty hook for finding libclang so file
+    libclang_so_file_path = find_libclang_library_file()
+    if libclang_so_file_path is None:
+        codeplag_logger.error("Failed to find libclang so file.")
+        sys.exit(ExitCode.EXIT_UNKNOWN)
+    Config.set_library_file(libclang_so_file_path)
 
 
 def get_cursor_from_file(filepath: Path, args: list[str] | None = None) -> Cursor | None:
@@ -35,12 +40,13 @@ def get_cursor_from_file(filepath: Path, args: list[str] | None = None) -> Curso
 
     """
     if args is None:
-        args = COMPILE_ARGS
+        args = get_compile_args()
 
     if not filepath.is_file():
         log_err(f"'{filepath}' is not a file or does not exist.")
         return
 
+    set_libclang_library_file()
     index = Index.create()
     options = TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
 
@@ -66,20 +72,23 @@ def _get_works_from_filepaths(
         features = None
 
         if features_cache is not None:
-            features = features_cache.get_features_from_filepath(filepath)
+            with run_stats.timer(STAGE_CACHE):
+                features = features_cache.get_features_from_filepath(filepath)
 
         if features is None:
-            cursor = get_cursor_from_file(filepath, compile_args)
-            if cursor is None:
-                log_err(f"'{filepath}' does not parsed.")
-                continue
+            with run_stats.timer(STAGE_PARSE):
+                cursor = get_cursor_from_file(filepath, compile_args)
+                if cursor is None:
+                    log_err(f"'{filepath}' does not parsed.")
+                    continue
 
-            features = get_features(cursor, filepath)
+                features = get_features(cursor, filepath)
             if features.count_of_nodes == 0:
                 codeplag_logger.debug("Skipping the file '%s' due it contains no code.", filepath)
                 continue
             if features_cache is not None:
-                features_cache.save_features(features)
+                with run_stats.timer(STAGE_CACHE):
+                    features_cache.save_features(features)
         works.append(features)
 
     return works
@@ -105,22 +114,26 @@ class CFeaturesGetter(AbstractGetter):
         features = None
 
         if self.features_cache is not None:
-            features = self.features_cache.get_features_from_work_info(work_info)
+            with run_stats.timer(STAGE_CACHE):
+                features = self.features_cache.get_features_from_work_info(work_info)
 
         if features is None:
-            with NamedTemporaryFile(mode="w", encoding="utf-8", suffix=".out", delete=False) as tf:
-                tf.write(work_info.code)
-                tf_path = Path(tf.name)
-            cursor = get_cursor_from_file(tf_path, COMPILE_ARGS)
-            if cursor is None:
-                self.logger.error(
-                    "Unsuccessfully attempt to get AST from the file %s.", work_info.link
-                )
-                return
-
-            # hook for correct filtering info while parsing source code
-            features = get_features(cursor, tf_path)
-            tf_path.unlink()
+            with run_stats.timer(STAGE_PARSE):
+                with NamedTemporaryFile(
+                    mode="w", encoding="utf-8", suffix=".out", delete=False
+                ) as tf:
+                    tf.write(work_info.code)
+                    tf_path = Path(tf.name)
+                cursor = get_cursor_from_file(tf_path, get_compile_args())
+                if cursor is None:
+                    self.logger.error(
+                        "Unsuccessfully attempt to get AST from the file %s.", work_info.link
+                    )
+                    return
+
+                # hook for correct filtering info while parsing source code
+                features = get_features(cursor, tf_path)
+                tf_path.unlink()
             if features.count_of_nodes == 0:
                 self.logger.debug(
                     "Skipping the file '%s' due it contains no code.", work_info.link
@@ -129,7 +142,8 @@ class CFeaturesGetter(AbstractGetter):
             features.filepath = work_info.link
             features.modify_date = work_info.commit.date
             if self.features_cache is not None:
-                self.features_cache.save_features(features)
+                with run_stats.timer(STAGE_CACHE):
+                    self.features_cache.save_features(features)
 
         return features
 
@@ -138,7 +152,7 @@ class CFeaturesGetter(AbstractGetter):
             return []
 
         self.logger.debug(f"{GET_FRAZE} files")
-        return _get_works_from_filepaths(files, self.features_cache, COMPILE_ARGS)
+        return _get_works_from_filepaths(files, self.features_cache, get_compile_args())
 
     def get_works_from_dir(self: Self, directory: Path) -> list[ASTFeatures]:
         filepaths = get_files_path_from_directory(
@@ -147,4 +161,4 @@ class CFeaturesGetter(AbstractGetter):
             path_regexp=self.path_regexp,
         )
 
-        return _get_works_from_filepaths(filepaths, self.features_cache, COMPILE_ARGS)
+        return _get_works_from_filepaths(filepaths, self.features_cache, get_compile_args())
@@ -4,11 +4,13 @@ Written 2025 by Stepan Pahomov, Daniil Lokosov, Artyom Semidolin.
 """
 
 import atexit
+import re
 from pathlib import Path
-from typing import Final
+from typing import Any, Final
 
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, IndexModel, MongoClient
 from pymongo.collection import Collection
+from pymongo.cursor import Cursor
 from pymongo.errors import ConnectionFailure
 from typing_extensions import Self
 
@@ -111,8 +113,54 @@ class MongoDBConnection:
             self.db[collection].delete_many({})
 
 
+def _get_prefix_query(prefix: str) -> dict[str, str]:
+    # The anchored regex without special characters is served by the bounds of the index
+    return {"$regex": f"^{re.escape(prefix)}"}
+
+
+def _get_similar_parts_query(threshold: int) -> dict[str, Any]:
+    """Returns the condition of the comparisons with a pair of parts not less than threshold.
+
+    The similarity of the parts is compared before rounding to the hundredths of percent,
+    so the condition also matches the few comparisons which are just less than threshold.
+
+    Args:
+        threshold (int): The threshold of the similarity of the parts in percent.
+    """
+    is_similar_part = {
+        "$gte": [
+            {"$multiply": [{"$arrayElemAt": ["$$part", 0]}, 100]},
+            {"$multiply": [{"$arrayElemAt": ["$$part", 1]}, threshold - 0.01]},
+        ]
+    }
+    has_similar_parts = {
+        "$anyElementTrue": [{"$map": {"input": "$$row", "as": "part", "in": is_similar_part}}]
+    }
+    return {
+        "$expr": {
+            "$anyElementTrue": [
+                {
+                    "$map": {
+                        "input": "$compare_result.structure.compliance_matrix",
+                        "as": "row",
+                        "in": has_similar_parts,
+                    }
+                }
+            ]
+        }
+    }
+
+
 class ReportRepository:
     COLLECTION_NAME: Final = "compare_info"
+    INDEXES: Final = (
+        IndexModel([("first_path", ASCENDING), ("second_path", ASCENDING)]),
+        IndexModel([("second_path", ASCENDING)]),
+        IndexModel([("first_sha256", ASCENDING)]),
+        IndexModel([("second_sha256", ASCENDING)]),
+        IndexModel([("compare_result.fast.weighted_average", DESCENDING)]),
+        IndexModel([("compare_result.structure.similarity", DESCENDING)]),
+    )
 
     def __init__(self: Self, mongo_connection: MongoDBConnection) -> None:
         """Initialization of the repository for the compare_info collection."""
@@ -121,6 +169,45 @@ class ReportRepository:
             logger.error('Mongo collection "%s" not found', self.COLLECTION_NAME)
             raise Exception('Mongo collection "%s" not found', self.COLLECTION_NAME)
         self.collection: Collection = collection
+        self.create_indexes()
+
+    def create_indexes(self: Self) -> None:
+        """Creates the indexes of the collection which don't exist yet.
+
+        The existing indexes with the same keys are left as is, so the call is cheap.
+        """
+        self.collection.create_indexes(list(self.INDEXES))
+        logger.trace("Indexes of the %s collection are created.", self.COLLECTION_NAME)  # type: ignore
+
+    def find_compare_infos(
+        self: Self,
+        first_root_path: str | None = None,
+        second_root_path: str | None = None,
+        threshold: int | None = None,
+    ) -> Cursor:
+        """Returns the cursor over the comparisons for the reports.
+
+        The identifiers of the documents are not read, since the paths are stored
+        in the documents themselves.
+
+        Args:
+            first_root_path (str | None): The prefix of the first paths of the comparisons.
+            second_root_path (str | None): The prefix of the second paths of the comparisons.
+            threshold (int | None): When provided only the comparisons with a pair of parts
+              which similarity is not less than threshold are returned.
+
+        Returns:
+            Cursor: The cursor over the documents of the comparisons.
+        """
+        query: dict[str, Any] = {}
+        if first_root_path is not None:
+            query["first_path"] = _get_prefix_query(first_root_path)
+        if second_root_path is not None:
+            query["second_path"] = _get_prefix_query(second_root_path)
+        if threshold is not None:
+            query.update(_get_similar_parts_query(threshold))
+
+        return self.collection.find(query, projection={"_id": False})
 
     def get_compare_info(
         self: Self, first_filepath: str | Path, second_filepath: str | Path
@@ -170,6 +257,50 @@ class ReportRepository:
             compare_info.second_path,
         )
 
+    def get_max_similarities(
+        self: Self, first_paths: list[str], second_paths: list[str]
+    ) -> dict[str, float]:
+        """Returns the maximal weighted average similarity of each first path.
+
+        Only the comparisons of the first paths with the second paths are taken
+        into account, in whatever order the paths of a pair were stored. The first
+        paths without such comparisons are missing from the result.
+
+        Args:
+            first_paths (list[str]): The paths whose similarities are calculated.
+            second_paths (list[str]): The paths with which the first paths are compared.
+
+        Returns:
+            dict[str, float]: The maximal similarity of each first path.
+        """
+        pipeline = [
+            {
+                "$match": {
+                    "$or": [
+                        {"first_path": {"$in": first_paths}, "second_path": {"$in": second_paths}},
+                        {"first_path": {"$in": second_paths}, "second_path": {"$in": first_paths}},
+                    ]
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    "pairs": [
+                        {"path": "$first_path", "other": "$second_path"},
+                        {"path": "$second_path", "other": "$first_path"},
+                    ],
+                    "similarity": "$compare_result.fast.weighted_average",
+                }
+            },
+            {"$unwind": "$pairs"},
+            {"$match": {"pairs.path": {"$in": first_paths}, "pairs.other": {"$in": second_paths}}},
+            {"$group": {"_id": "$pairs.path", "similarity": {"$max": "$similarity"}}},
+        ]
+        return {
+            document["_id"]: document["similarity"]
+            for document in self.collection.aggregate(pipeline)
+        }
+
 
 class FeaturesRepository:
     COLLECTION_NAME: Final = "features"
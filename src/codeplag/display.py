@@ -1,17 +1,22 @@
+import json
+import sys
 from datetime import timedelta
 from enum import Enum
 from functools import partial
 from time import monotonic
-from typing import Final
+from typing import TYPE_CHECKING, Final
 
-import numpy as np
-import pandas as pd
 from typing_extensions import Self
 
 from codeplag.types import FullCompareInfo, NodeCodePlace
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 CHARS_CNT: Final[int] = 40
 USEFUL_CHARS: Final[int] = 100
+# The minimal time between redraws of the progress in a terminal, in seconds
+PROGRESS_REDRAW_INTERVAL: Final[float] = 0.1
 
 
 class Color(Enum):
@@ -65,35 +70,99 @@ class ComplexProgress(Progress):
     def __init__(self: Self, iterations: int) -> None:
         super(ComplexProgress, self).__init__(iterations)
         self.__internal_progresses: list[Progress] = []
+        # The internal progresses are completed in order, so only the count of completed
+        # ones and the progress of the current one are kept. The count is an integer, so
+        # the completed progress is exactly 1.0 without the rounding errors of a sum.
+        self.__completed: int = 0
+        self.__current_progress: float = 0.0
+        self.__current: int = 0
 
     def add_internal_progress(self: Self, internal_iterations: int) -> None:
         if len(self.__internal_progresses) == self.iterations:
             raise IndexError("The internal iteration count limit was exceeded.")
-        self.__internal_progresses.append(Progress(internal_iterations))
+        internal_progress = Progress(internal_iterations)
+        self.__internal_progresses.append(internal_progress)
+        if internal_progress.progress == 1.0:
+            self.__completed += 1
 
     @property
     def progress(self: Self) -> float:
         if self.iterations == 0:
             return 1.0
-        return float(
-            sum(
-                internal_progress.progress / self.iterations
-                for internal_progress in self.__internal_progresses
-            )
-        )
+        return (self.__completed + self.__current_progress) / self.iterations
 
     def __next__(self: Self) -> float:
         if self.progress == 1.0:
             raise StopIteration("The progress has already been completed.")
-        for internal_progress in self.__internal_progresses:
+        while self.__current < len(self.__internal_progresses):
+            internal_progress = self.__internal_progresses[self.__current]
             if internal_progress.progress == 1.0:
+                self.__current += 1
                 continue
-            if next(internal_progress) == 1.0:
+            self.__current_progress = next(internal_progress)
+            if internal_progress.progress == 1.0:
+                self.__completed += 1
+                self.__current_progress = 0.0
                 continue
             break
         return self.progress
 
 
+class ProgressPrinter:
+    def __init__(
+        self: Self,
+        progress: Progress,
+        workers: int,
+        interval: float = PROGRESS_REDRAW_INTERVAL,
+    ) -> None:
+        """Initializes the printer of the progress of a check.
+
+        When the standard output is a terminal, the progress line is redrawn not more
+        often than once per the interval and when the progress is completed. Otherwise,
+        a JSON record is printed to the standard error each time the whole percentage
+        changes.
+
+        Args:
+        ----
+            progress (Progress): The printed progress.
+            workers (int): The count of the workers used by the check.
+            interval (float): The minimal time between redraws in seconds.
+
+        """
+        self.progress = progress
+        self.workers = workers
+        self.interval = interval
+        self.interactive = sys.stdout.isatty()
+        self.__next_redraw_sec: float = 0.0
+        self.__last_percent: int = -1
+        self.__started: bool = False
+
+    def update(self: Self) -> None:
+        """Increases the progress and prints it when needed."""
+        if not self.__started:
+            # The progress is printed after the step, so it's moved from the state before
+            # the first step here, and the last step completes it
+            self.__started = True
+            next(self.progress)
+        if self.progress.progress != 1.0:
+            next(self.progress)
+        if self.interactive:
+            now = monotonic()
+            # The final state is always drawn, so the last line is not stale
+            if now < self.__next_redraw_sec and self.progress.progress != 1.0:
+                return
+            self.__next_redraw_sec = now + self.interval
+            print_pretty_progress(self.progress, self.workers)
+            return
+
+        # The rounding hides errors of the floating point division
+        percent = int(round(self.progress.progress * 100, 6))
+        if percent == self.__last_percent:
+            return
+        self.__last_percent = percent
+        print_progress_record(self.progress, self.workers)
+
+
 def colorize(text: str, color: Color, bold: bool = False, underline: bool = False) -> str:
     """Wraps provided text to change color, bold, or underline it for printing."""
     if bold:
@@ -156,7 +225,7 @@ def clear_line() -> None:
 
 def print_compare_result(
     compare_info: FullCompareInfo,
-    compliance_matrix_df: pd.DataFrame | None = None,
+    compliance_matrix_df: "pd.DataFrame | None" = None,
 ) -> None:
     """Prints the pretty result of comparing two files.
 
@@ -167,6 +236,10 @@ def print_compare_result(
           structures similarity information of two works.
 
     """
+    # The pandas is loaded on the first printing, so it doesn't slow down the start
+    import numpy as np
+    import pandas as pd
+
     clear_line()
     print("+" * CHARS_CNT)
     message = (
@@ -178,38 +251,46 @@ def print_compare_result(
     )
 
     print("May be similar:", message, end="\n\n", sep="\n")
+    # The fingerprints don't participate in the weighted average, and they are printed
+    # with the additional metrics, so the main table fits into 80 columns
+    main_metrics = compare_info.fast._asdict()
+    fingerprints = main_metrics.pop("fingerprints")
     main_metrics_df = pd.DataFrame(
-        [compare_info.fast],
+        [list(main_metrics.values())],
         index=np.array(["Similarity"]),
-        columns=pd.Index(
-            (field.upper() for field in compare_info.fast._fields), name="FastCompareInfo:"
-        ),
+        columns=pd.Index((field.upper() for field in main_metrics), name="FastCompareInfo:"),
     )
-    print(main_metrics_df)
-    print()
-
     additional_metrics_df = pd.DataFrame(
-        compare_info.structure.similarity,
+        [[compare_info.structure.similarity, fingerprints]],
         index=np.array(["Similarity"]),
-        columns=pd.Index(["Structure"], name="AdditionalMetrics:"),
+        columns=pd.Index(["Structure", "Fingerprints"], name="AdditionalMetrics:"),
     )
-    print(additional_metrics_df)
-    print()
-
-    if compliance_matrix_df is not None:
-        print(compliance_matrix_df, "\n")
+    # The options are set only while printing, so the global state of pandas is kept
+    with pd.option_context("display.float_format", "{:,.2%}".format, "display.max_colwidth", None):
+        print(main_metrics_df)
+        print()
+        print(additional_metrics_df)
+        print()
+        if compliance_matrix_df is not None:
+            print(compliance_matrix_df, "\n")
 
     print("+" * CHARS_CNT)
 
 
-def print_pretty_progress(progress: Progress, workers: int) -> None:
+def _get_progress_times(progress: Progress) -> tuple[float, float | None]:
+    """Returns the spent time and the predicted time left of the progress in seconds."""
     time_spent_seconds = monotonic() - progress.start_time_sec
-    time_spent = timedelta(seconds=int(time_spent_seconds))
     current_progress = progress.progress
-    if current_progress != 0.0:
-        predicated_time_left = timedelta(
-            seconds=int((1.0 - current_progress) / current_progress * time_spent_seconds)
-        )
+    if current_progress == 0.0:
+        return time_spent_seconds, None
+    return time_spent_seconds, (1.0 - current_progress) / current_progress * time_spent_seconds
+
+
+def print_pretty_progress(progress: Progress, workers: int) -> None:
+    time_spent_seconds, time_left_seconds = _get_progress_times(progress)
+    time_spent = timedelta(seconds=int(time_spent_seconds))
+    if time_left_seconds is not None:
+        predicated_time_left = timedelta(seconds=int(time_left_seconds))
     else:
         predicated_time_left = "N/A"
     print(
@@ -218,3 +299,15 @@ def print_pretty_progress(progress: Progress, workers: int) -> None:
         f"{workers} workers",
         end="\r",
     )
+
+
+def print_progress_record(progress: Progress, workers: int) -> None:
+    """Prints the progress as a JSON line to the standard error for other programs."""
+    time_spent_seconds, time_left_seconds = _get_progress_times(progress)
+    record = {
+        "progress": round(progress.progress, 4),
+        "time_spent": round(time_spent_seconds, 1),
+        "time_left": None if time_left_seconds is None else round(time_left_seconds, 1),
+        "workers": workers,
+    }
+    print(json.dumps(record), file=sys.stderr, flush=True)
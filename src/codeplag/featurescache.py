@@ -9,6 +9,7 @@ from pathlib import Path
 
 from typing_extensions import Self
 
+from codeplag.algorithms.tokenbased import get_fingerprints
 from codeplag.types import (
     ASTFeatures,
     ASTFeaturesDict,
@@ -70,6 +71,7 @@ def serialize_features_to_dict(work: ASTFeatures) -> ASTFeaturesDict:
         "structure": list(map(serialize_node_structure_place_to_dict, work.structure)),
         "tokens": work.tokens,
         "tokens_pos": list(map(serialize_node_code_place_to_dict, work.tokens_pos)),
+        "fingerprints": work.fingerprints,
     }
 
 
@@ -97,6 +99,11 @@ def deserialize_features_from_dict(work_dict: ASTFeaturesDict) -> ASTFeatures:
         tokens=work_dict["tokens"],
         tokens_pos=list(map(deserialize_node_code_place_from_dict, work_dict["tokens_pos"])),
     )
+    fingerprints = work_dict.get("fingerprints")
+    if fingerprints is None:
+        # Features were cached before the fingerprints were added
+        fingerprints = get_fingerprints(features.tokens)
+    features.fingerprints = fingerprints
 
     features.modify_date = work_dict["modify_date"]
     return features
@@ -1,23 +1,40 @@
+import asyncio
 import logging
 import os
 import re
 import sys
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Callable, Literal, ParamSpec, overload
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Iterator,
+    Literal,
+    ParamSpec,
+    overload,
+)
 
 from typing_extensions import Self
 
+from codeplag.algorithms.tokenbased import get_fingerprints
 from codeplag.consts import (
     ALL_EXTENSIONS,
     GET_FRAZE,
     UTIL_NAME,
 )
 from codeplag.featurescache import AbstractFeaturesCache
+from codeplag.stats import STAGE_GITHUB, STAGE_SCAN, run_stats
 from codeplag.types import ASTFeatures, Extension, Extensions
-from webparsers.github_parser import GitHubParser
 from webparsers.types import WorkInfo
 
+# The parsers load the HTTP clients, so they are imported only when GitHub is used
+if TYPE_CHECKING:
+    from webparsers.async_github_parser import AsyncGithubParser
+    from webparsers.github_parser import GitHubParser
+
+    AnyGitHubParser = GitHubParser | AsyncGithubParser
+
 
 def get_files_path_from_directory(
     directory: Path,
@@ -41,23 +58,42 @@ def get_files_path_from_directory(
         extensions = ALL_EXTENSIONS
 
     allowed_files = []
-    for current_dir, _, filenames in os.walk(directory):
-        for filename in filenames:
-            allowed = any(ext.search(filename) for ext in extensions)
-            if not allowed:
-                continue
+    with run_stats.timer(STAGE_SCAN):
+        for current_dir, _, filenames in os.walk(directory):
+            for filename in filenames:
+                allowed = any(ext.search(filename) for ext in extensions)
+                if not allowed:
+                    continue
 
-            path_to_file = Path(current_dir, filename)
-            if path_regexp is None:
-                allowed_files.append(path_to_file)
-                continue
+                path_to_file = Path(current_dir, filename)
+                if path_regexp is None:
+                    allowed_files.append(path_to_file)
+                    continue
 
-            if path_regexp.search(path_to_file.__str__()):
-                allowed_files.append(path_to_file)
+                if path_regexp.search(path_to_file.__str__()):
+                    allowed_files.append(path_to_file)
 
     return allowed_files
 
 
+def _timed_github_iter(work_infos: Iterator[WorkInfo]) -> Iterator[WorkInfo]:
+    """Adds the time spent waiting for the next fetched file to the GitHub stage."""
+    while True:
+        with run_stats.timer(STAGE_GITHUB):
+            work_info = next(work_infos, None)
+        if work_info is None:
+            return
+        yield work_info
+
+
+def _flatten_if_dependent(
+    nested_works: list[list[ASTFeatures]], independent: bool
+) -> list[ASTFeatures] | list[list[ASTFeatures]]:
+    if independent:
+        return nested_works
+    return [work for works in nested_works for work in works]
+
+
 P = ParamSpec("P")
 
 
@@ -85,6 +121,32 @@ def set_sha256(get_features_func: Callable[P, ASTFeatures]) -> Callable[P, ASTFe
     return wrapper
 
 
+def set_fingerprints(
+    get_features_func: Callable[P, ASTFeatures],
+) -> Callable[P, ASTFeatures]:
+    """Decorator for setting up 'fingerprints' attribute after getting work features.
+
+    Args:
+        get_features_func (Callable[P, ASTFeatures]): Getting features function.
+
+    Returns:
+        Callable[..., ASTFeatures]: Function that sets up 'fingerprints' attribute
+          after getting features.
+    """
+
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> ASTFeatures:
+        """Adds winnowing fingerprints of the tokens to the ASTFeatures class instance.
+
+        Returns:
+            ASTFeatures: The ASTFeatures class instance with set 'fingerprints' attribute.
+        """
+        features = get_features_func(*args, **kwargs)
+        features.fingerprints = get_fingerprints(features.tokens)
+        return features
+
+    return wrapper
+
+
 class AbstractGetter(ABC):
     def __init__(
         self: Self,
@@ -96,7 +158,7 @@ class AbstractGetter(ABC):
     ) -> None:
         self.logger = logger if logger is not None else logging.getLogger(UTIL_NAME)
         self.extension: Extension = extension
-        self.github_parser: GitHubParser | None = None
+        self.github_parser: "AnyGitHubParser | None" = None
         self.features_cache: AbstractFeaturesCache | None = features_cache
 
         try:
@@ -125,17 +187,73 @@ class AbstractGetter(ABC):
             sys.exit(1)
 
     def check_github_parser_provided(self: Self) -> None:
-        if not isinstance(self.github_parser, GitHubParser):
+        from webparsers.async_github_parser import AsyncGithubParser
+        from webparsers.github_parser import GitHubParser
+
+        if not isinstance(self.github_parser, GitHubParser | AsyncGithubParser):
             raise TypeError(
                 "GitHubParser is not provided, or the provided object "
-                "is not a GitHubParser instance."
+                "is not a GitHubParser or AsyncGithubParser instance."
             )
 
-    def set_github_parser(self: Self, github_parser: GitHubParser) -> None:
-        if self.github_parser:
+    def set_github_parser(self: Self, github_parser: "AnyGitHubParser") -> None:
+        from webparsers.github_parser import GitHubParser
+
+        if isinstance(self.github_parser, GitHubParser):
             self.github_parser.close_session()
         self.github_parser = github_parser
 
+    async def _aget_from_work_infos(
+        self: Self, work_infos: AsyncIterator[WorkInfo]
+    ) -> list[ASTFeatures]:
+        """Extracts features of the files as soon as they are fetched.
+
+        The files are fetched concurrently, so the works are sorted to keep their
+        order stable between runs.
+        """
+        works = []
+        async for work_info in work_infos:
+            features = self.get_from_content(work_info)
+            if features is not None:
+                works.append(features)
+        works.sort()
+        return works
+
+    async def _aget_from_github_urls(
+        self: Self, github_parser: "AsyncGithubParser", github_urls: list[str]
+    ) -> list[list[ASTFeatures]]:
+        async with github_parser:
+            return await asyncio.gather(
+                *(
+                    self._aget_from_work_infos(
+                        github_parser.get_files_generator_from_url(
+                            github_url, path_regexp=self.path_regexp
+                        )
+                    )
+                    for github_url in github_urls
+                )
+            )
+
+    async def _aget_from_users_repos(
+        self: Self, github_parser: "AsyncGithubParser", github_user: str
+    ) -> list[list[ASTFeatures]]:
+        async with github_parser:
+            repos = await github_parser.get_list_of_repos(
+                owner=github_user, reg_exp=self.repo_regexp
+            )
+            for repo in repos:
+                self.logger.debug(f"{GET_FRAZE} {repo.html_url}")
+            return await asyncio.gather(
+                *(
+                    self._aget_from_work_infos(
+                        github_parser.get_files_generator_from_repo_url(
+                            repo.html_url, path_regexp=self.path_regexp
+                        )
+                    )
+                    for repo in repos
+                )
+            )
+
     @abstractmethod
     def get_from_content(self: Self, work_info: WorkInfo) -> ASTFeatures | None: ...
 
@@ -197,6 +315,18 @@ class AbstractGetter(ABC):
             return works
         self.check_github_parser_provided()
         assert self.github_parser
+        from webparsers.async_github_parser import AsyncGithubParser
+
+        if isinstance(self.github_parser, AsyncGithubParser):
+            for github_url in github_urls:
+                self.logger.debug(f"{GET_FRAZE} {github_url}")
+            # The sources are fetched concurrently with extraction of their features,
+            # so the stage includes the time of the extraction.
+            with run_stats.timer(STAGE_GITHUB):
+                nested_works = asyncio.run(
+                    self._aget_from_github_urls(self.github_parser, github_urls)
+                )
+            return _flatten_if_dependent(nested_works, independent)
 
         for github_url in github_urls:
             nested_works: list[ASTFeatures] = []
@@ -204,7 +334,7 @@ class AbstractGetter(ABC):
             gh_prj_files = self.github_parser.get_files_generator_from_url(
                 github_url, path_regexp=self.path_regexp
             )
-            for work_info in gh_prj_files:
+            for work_info in _timed_github_iter(gh_prj_files):
                 features = self.get_from_content(work_info)
                 if features is None:
                     continue
@@ -242,8 +372,19 @@ class AbstractGetter(ABC):
             return works
         self.check_github_parser_provided()
         assert self.github_parser
-
-        repos = self.github_parser.get_list_of_repos(owner=github_user, reg_exp=self.repo_regexp)
+        from webparsers.async_github_parser import AsyncGithubParser
+
+        if isinstance(self.github_parser, AsyncGithubParser):
+            with run_stats.timer(STAGE_GITHUB):
+                nested_works = asyncio.run(
+                    self._aget_from_users_repos(self.github_parser, github_user)
+                )
+            return _flatten_if_dependent(nested_works, independent)
+
+        with run_stats.timer(STAGE_GITHUB):
+            repos = self.github_parser.get_list_of_repos(
+                owner=github_user, reg_exp=self.repo_regexp
+            )
         for repo in repos:
             nested_works: list[ASTFeatures] = []
 
@@ -251,7 +392,7 @@ class AbstractGetter(ABC):
             files = self.github_parser.get_files_generator_from_repo_url(
                 repo.html_url, path_regexp=self.path_regexp
             )
-            for work_info in files:
+            for work_info in _timed_github_iter(files):
                 features = self.get_from_content(work_info)
                 if features is None:
                     continue
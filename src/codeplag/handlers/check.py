@@ -3,48 +3,64 @@
 import logging
 import math
 import os
-from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, wait
 from datetime import timedelta
 from itertools import combinations
 from pathlib import Path
 from time import monotonic
+from typing import TYPE_CHECKING, Final
 
 import numpy as np
-import pandas as pd
-from decouple import Config, RepositoryEnv
 from numpy.typing import NDArray
-from requests import Session
 from typing_extensions import Self
 
-from codeplag.algorithms.compare import compare_works
+from codeplag.algorithms.compare import (
+    calc_min_ngrams_ratio,
+    get_features_structure_view,
+    is_same_structure,
+)
+from codeplag.algorithms.tokenbased import generate_ngrams
 from codeplag.config import read_settings_conf
 from codeplag.consts import (
+    DEFAULT_GITHUB_CACHE_SIZE,
+    DEFAULT_GITHUB_CONCURRENCY,
     DEFAULT_MAX_DEPTH,
     DEFAULT_MODE,
     DEFAULT_NGRAMS_LENGTH,
+    DEFAULT_STRUCTURE_ASSIGNMENT,
+    DEFAULT_STRUCTURE_CANDIDATES,
+    DEFAULT_TOP_K,
+    DEFAULT_WORKERS_START_METHOD,
+    GITHUB_CACHE_PATH,
     SUPPORTED_EXTENSIONS,
 )
-from codeplag.cplag.utils import CFeaturesGetter
-from codeplag.db.mongo import (
-    FeaturesRepository,
-    MongoDBConnection,
-    MongoFeaturesCache,
-    MongoReporter,
-    ReportRepository,
-)
 from codeplag.display import (
     ComplexProgress,
     Progress,
+    ProgressPrinter,
     print_compare_result,
-    print_pretty_progress,
 )
 from codeplag.featurescache import AbstractFeaturesCache
 from codeplag.getfeatures import AbstractGetter
 from codeplag.logger import codeplag_logger as logger
-from codeplag.pyplag.utils import PyFeaturesGetter
-from codeplag.reporters import AbstractReporter, CSVReporter
+from codeplag.ngramsindex import NgramsIndex
+from codeplag.stats import (
+    PAIRS_COMPARED,
+    PAIRS_FROM_CACHE,
+    PAIRS_FROM_DUPLICATES,
+    PAIRS_PRUNED,
+    PAIRS_SCHEDULED,
+    PAIRS_SKIPPED_BY_SIZE,
+    STAGE_CACHE,
+    STAGE_REPORT,
+    STAGE_TOTAL,
+    run_stats,
+)
 from codeplag.types import (
     ASTFeatures,
+    CompareSettings,
     ExitCode,
     Extension,
     FastCompareInfo,
@@ -55,9 +71,23 @@ from codeplag.types import (
     NgramsLength,
     ProcessingWorks,
     ShortOutput,
+    StartMethod,
+    StructureAssignment,
+    StructureCompareInfo,
     Threshold,
 )
-from webparsers.github_parser import GitHubParser
+from codeplag.workerpool import WorkerPool
+
+# The language backends, the MongoDB, the pandas and the GitHub parser are imported only
+# when they are used, so they don't slow down the start of other checks
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from codeplag.reporters import AbstractReporter
+
+# The maximal count of the scheduled comparisons per worker process. When it is reached,
+# the submission waits for results, so they don't pile up in memory.
+_MAX_PENDING_PER_WORKER: Final[int] = 4
 
 
 class WorksComparator:
@@ -69,6 +99,12 @@ class WorksComparator:
         mode: Mode = DEFAULT_MODE,
         set_github_parser: bool = False,
         all_branches: bool = False,
+        show_stats: bool = False,
+        stats_file: Path | None = None,
+        archive: Path | None = None,
+        top_k: int = DEFAULT_TOP_K,
+        add_to_archive: bool = False,
+        branch_commits: bool = False,
     ) -> None:
         """Initializes a `FeaturesGetter` and sets settings from the settings config file.
 
@@ -82,23 +118,57 @@ class WorksComparator:
             set_github_parser (bool): When True sets GithubParser for search in the GitHub.
             all_branches (bool): When True and the `set_github` option was set,
               searches on all branches of the repository.
+            show_stats (bool): When True logs time spent on each stage of the check
+              and counters of compared pairs.
+            stats_file (Path | None, optional): Path to the JSON file for saving
+              statistics of the check.
+            archive (Path | None, optional): Path to the N-grams index of the archived
+              works. When set, each checked work is compared only with the most similar
+              archived works instead of the other checked works.
+            top_k (int): Count of the most similar archived works compared with each
+              checked work.
+            add_to_archive (bool): When True the checked works are added to the archive
+              after the check.
+            branch_commits (bool): When True and the `set_github` option was set,
+              files from GitHub get the last commit of the branch instead of their own
+              last commits, which saves a request per file.
 
         """
         if extension == "py":
-            FeaturesGetter = PyFeaturesGetter
+            from codeplag.pyplag.utils import PyFeaturesGetter as FeaturesGetter
         elif extension == "cpp":
-            FeaturesGetter = CFeaturesGetter
+            from codeplag.cplag.utils import CFeaturesGetter as FeaturesGetter
         else:
             raise Exception(f"Unsupported extension '{extension}'.")
 
         self.mode: Mode = mode
         self.progress: Progress | None = None
+        self.progress_printer: ProgressPrinter | None = None
+        self.show_stats = show_stats
+        self.stats_file = stats_file
+        self.archive = archive
+        self.top_k = top_k
+        self.add_to_archive = add_to_archive
+        # Groups of duplicates by ids of their representatives
+        self.duplicates: dict[int, list[ASTFeatures]] = {}
 
         settings_conf = read_settings_conf()
         self.show_progress: Flag = settings_conf["show_progress"]
         self.short_output = ShortOutput(settings_conf["short_output"])
         self.threshold: Threshold | None = settings_conf["threshold"]
         self.workers: int = settings_conf["workers"]
+        self.workers_start_method: StartMethod = settings_conf.get(
+            "workers_start_method", DEFAULT_WORKERS_START_METHOD
+        )
+        # The worker processes are started on the first comparison and are reused
+        # by the next checks
+        self.pool = WorkerPool(self.workers, self.workers_start_method)
+        self.github_concurrency: int = settings_conf.get(
+            "github_concurrency", DEFAULT_GITHUB_CONCURRENCY
+        )
+        self.github_cache_size: int = settings_conf.get(
+            "github_cache_size", DEFAULT_GITHUB_CACHE_SIZE
+        )
         self.ngrams_length: NgramsLength = settings_conf.get(
             "ngrams_length", DEFAULT_NGRAMS_LENGTH
         )
@@ -106,11 +176,25 @@ class WorksComparator:
             "max_depth",
             DEFAULT_MAX_DEPTH,
         )
+        self.structure_candidates: int = settings_conf.get(
+            "structure_candidates", DEFAULT_STRUCTURE_CANDIDATES
+        )
+        self.structure_assignment: StructureAssignment = settings_conf.get(
+            "structure_assignment", DEFAULT_STRUCTURE_ASSIGNMENT
+        )
         reports = settings_conf.get("reports")
         reports_extension = settings_conf["reports_extension"]
-        self.reporter: AbstractReporter | None = None
+        self.reporter: "AbstractReporter | None" = None
         features_cache: AbstractFeaturesCache | None = None
         if reports_extension == "mongo":
+            from codeplag.db.mongo import (
+                FeaturesRepository,
+                MongoDBConnection,
+                MongoFeaturesCache,
+                MongoReporter,
+                ReportRepository,
+            )
+
             connection = MongoDBConnection.from_settings(settings_conf)
             features_cache_repo = FeaturesRepository(connection)
             compare_info_repo = ReportRepository(connection)
@@ -119,7 +203,7 @@ class WorksComparator:
             self.reporter = MongoReporter(compare_info_repo)
         elif reports is not None:
             if reports_extension == "csv":
-                Reporter = CSVReporter
+                from codeplag.reporters import CSVReporter as Reporter
             else:
                 raise ValueError(f"Unsupported reports extension '{reports_extension}'.")
             self.reporter = Reporter(reports)
@@ -134,18 +218,29 @@ class WorksComparator:
         )
 
         if set_github_parser:
-            self.set_github_parser(all_branches, settings_conf.get("environment"))
+            self.set_github_parser(all_branches, settings_conf.get("environment"), branch_commits)
 
-    def set_github_parser(self: Self, all_branches: bool, environment: Path | None = None) -> None:
-        """Sets a GitHubParser object for getting works information from GitHub.
+    def set_github_parser(
+        self: Self,
+        all_branches: bool,
+        environment: Path | None = None,
+        branch_commits: bool = False,
+    ) -> None:
+        """Sets an AsyncGithubParser object for getting works information from GitHub.
 
         Args:
         ----
             all_branches (bool): Searching in all branches.
             environment (Path | None, optional): Path to the environment file
               with GitHub access token. Defaults to None.
+            branch_commits (bool): Attributing the last commit of the branch to each file.
 
         """
+        from decouple import Config, RepositoryEnv
+
+        from webparsers.async_github_parser import AsyncGithubParser
+        from webparsers.cache import GitHubCache
+
         if not environment:
             logger.warning(
                 "Env file not found or not a file. Trying to get token from environment."
@@ -156,13 +251,21 @@ class WorksComparator:
             access_token: str = env_config.get("ACCESS_TOKEN", default="")  # type: ignore
         if not access_token:
             logger.warning("GitHub access token is not defined.")
+        github_logger = logging.getLogger(f"{logger.name}.webparsers")
+        cache = None
+        if self.github_cache_size:
+            cache = GitHubCache(
+                GITHUB_CACHE_PATH, self.github_cache_size * 2**20, logger=github_logger
+            )
         self.features_getter.set_github_parser(
-            GitHubParser(
+            AsyncGithubParser(
                 file_extensions=SUPPORTED_EXTENSIONS[self.features_getter.extension],
                 check_all=all_branches,
-                access_token=access_token,
-                logger=logging.getLogger(f"{logger.name}.webparsers"),
-                session=Session(),
+                token=access_token or None,
+                logger=github_logger,
+                max_concurrency=self.github_concurrency,
+                branch_commits=branch_commits,
+                cache=cache,
             )
         )
 
@@ -181,31 +284,62 @@ class WorksComparator:
             github_urls = []
 
         logger.debug("Mode: %s; Extension: %s.", self.mode, self.features_getter.extension)
+        if self._stats_enabled:
+            run_stats.enable()
+            run_stats.reset()
+        self.duplicates = {}
         begin_time = monotonic()
-        features_from_files = self.features_getter.get_from_files(files)
-
-        logger.info("Starting searching for plagiarism ...")
-        exit_code = ExitCode.EXIT_SUCCESS
-        if self.mode == "many_to_many":
-            exit_code = self.__many_to_many_check(
-                features_from_files,
-                directories,
-                github_urls,
-                github_user,
-            )
-        elif self.mode == "one_to_one":
-            exit_code = self.__one_to_one_check(
-                features_from_files,
-                directories,
-                github_urls,
-                github_user,
-            )
-        logger.debug("Time for all %s.", timedelta(seconds=monotonic() - begin_time))
-        logger.info("Ending searching for plagiarism ...")
-        if isinstance(self.reporter, CSVReporter):
-            self.reporter._write_df_to_fs()
+        with run_stats.timer(STAGE_TOTAL):
+            features_from_files = self.features_getter.get_from_files(files)
+
+            logger.info("Starting searching for plagiarism ...")
+            exit_code = ExitCode.EXIT_SUCCESS
+            if self.archive is not None:
+                exit_code = self.__archive_check(
+                    self.archive,
+                    features_from_files,
+                    directories,
+                    github_urls,
+                    github_user,
+                )
+            elif self.mode == "many_to_many":
+                exit_code = self.__many_to_many_check(
+                    features_from_files,
+                    directories,
+                    github_urls,
+                    github_user,
+                )
+            elif self.mode == "one_to_one":
+                exit_code = self.__one_to_one_check(
+                    features_from_files,
+                    directories,
+                    github_urls,
+                    github_user,
+                )
+            logger.debug("Time for all %s.", timedelta(seconds=monotonic() - begin_time))
+            logger.info("Ending searching for plagiarism ...")
+            if self.reporter is not None:
+                from codeplag.reporters import CSVReporter
+
+                if isinstance(self.reporter, CSVReporter):
+                    with run_stats.timer(STAGE_REPORT):
+                        self.reporter._write_df_to_fs()
+        if self._stats_enabled:
+            self._output_stats()
+            run_stats.disable()
         return exit_code
 
+    @property
+    def _stats_enabled(self: Self) -> bool:
+        return self.show_stats or self.stats_file is not None
+
+    def _output_stats(self: Self) -> None:
+        if self.show_stats:
+            logger.info("Statistics of the check:\n%s", run_stats.summary())
+        if self.stats_file is not None:
+            run_stats.write_json(self.stats_file)
+            logger.debug("Statistics of the check saved to '%s'.", self.stats_file)
+
     def __many_to_many_check(
         self: Self,
         features_from_files: list[ASTFeatures],
@@ -219,27 +353,52 @@ class WorksComparator:
         works.extend(self.features_getter.get_from_github_urls(github_urls))
         works.extend(self.features_getter.get_from_users_repos(github_user))
 
+        # The works are swept in order of their sizes, and each work is compared only with
+        # the smaller works whose size is within the window allowed by the threshold.
+        sizes = [
+            len(generate_ngrams(work.tokens, self.ngrams_length, hashit=True, unique=True))
+            for work in works
+        ]
+        order = sorted(range(len(works)), key=sizes.__getitem__)
+        works = [works[index] for index in order]
+        window_starts = _get_window_starts(
+            [sizes[index] for index in order], calc_min_ngrams_ratio(self.threshold)
+        )
+        skipped = sum(window_starts)
+        if skipped:
+            logger.info("Pairs skipped due to the difference in works sizes: %s.", skipped)
+            run_stats.increase(PAIRS_SKIPPED_BY_SIZE, skipped)
+        # Only representatives of the groups of duplicates are compared with other works,
+        # the results are fanned out to the other members of the groups.
+        groups = _group_duplicates(works)
+        self.duplicates = {id(group[0]): group for group in groups if len(group) > 1}
+        representatives = {id(work): id(group[0]) for group in groups for work in group}
+        if self.duplicates:
+            logger.info(
+                "Groups of duplicates: %s; Duplicated works: %s.",
+                len(self.duplicates),
+                sum(len(group) for group in self.duplicates.values()),
+            )
+
         if self.show_progress:
             count_works = len(works)
-            iterations = _calc_iterations(count_works)
+            iterations = _calc_iterations(count_works) - skipped
             logger.info(
                 "Works to be checked: %s; Number of checks: %s.",
                 count_works,
                 iterations,
             )
             self.progress = Progress(iterations)
+            self.progress_printer = ProgressPrinter(self.progress, self.workers)
         exit_code = ExitCode.EXIT_SUCCESS
-        with ProcessPoolExecutor(max_workers=self.workers) as executor:
-            processing: list[ProcessingWorks] = []
-            futures: set[Future] = set()
-            for i, work1 in enumerate(works):
-                for j, work2 in enumerate(works):
-                    if i <= j:
-                        continue
-                    exit_code = ExitCode(
-                        exit_code | self._do_step(executor, processing, futures, work1, work2)
-                    )
-            exit_code = ExitCode(exit_code | self._handle_completed_futures(processing, futures))
+        pending: dict[Future, ProcessingWorks] = {}
+        for i, work1 in enumerate(works):
+            for work2 in works[window_starts[i] : i]:
+                rep1, rep2 = representatives[id(work1)], representatives[id(work2)]
+                if rep1 != rep2 and (rep1 != id(work1) or rep2 != id(work2)):
+                    continue
+                exit_code = ExitCode(exit_code | self._do_step(pending, work1, work2))
+        exit_code = ExitCode(exit_code | self._handle_completed_futures(pending))
         return exit_code
 
     def __one_to_one_check(
@@ -268,66 +427,126 @@ class WorksComparator:
                 iterations,
             )
             self.progress = ComplexProgress(iterations)
+            self.progress_printer = ProgressPrinter(self.progress, self.workers)
         cases = combinations(combined_elements, r=2)
         exit_code = ExitCode.EXIT_SUCCESS
-        with ProcessPoolExecutor(max_workers=self.workers) as executor:
-            processing: list[ProcessingWorks] = []
-            futures: set[Future] = set()
-            for internal_iteration, case in enumerate(cases, start=1):
-                first_sequence, second_sequence = case
-                if self.progress is not None:
-                    assert isinstance(self.progress, ComplexProgress)
-                    internal_iterations = len(first_sequence) * len(second_sequence)
-                    logger.debug(
-                        "Internal iteration: %s; Number of internal checks: %s.",
-                        internal_iteration,
-                        internal_iterations,
+        pending: dict[Future, ProcessingWorks] = {}
+        for internal_iteration, case in enumerate(cases, start=1):
+            first_sequence, second_sequence = case
+            if self.progress is not None:
+                assert isinstance(self.progress, ComplexProgress)
+                internal_iterations = len(first_sequence) * len(second_sequence)
+                logger.debug(
+                    "Internal iteration: %s; Number of internal checks: %s.",
+                    internal_iteration,
+                    internal_iterations,
+                )
+                self.progress.add_internal_progress(internal_iterations)
+            for work1 in first_sequence:
+                for work2 in second_sequence:
+                    exit_code = ExitCode(exit_code | self._do_step(pending, work1, work2))
+        exit_code = ExitCode(exit_code | self._handle_completed_futures(pending))
+        return exit_code
+
+    def __archive_check(
+        self: Self,
+        archive: Path,
+        features_from_files: list[ASTFeatures],
+        directories: list[Path],
+        github_urls: list[str],
+        github_user: str,
+    ) -> ExitCode:
+        works: list[ASTFeatures] = []
+        works.extend(features_from_files)
+        works.extend(self.features_getter.get_from_dirs(directories))
+        works.extend(self.features_getter.get_from_github_urls(github_urls))
+        works.extend(self.features_getter.get_from_users_repos(github_user))
+
+        if archive.exists():
+            index = NgramsIndex.load(archive)
+        else:
+            logger.warning("The archive '%s' does not exist yet.", archive)
+            index = NgramsIndex(self.ngrams_length)
+        candidates = [index.query(work, self.top_k) for work in works]
+
+        if self.show_progress:
+            iterations = sum(len(work_candidates) for work_candidates in candidates)
+            logger.info(
+                "Works to be checked: %s; Archived works: %s; Number of checks: %s.",
+                len(works),
+                len(index),
+                iterations,
+            )
+            self.progress = Progress(iterations)
+            self.progress_printer = ProgressPrinter(self.progress, self.workers)
+        exit_code = ExitCode.EXIT_SUCCESS
+        pending: dict[Future, ProcessingWorks] = {}
+        for work, work_candidates in zip(works, candidates, strict=True):
+            for candidate in work_candidates:
+                exit_code = ExitCode(
+                    exit_code
+                    | self._do_step(
+                        pending,
+                        work,
+                        index.get_work(candidate.work_id),
                     )
-                    self.progress.add_internal_progress(internal_iterations)
-                for work1 in first_sequence:
-                    for work2 in second_sequence:
-                        exit_code = ExitCode(
-                            exit_code | self._do_step(executor, processing, futures, work1, work2)
-                        )
-            exit_code = ExitCode(exit_code | self._handle_completed_futures(processing, futures))
+                )
+        exit_code = ExitCode(exit_code | self._handle_completed_futures(pending))
+
+        if self.add_to_archive:
+            for work in works:
+                index.add(work)
+            index.save(archive)
+            logger.info("The archive '%s' updated; archived works: %s.", archive, len(index))
         return exit_code
 
     def _do_step(
         self: Self,
-        executor: ProcessPoolExecutor,
-        processing: list[ProcessingWorks],
-        futures: set[Future],
+        pending: dict[Future, ProcessingWorks],
         work1: ASTFeatures,
         work2: ASTFeatures,
     ) -> ExitCode:
         if work1 == work2:
-            _print_pretty_progress_if_need_and_increase(self.progress, self.workers)
+            _increase_progress(self.progress_printer)
             return ExitCode.EXIT_SUCCESS
 
+        run_stats.increase(PAIRS_SCHEDULED)
         work1, work2 = sorted([work1, work2])
-        metrics = None
-        if self.reporter is not None:
-            metrics = self.reporter.get_result(work1, work2)
-            if isinstance(metrics, FullCompareInfo) and (
-                metrics.first_heads != work1.head_nodes or metrics.second_heads != work2.head_nodes
-            ):
-                logger.warning(
-                    "Invalid data for the '%s' and '%s' found in cache.",
-                    work1.filepath,
-                    work2.filepath,
-                )
-                metrics = None
+        metrics = self._get_cached_result(work1, work2)
         if metrics is None:
-            future = self._create_future_compare(executor, work1, work2)
-            future.id = len(processing)  # type: ignore
-            futures.add(future)
-            processing.append(ProcessingWorks(work1, work2))
-            return ExitCode.EXIT_SUCCESS
+            pending[self._create_future_compare(work1, work2)] = ProcessingWorks(work1, work2)
+            run_stats.increase(PAIRS_COMPARED)
+            if len(pending) < self.workers * _MAX_PENDING_PER_WORKER:
+                return ExitCode.EXIT_SUCCESS
+            # Results are handled while the next pairs are submitted, so only a window
+            # of them is kept in memory and the output starts immediately
+            return self._handle_completed_futures(pending, return_when=FIRST_COMPLETED)
+        run_stats.increase(PAIRS_FROM_CACHE)
         if self.short_output is ShortOutput.SHOW_ALL:
             self._handle_compare_result(work1, work2, metrics)
-        _print_pretty_progress_if_need_and_increase(self.progress, self.workers)
+        _increase_progress(self.progress_printer)
+        self._handle_duplicates(work1, work2, metrics, cached=True)
         return ExitCode.EXIT_FOUND_SIM
 
+    def _get_cached_result(
+        self: Self, work1: ASTFeatures, work2: ASTFeatures
+    ) -> FullCompareInfo | None:
+        """Returns the relevant result of comparing the sorted works from the reporter."""
+        if self.reporter is None:
+            return None
+        with run_stats.timer(STAGE_CACHE):
+            metrics = self.reporter.get_result(work1, work2)
+        if isinstance(metrics, FullCompareInfo) and (
+            metrics.first_heads != work1.head_nodes or metrics.second_heads != work2.head_nodes
+        ):
+            logger.warning(
+                "Invalid data for the '%s' and '%s' found in cache.",
+                work1.filepath,
+                work2.filepath,
+            )
+            return None
+        return metrics
+
     def _handle_compare_result(
         self: Self,
         work1: ASTFeatures,
@@ -339,12 +558,14 @@ class WorksComparator:
             "Compare '%s' with '%s' finished.", work1.filepath, work2.filepath
         )
         if isinstance(metrics, FastCompareInfo):
+            run_stats.increase(PAIRS_PRUNED)
             return ExitCode.EXIT_SUCCESS
         logger.trace(  # type: ignore
             "Found similarity '%s' with '%s'.", work1.filepath, work2.filepath
         )
         if self.reporter and save:
-            self.reporter.save_result(metrics)
+            with run_stats.timer(STAGE_REPORT):
+                self.reporter.save_result(metrics)
         if self.short_output is ShortOutput.NO_SHOW:
             return ExitCode.EXIT_FOUND_SIM
 
@@ -363,33 +584,121 @@ class WorksComparator:
 
     def _handle_completed_futures(
         self: Self,
-        processing: list[ProcessingWorks],
-        futures: set[Future],
+        pending: dict[Future, ProcessingWorks],
+        return_when: str = ALL_COMPLETED,
     ) -> ExitCode:
+        """Handles completed comparisons and removes them from the pending ones.
+
+        Args:
+        ----
+            pending (dict[Future, ProcessingWorks]): The scheduled comparisons.
+            return_when (str): When FIRST_COMPLETED waits for at least one comparison
+              and handles all the completed ones, otherwise waits for all comparisons.
+
+        """
+        exit_code = ExitCode.EXIT_SUCCESS
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                exit_code = ExitCode(exit_code | self._handle_future(future, pending.pop(future)))
+            if return_when == FIRST_COMPLETED:
+                break
+        return exit_code
+
+    def _handle_future(self: Self, future: Future, proc_works_info: ProcessingWorks) -> ExitCode:
+        metrics: FullCompareInfo | FastCompareInfo
+        if run_stats.enabled:
+            metrics, stats_snapshot = future.result()
+            run_stats.merge(stats_snapshot)
+        else:
+            metrics = future.result()
+        exit_code = self._handle_compare_result(
+            proc_works_info.work1, proc_works_info.work2, metrics, save=True
+        )
+        _increase_progress(self.progress_printer)
+        return ExitCode(
+            exit_code
+            | self._handle_duplicates(proc_works_info.work1, proc_works_info.work2, metrics)
+        )
+
+    def _handle_duplicates(
+        self: Self,
+        work1: ASTFeatures,
+        work2: ASTFeatures,
+        metrics: FullCompareInfo | FastCompareInfo,
+        cached: bool = False,
+    ) -> ExitCode:
+        """Handles the result of comparing representatives for other pairs of their groups.
+
+        The fresh result is saved and shown for all the other pairs. The cached result
+        is used only for the pairs which are missing from the reporter, e.g. with a copy
+        added after the previous check, and the cached ones are shown as cached.
+
+        Args:
+        ----
+            work1 (ASTFeatures): The first compared work.
+            work2 (ASTFeatures): The second compared work.
+            metrics (FullCompareInfo | FastCompareInfo): The result of their comparison.
+            cached (bool): When True the result is taken from the reporter.
+
+        """
+        group1 = self.duplicates.get(id(work1), [work1])
+        group2 = self.duplicates.get(id(work2), [work2])
         exit_code = ExitCode.EXIT_SUCCESS
-        for future in as_completed(futures):
-            metrics: FullCompareInfo | FastCompareInfo = future.result()
-            proc_works_info = processing[future.id]  # type: ignore
-            exit_code = ExitCode(
-                exit_code
-                | self._handle_compare_result(
-                    proc_works_info.work1, proc_works_info.work2, metrics, save=True
+        if any(work is work2 for work in group1) or any(work is work1 for work in group2):
+            # The works are duplicates of each other
+            return exit_code
+        for first in group1:
+            for second in group2:
+                if first is work1 and second is work2:
+                    continue
+                pair_first, pair_second, fanned_out = _fan_out_compare_info(metrics, first, second)
+                cached_metrics = (
+                    self._get_cached_result(pair_first, pair_second) if cached else None
                 )
-            )
-            _print_pretty_progress_if_need_and_increase(self.progress, self.workers)
+                if cached_metrics is None:
+                    run_stats.increase(PAIRS_FROM_DUPLICATES)
+                    exit_code = ExitCode(
+                        exit_code
+                        | self._handle_compare_result(
+                            pair_first, pair_second, fanned_out, save=True
+                        )
+                    )
+                else:
+                    run_stats.increase(PAIRS_FROM_CACHE)
+                    if self.short_output is ShortOutput.SHOW_ALL:
+                        self._handle_compare_result(pair_first, pair_second, cached_metrics)
+                    exit_code = ExitCode.EXIT_FOUND_SIM
+                _increase_progress(self.progress_printer)
         return exit_code
 
     def _create_future_compare(
         self: Self,
-        executor: ProcessPoolExecutor,
         work1: ASTFeatures,
         work2: ASTFeatures,
     ) -> Future:
         logger.trace("Creating future compare '%s' with '%s'.", work1.filepath, work2.filepath)  # type: ignore
-        return executor.submit(
-            compare_works, work1, work2, self.ngrams_length, self.max_depth, self.threshold
+        # Views are calculated once per work here rather than in each worker task
+        get_features_structure_view(work1, self.max_depth)
+        get_features_structure_view(work2, self.max_depth)
+        return self.pool.submit_compare(
+            self._compare_settings, work1, work2, with_stats=run_stats.enabled
         )
 
+    @property
+    def _compare_settings(self: Self) -> CompareSettings:
+        return CompareSettings(
+            self.ngrams_length,
+            self.max_depth,
+            self.threshold,
+            self.structure_candidates,
+            self.structure_assignment,
+        )
+
+    def close(self: Self) -> None:
+        """Shuts down the worker processes."""
+        self.pool.shutdown()
+
 
 class IgnoreThresholdWorksComparator(WorksComparator):
     def __init__(
@@ -400,34 +709,140 @@ class IgnoreThresholdWorksComparator(WorksComparator):
         mode: Mode = DEFAULT_MODE,
         set_github_parser: bool = False,
         all_branches: bool = False,
+        show_stats: bool = False,
+        stats_file: Path | None = None,
+        archive: Path | None = None,
+        top_k: int = DEFAULT_TOP_K,
+        add_to_archive: bool = False,
+        branch_commits: bool = False,
     ) -> None:
         super().__init__(
-            extension, repo_regexp, path_regexp, mode, set_github_parser, all_branches
+            extension,
+            repo_regexp,
+            path_regexp,
+            mode,
+            set_github_parser,
+            all_branches,
+            show_stats,
+            stats_file,
+            archive,
+            top_k,
+            add_to_archive,
+            branch_commits,
         )
         self.threshold = None
 
 
+def _is_duplicate(work1: ASTFeatures, work2: ASTFeatures) -> bool:
+    """Returns True when all features of the works used in the comparison are equal."""
+    return (
+        is_same_structure(work1, work2)
+        and len(work1.head_nodes) == len(work2.head_nodes)
+        and work1.tokens == work2.tokens
+        and work1.operators == work2.operators
+        and work1.keywords == work2.keywords
+        and work1.literals == work2.literals
+        and work1.fingerprints == work2.fingerprints
+    )
+
+
+def _group_duplicates(works: list[ASTFeatures]) -> list[list[ASTFeatures]]:
+    """Groups the works which can't be distinguished by the comparison.
+
+    The works are grouped by hashes of their structures first, so only the probable
+    copies are compared feature by feature. The first work of each group is its
+    representative, and the groups keep the order of the works.
+
+    Args:
+    ----
+        works (list[ASTFeatures]): The checked works.
+
+    """
+    groups: list[list[ASTFeatures]] = []
+    groups_by_hash: defaultdict[str, list[list[ASTFeatures]]] = defaultdict(list)
+    for work in works:
+        candidates = groups_by_hash[work.sha256] if work.sha256 else []
+        for group in candidates:
+            if _is_duplicate(group[0], work):
+                group.append(work)
+                break
+        else:
+            groups.append([work])
+            if work.sha256:
+                candidates.append(groups[-1])
+    return groups
+
+
+def _fan_out_compare_info(
+    metrics: FullCompareInfo | FastCompareInfo,
+    work1: ASTFeatures,
+    work2: ASTFeatures,
+) -> tuple[ASTFeatures, ASTFeatures, FullCompareInfo | FastCompareInfo]:
+    """Returns the result of comparing duplicates of the compared works.
+
+    Args:
+    ----
+        metrics (FullCompareInfo | FastCompareInfo): The result of comparing the works.
+        work1 (ASTFeatures): The duplicate of the first compared work.
+        work2 (ASTFeatures): The duplicate of the second compared work.
+
+    Returns:
+    -------
+        The duplicates in the sorted order and the result of their comparison.
+
+    """
+    if isinstance(metrics, FastCompareInfo):
+        return *sorted([work1, work2]), metrics
+    structure = metrics.structure
+    if work2 < work1:
+        work1, work2 = work2, work1
+        structure = StructureCompareInfo(
+            similarity=structure.similarity,
+            compliance_matrix=structure.compliance_matrix.transpose(1, 0, 2),
+        )
+    return (
+        work1,
+        work2,
+        metrics._replace(
+            first_heads=work1.head_nodes,
+            first_modify_date=work1.modify_date,
+            first_sha256=work1.sha256,
+            first_path=work1.filepath,
+            second_heads=work2.head_nodes,
+            second_modify_date=work2.modify_date,
+            second_sha256=work2.sha256,
+            second_path=work2.filepath,
+            structure=structure,
+        ),
+    )
+
+
 def compliance_matrix_to_df(
     compliance_matrix: NDArray,
     head_nodes1: list[str],
     head_nodes2: list[str],
-) -> pd.DataFrame:
-    data = np.empty(
-        (
-            compliance_matrix.shape[0],
-            compliance_matrix.shape[1],
-        ),
-        dtype=np.float64,
-    )
-    for row in range(compliance_matrix.shape[0]):
-        for col in range(compliance_matrix.shape[1]):
-            data[row][col] = compliance_matrix[row][col][0] / compliance_matrix[row][col][1]
+) -> "pd.DataFrame":
+    import pandas as pd
+
+    data = np.divide(compliance_matrix[:, :, 0], compliance_matrix[:, :, 1], dtype=np.float64)
     compliance_matrix_df = pd.DataFrame(
         data=data, index=np.array(head_nodes1), columns=np.array(head_nodes2)
     )
     return compliance_matrix_df
 
 
+def _get_window_starts(sizes: list[int], min_ratio: float) -> list[int]:
+    """Returns the index of the first work that may be similar to the work for each work.
+
+    Args:
+    ----
+        sizes (list[int]): Sorted sizes of the works.
+        min_ratio (float): The minimal ratio of sizes of the works which may be similar.
+
+    """
+    return [min(bisect_left(sizes, min_ratio * size), index) for index, size in enumerate(sizes)]
+
+
 def _calc_iterations(count: int, mode: Mode = DEFAULT_MODE) -> int:
     """Calculates the required number of iterations for all checks."""
     if count <= 1:
@@ -441,8 +856,7 @@ def _calc_iterations(count: int, mode: Mode = DEFAULT_MODE) -> int:
         raise ValueError(f"The provided mode '{mode}' is invalid.")
 
 
-def _print_pretty_progress_if_need_and_increase(progress: Progress | None, workers: int) -> None:
-    if progress is None:
+def _increase_progress(progress_printer: ProgressPrinter | None) -> None:
+    if progress_printer is None:
         return
-    print_pretty_progress(progress, workers)
-    next(progress)
+    progress_printer.update()
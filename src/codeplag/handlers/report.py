@@ -1,10 +1,8 @@
 """This module contains handlers for the report command of the CLI."""
 
-import re
 from collections import defaultdict
-from copy import deepcopy
 from pathlib import Path
-from typing import Callable, Generator, Literal, TypedDict
+from typing import Any, Callable, Final, Generator, Literal, TypedDict
 
 import jinja2
 import numpy as np
@@ -39,6 +37,12 @@ from codeplag.types import (
     Threshold,
 )
 
+# The size of the buffer in which the rendered parts of a report are joined
+_REPORT_WRITE_BUFFER_SIZE: Final[int] = 1024 * 1024
+# The minimal count of the cells of the percent matrix for which the same functions
+# are selected with the array operations; the scan of the smaller ones is faster
+_VECTORIZED_SAME_FUNCS_MIN_SIZE: Final[int] = 128
+
 
 class Elements(TypedDict):
     cnt_elements: int
@@ -127,39 +131,44 @@ def html_report_create(
         return ExitCode.EXIT_INVAL
 
 
+def _get_max_similarities(
+    compare_infos: pd.DataFrame, first_paths: NDArray, second_paths: NDArray
+) -> pd.Series:
+    pairs = pd.DataFrame(
+        {
+            "first_path": compare_infos["first_path"],
+            "second_path": compare_infos["second_path"],
+            "weighted_average": compare_infos["weighted_average"].astype(float),
+        }
+    )
+    # Each comparison is taken into account for both of its paths
+    pairs = pd.concat(
+        [
+            pairs,
+            pairs.rename(columns={"first_path": "second_path", "second_path": "first_path"}),
+        ],
+        ignore_index=True,
+    )
+    pairs = pairs[pairs["first_path"].isin(first_paths) & pairs["second_path"].isin(second_paths)]
+    return pairs.groupby("first_path")["weighted_average"].max()
+
+
 def calculate_general_total_similarity(
     compare_infos: pd.DataFrame | ReportRepository,
     unique_first_paths: NDArray,
     unique_second_paths: NDArray,
 ) -> float:
-    total_similarity = 0.0
     if unique_first_paths.size == 0:
-        return total_similarity
-    for first_path in unique_first_paths:
-        max_similarity = 0.0
-        for second_path in unique_second_paths:
-            sorted_paths = sorted([first_path, second_path])
-            if isinstance(compare_infos, ReportRepository):
-                selected = compare_infos.collection.find_one(
-                    {
-                        "first_path": re.compile(rf"{sorted_paths[0]}[/.\w]*"),
-                        "second_path": re.compile(rf"{sorted_paths[1]}[/.\w]*"),
-                    }
-                )
-                if selected is None:
-                    continue
-                module_similarity = selected["compare_result"]["fast"]["weighted_average"]
-            else:
-                selected = compare_infos[
-                    (compare_infos["first_path"].str.startswith(sorted_paths[0]))  # type: ignore
-                    & (compare_infos["second_path"].str.startswith(sorted_paths[1]))  # type: ignore
-                ]
-                if selected is None or selected.size == 0:
-                    continue
-                module_similarity = float(selected.iloc[0]["weighted_average"])
-            if module_similarity > max_similarity:
-                max_similarity = module_similarity
-        total_similarity += max_similarity
+        return 0.0
+    if isinstance(compare_infos, ReportRepository):
+        max_similarities = compare_infos.get_max_similarities(
+            unique_first_paths.tolist(), unique_second_paths.tolist()
+        )
+        total_similarity = sum(max_similarities.values())
+    else:
+        total_similarity = float(
+            _get_max_similarities(compare_infos, unique_first_paths, unique_second_paths).sum()
+        )
     return round(total_similarity / unique_first_paths.size * 100, 2)
 
 
@@ -181,12 +190,9 @@ def calculate_sources_total_similarity(
 
 def _convert_similarity_matrix_to_percent_matrix(matrix: NDArray) -> NDArray:
     """Convert compliance matrix of size N x M x 2 to percent 2 dimensional matrix."""
-    columns = 0 if len(matrix.shape) == 1 else matrix.shape[1]
-    percent_matrix = np.empty((matrix.shape[0], columns), dtype=np.float64)
-    for i in range(matrix.shape[0]):
-        for j in range(columns):
-            percent_matrix[i][j] = round(matrix[i][j][0] / matrix[i][j][1] * 100, 2)
-    return percent_matrix
+    if len(matrix.shape) == 1:
+        return np.empty((matrix.shape[0], 0), dtype=np.float64)
+    return np.round(np.divide(matrix[:, :, 0], matrix[:, :, 1], dtype=np.float64) * 100, 2)
 
 
 def _replace_minimal_value(same_parts: dict, new_key: str, new_value: float) -> None:
@@ -203,7 +209,7 @@ def _replace_minimal_value(same_parts: dict, new_key: str, new_value: float) ->
     same_parts[new_key] = new_value
 
 
-def _get_same_funcs(
+def _scan_same_funcs(
     first_heads: list[str],
     second_heads: list[str],
     percent_matrix: NDArray,
@@ -241,6 +247,83 @@ def _get_same_funcs(
     return result
 
 
+def _get_same_funcs(
+    first_heads: list[str],
+    second_heads: list[str],
+    percent_matrix: NDArray,
+    threshold: int = DEFAULT_THRESHOLD,
+    include_funcs_less_threshold: bool = True,
+    n: int = 3,
+) -> SameFuncs:
+    """Returns up to n most similar parts of the second work for each part of the first one.
+
+    The parts of the large matrices are selected for all the rows at once, and the
+    selection is the same as the one of the scan of each row in '_scan_same_funcs':
+    the parts are kept in the order of the scan, a kept part is replaced only by a more
+    similar one, and the first of the least similar kept parts is replaced.
+
+    Args:
+    ----
+        first_heads (list[str]): The names of the parts of the first work.
+        second_heads (list[str]): The names of the parts of the second work.
+        percent_matrix (NDArray): The similarity of the parts in percent.
+        threshold (int): The minimal similarity of the selected parts.
+        include_funcs_less_threshold (bool): When True the most similar part is selected
+          for each part of the first work even if its similarity is less than threshold.
+        n (int): The maximal count of the selected parts for each part of the first work.
+
+    """
+    if (
+        len(first_heads) * len(second_heads) < _VECTORIZED_SAME_FUNCS_MIN_SIZE
+        # The parts with the same names replace each other during the scan
+        or len(set(second_heads)) != len(second_heads)
+    ):
+        return _scan_same_funcs(
+            first_heads,
+            second_heads,
+            percent_matrix,
+            threshold,
+            include_funcs_less_threshold,
+            n,
+        )
+    rows, columns = len(first_heads), len(second_heads)
+    if rows == 0 or columns == 0:
+        return {first_head: [] for first_head in first_heads}
+    candidates = percent_matrix >= threshold
+    if include_funcs_less_threshold:
+        # Before the first part which is not less than the threshold, the scan keeps
+        # the first of the most similar parts
+        firsts = np.where(candidates.any(axis=1), candidates.argmax(axis=1), columns)
+        before_firsts = np.arange(columns) < firsts[:, None]
+        bests = np.where(before_firsts, percent_matrix, -np.inf).argmax(axis=1)
+        has_before = firsts > 0
+        candidates[has_before, bests[has_before]] = True
+    values = np.where(candidates, percent_matrix, -np.inf)
+    if n < columns:
+        nth_values = -np.partition(-values, n - 1, axis=1)[:, n - 1, None]
+        greater = values > nth_values
+        ties = candidates & (values == nth_values)
+        # The parts equal to the n-th value are kept until n parts are not less than it,
+        # and the first of them are replaced by the next more similar parts
+        not_less = greater | ties
+        kept_ties_end = (ties & (np.cumsum(not_less, axis=1) <= n)).sum(axis=1)
+        kept_ties_start = kept_ties_end - (n - greater.sum(axis=1))
+        ties_ranks = np.cumsum(ties, axis=1)
+        selected = greater | (
+            ties & (ties_ranks > kept_ties_start[:, None]) & (ties_ranks <= kept_ties_end[:, None])
+        )
+    else:
+        selected = candidates
+    order = np.argsort(-values, axis=1, kind="stable")
+    row_indexes, positions = np.nonzero(np.take_along_axis(selected, order, axis=1))
+    same_funcs: list[list[SameHead]] = [[] for _ in range(rows)]
+    for row, column in zip(
+        row_indexes.tolist(), order[row_indexes, positions].tolist(), strict=True
+    ):
+        same_funcs[row].append(SameHead(second_heads[column], percent_matrix[row, column]))
+    return dict(zip(first_heads, same_funcs, strict=True))
+
+
 def _get_parsed_line(
     compare_results: pd.DataFrame | ReportRepository,
     extract_func: Callable,
@@ -299,7 +382,7 @@ def _search_sources(
     extract_func: Callable,
     threshold: int = DEFAULT_THRESHOLD,
 ) -> tuple[SamePartsOfAll, CntHeadNodes]:
-    same_parts_of_all: SamePartsOfAll = defaultdict(lambda: {})
+    same_parts_of_all: SamePartsOfAll = defaultdict(dict)
     cnt_head_nodes: CntHeadNodes = {}
     for compare_info, same_parts_of_second, same_parts_of_first in _get_parsed_line(
         compare_results, extract_func, threshold, include_funcs_less_threshold=False
@@ -317,27 +400,45 @@ def _search_sources(
             (compare_info.first_path, compare_info.second_path, same_parts_of_second),
             (compare_info.second_path, compare_info.first_path, same_parts_of_first),
         ):
-            first_path = str(first_path)
-            second_path = str(second_path)
-            element = same_parts_of_all[first_path][second_path] = Elements(
-                cnt_elements=0,
-                same_parts=deepcopy(same_parts),
-                max_funcs_same_percentages={},
+            # The works are reported in the order of their first comparison
+            same_works = same_parts_of_all[str(first_path)]
+            # The lists of the same functions are created for each comparison,
+            # so they are stored as is without the functions without similar parts
+            same_parts = {
+                function: same_functions
+                for function, same_functions in same_parts.items()
+                if same_functions
+            }
+            if not same_parts:
+                continue
+            same_works[str(second_path)] = Elements(
+                cnt_elements=sum(len(same_functions) for same_functions in same_parts.values()),
+                same_parts=same_parts,
+                # The same functions are sorted by the percent in descending order
+                max_funcs_same_percentages={
+                    function: same_functions[0].percent
+                    for function, same_functions in same_parts.items()
+                },
             )
-            for function, same_functions in same_parts.items():
-                if (cnt_same_functions := len(same_functions)) == 0:
-                    element["same_parts"].pop(function)
-                    continue
-                element["max_funcs_same_percentages"][function] = max(
-                    same_function.percent for same_function in same_functions
-                )
-                element["cnt_elements"] += cnt_same_functions
-            if element["cnt_elements"] == 0:
-                del same_parts_of_all[first_path][second_path]
 
     return {k: v for k, v in same_parts_of_all.items() if v}, cnt_head_nodes
 
 
+def _write_report(template: jinja2.Template, save_path: Path, **context: Any) -> None:
+    """Renders the template to the file part by part instead of rendering it to a string.
+
+    Args:
+    ----
+        template (jinja2.Template): The template of the report.
+        save_path (Path): The path to the file of the report.
+        context (Any): The variables of the template.
+
+    """
+    # The small rendered parts are joined by the buffer of the file
+    with save_path.open(mode="w", encoding="utf-8", buffering=_REPORT_WRITE_BUFFER_SIZE) as f:
+        f.writelines(template.generate(**context))
+
+
 def _create_general_report(
     compare_results: pd.DataFrame | ReportRepository,
     extract_func: Callable,
@@ -368,18 +469,18 @@ def _create_general_report(
     template = environment.from_string(GENERAL_TEMPLATE_PATH.read_text())
     if save_path.is_dir():
         save_path = save_path / DEFAULT_GENERAL_REPORT_NAME
-    save_path.write_text(
-        template.render(
-            data=_get_parsed_line(compare_results, extract_func),
-            list=list,
-            len=len,
-            round=round,
-            threshold=threshold,
-            language=language,
-            first_root_path_sim=first_root_path_sim,
-            second_root_path_sim=second_root_path_sim,
-            paths=paths,
-        )
+    _write_report(
+        template,
+        save_path,
+        data=_get_parsed_line(compare_results, extract_func),
+        list=list,
+        len=len,
+        round=round,
+        threshold=threshold,
+        language=language,
+        first_root_path_sim=first_root_path_sim,
+        second_root_path_sim=second_root_path_sim,
+        paths=paths,
     )
 
 
@@ -403,21 +504,21 @@ def _create_sources_report(
     template = environment.from_string(SOURCES_TEMPLATE_PATH.read_text())
     if save_path.is_dir():
         save_path = save_path / DEFAULT_SOURCES_REPORT_NAME
-    save_path.write_text(
-        template.render(
-            data=data,
-            same_percentages=same_percentages,
-            threshold=threshold,
-            language=language,
-            enumerate=enumerate,
-            Path=Path,
-            list=list,
-            len=len,
-            round=round,
-            first_root_path_sim=first_root_path_sim,
-            second_root_path_sim=second_root_path_sim,
-            paths=paths,
-        )
+    _write_report(
+        template,
+        save_path,
+        data=data,
+        same_percentages=same_percentages,
+        threshold=threshold,
+        language=language,
+        enumerate=enumerate,
+        Path=Path,
+        list=list,
+        len=len,
+        round=round,
+        first_root_path_sim=first_root_path_sim,
+        second_root_path_sim=second_root_path_sim,
+        paths=paths,
     )
 
 
@@ -440,6 +541,9 @@ def __html_report_create(
     if not all_paths_provided and any([first_root_path, second_root_path]):
         raise ValueError(_("All paths must be provided."))
 
+    # The comparisons without similar parts are not shown in the sources report,
+    # so they are not read from the database
+    min_parts_similarity = threshold if report_type == "sources" else None
     if all_paths_provided:
         paths = tuple(sorted([str(first_root_path), str(second_root_path)]))
         if isinstance(compare_infos, pd.DataFrame):
@@ -447,16 +551,15 @@ def __html_report_create(
             compare_infos = compare_infos[compare_infos["second_path"].str.startswith(paths[1])]  # type: ignore
             extract_func = compare_infos.iterrows  # type: ignore
         else:
-            extract_func = lambda: compare_infos.collection.find(  # noqa: E731
-                {
-                    "first_path": re.compile(rf"{paths[0]}[/.\w]*"),
-                    "second_path": re.compile(rf"{paths[1]}[/.\w]*"),
-                }
+            extract_func = lambda: compare_infos.find_compare_infos(  # noqa: E731
+                paths[0], paths[1], min_parts_similarity
             )
     else:
         paths = None
         if isinstance(compare_infos, ReportRepository):
-            extract_func = lambda: compare_infos.collection.find({})  # noqa: E731
+            extract_func = lambda: compare_infos.find_compare_infos(  # noqa: E731
+                threshold=min_parts_similarity
+            )
         else:
             extract_func = compare_infos.iterrows
     environment = jinja2.Environment(extensions=["jinja2.ext.i18n"])
@@ -1,9 +1,6 @@
 from pathlib import Path
 from typing import Any
 
-import numpy as np
-import pandas as pd
-
 from codeplag.config import read_settings_conf, write_settings_conf
 from codeplag.types import Settings
 
@@ -12,12 +9,13 @@ def settings_show() -> None:
     settings_config = read_settings_conf()
     if "mongo_pass" in settings_config:
         del settings_config["mongo_pass"]
-    table = pd.DataFrame(
-        list(settings_config.values()),
-        index=np.array(settings_config),
-        columns=pd.Index(["Value"], name="Key"),
-    )
-    print(table)
+    # The table is formatted as by the pandas, which is too slow to load for it
+    keys = ["Key", *settings_config]
+    values = ["Value", *(str(value) for value in settings_config.values())]
+    keys_width = max(len(key) for key in keys)
+    values_width = max(len(value) for value in values)
+    for key, value in zip(keys, values, strict=True):
+        print(f"{key:<{keys_width}}  {value:>{values_width}}")
 
 
 def settings_modify(parsed_args: dict[str, Any]) -> None:
@@ -1,12 +1,17 @@
+import atexit
+import copy
 import logging
 import sys
+from collections import defaultdict
 from functools import partial
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from queue import SimpleQueue
 from typing import Any, Final
 
 from typing_extensions import Self
 
-from codeplag.consts import DEFAULT_LOG_LEVEL, UTIL_NAME
+from codeplag.consts import DEFAULT_LOG_LEVEL, DEFAULT_LOG_TRACE_SAMPLING, UTIL_NAME
 from codeplag.display import clear_line, error, info, red_bold, warning
 from codeplag.types import LogLevel
 
@@ -79,15 +84,44 @@ def get_stdout_handler() -> CustomStreamHandler:
     return stdout_handler
 
 
+class LocalQueueHandler(QueueHandler):
+    def prepare(self: Self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue is read in the same process, so the record is formatted only by
+        # the target handler in the background thread. The copy isn't changed by
+        # other handlers formatting the record at the same time.
+        return copy.copy(record)
+
+
+def get_queue_handler(handler: logging.Handler) -> QueueHandler:
+    """Returns the handler which passes records to the handler in a background thread.
+
+    The thread is stopped and the remaining records are handled at the exit. It runs
+    only in the main process, so the worker processes don't write to the log file.
+    """
+    queue: SimpleQueue = SimpleQueue()
+    listener = QueueListener(queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    queue_handler = LocalQueueHandler(queue)
+    queue_handler.setLevel(handler.level)
+
+    return queue_handler
+
+
 def set_handlers(
-    logger: logging.Logger, filename: Path, log_level: LogLevel = DEFAULT_LOG_LEVEL
+    logger: logging.Logger,
+    filename: Path,
+    log_level: LogLevel = DEFAULT_LOG_LEVEL,
+    trace_sampling: int = DEFAULT_LOG_TRACE_SAMPLING,
 ) -> None:
     levelno = getattr(logging, log_level.upper())
     logger.setLevel(levelno)
-    logger.addHandler(get_file_handler(filename))
+    # Writing to the file doesn't block the hot paths which log many records
+    logger.addHandler(get_queue_handler(get_file_handler(filename)))
     if levelno in [logging.INFO, logging.DEBUG, logging.TRACE]:  # type: ignore
         logger.addHandler(get_stdout_handler())
     logger.addHandler(get_stderr_handler())
+    set_trace(logger, trace_sampling)
 
 
 def log_err(*msgs: str) -> None:
@@ -101,8 +135,62 @@ def trace(self: logging.Logger, msg: str, *args: Any, **kwargs):
     logger.trace("foo %s", "bar")
     """
     if self.isEnabledFor(TRACE_LEVELNO):
+        kwargs.setdefault("stacklevel", 2)
         self._log(TRACE_LEVELNO, msg, args, **kwargs)
 
 
+def _skip_trace(*_args: Any, **_kwargs: Any) -> None:
+    """Ignores the record when the 'TRACE' level is disabled."""
+
+
+class SampledTrace:
+    def __init__(self: Self, logger: logging.Logger, sampling: int) -> None:
+        """Logs only the first and then each N-th record with the same message.
+
+        The count of the skipped records is appended to the logged ones, so the volume
+        of the frequent events stays visible in the log.
+
+        Args:
+        ----
+            logger (logging.Logger): The logger of the records.
+            sampling (int): Only one of this count of records is logged.
+
+        """
+        self.logger = logger
+        self.sampling = sampling
+        self.counters: defaultdict[str, int] = defaultdict(int)
+
+    def __call__(self: Self, msg: str, *args: Any, **kwargs) -> None:
+        count = self.counters[msg]
+        self.counters[msg] = count + 1
+        if count % self.sampling:
+            return
+        if count:
+            msg = f"{msg} [{self.sampling - 1} similar records skipped]"
+        kwargs.setdefault("stacklevel", 2)
+        self.logger._log(TRACE_LEVELNO, msg, args, **kwargs)
+
+
+def set_trace(logger: logging.Logger, sampling: int = DEFAULT_LOG_TRACE_SAMPLING) -> None:
+    """Binds the 'trace' method of the logger for its current level.
+
+    The level is checked once here instead of on each call, so the calls on hot paths
+    cost almost nothing when the 'TRACE' level is disabled.
+
+    Args:
+    ----
+        logger (logging.Logger): The logger with the set level.
+        sampling (int): When greater than 1, only the first and each N-th record
+          with the same message is logged.
+
+    """
+    if not logger.isEnabledFor(TRACE_LEVELNO):
+        logger.trace = _skip_trace  # type: ignore
+    elif sampling > 1:
+        logger.trace = SampledTrace(logger, sampling)  # type: ignore
+    else:
+        logger.trace = partial(trace, logger)  # type: ignore
+
+
 codeplag_logger = logging.getLogger(UTIL_NAME)
 codeplag_logger.trace = partial(trace, codeplag_logger)  # type: ignore
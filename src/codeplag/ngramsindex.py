@@ -0,0 +1,243 @@
+"""This module contains the persistent inverted index of N-grams of the archived works.
+
+The index maps hashes of the token N-grams to posting lists of the archived works which
+contain them. A checked work is scored against the archive only through the posting lists
+of its own N-grams, so the time of the query depends on the count of hits rather than on
+the size of the archive.
+
+The posting lists are stored separately from the serialized features of the works, so
+loading the index doesn't read the features and only the works selected as candidates
+are deserialized.
+"""
+
+import heapq
+import json
+import os
+from collections import defaultdict
+from contextlib import nullcontext
+from pathlib import Path
+from typing import IO, ContextManager, Final, NamedTuple, TypedDict
+
+from typing_extensions import Self
+
+from codeplag.algorithms.tokenbased import generate_ngrams
+from codeplag.consts import DEFAULT_NGRAMS_LENGTH
+from codeplag.featurescache import deserialize_features_from_dict, serialize_features_to_dict
+from codeplag.types import ASTFeatures, NgramsLength
+
+INDEX_FORMAT_VERSION: Final[int] = 3
+WORKS_FILE_SUFFIX: Final[str] = ".works"
+
+
+class IndexedWorkDict(TypedDict):
+    filepath: str
+    sha256: str
+    ngrams_count: int
+    # Offset of the serialized features in the works file or None for the unsaved work.
+    offset: int | None
+
+
+class NgramsIndexDict(TypedDict):
+    version: int
+    ngrams_length: int
+    works: list[IndexedWorkDict]
+    postings: dict[str, list[int]]
+
+
+class IndexCandidate(NamedTuple):
+    """The archived work which shares N-grams with the checked work."""
+
+    work_id: int
+    shared: int
+    score: float
+
+
+def get_works_path(path: Path) -> Path:
+    """Returns the path to the file with the serialized features of the index works."""
+    return path.with_name(f"{path.name}{WORKS_FILE_SUFFIX}")
+
+
+class NgramsIndex:
+    def __init__(self: Self, ngrams_length: NgramsLength = DEFAULT_NGRAMS_LENGTH) -> None:
+        self.ngrams_length: NgramsLength = ngrams_length
+        self.postings: defaultdict[int, list[int]] = defaultdict(list)
+        self.works: list[IndexedWorkDict | None] = []
+        self.__ids: dict[str, int] = {}
+        # Added works and the archived works which were already deserialized.
+        self.__features: dict[int, ASTFeatures] = {}
+        self.__works_path: Path | None = None
+
+    def __len__(self: Self) -> int:
+        return len(self.__ids)
+
+    def get_ngrams(self: Self, work: ASTFeatures) -> set[int]:
+        return generate_ngrams(work.tokens, self.ngrams_length, hashit=True, unique=True)
+
+    def add(self: Self, work: ASTFeatures) -> None:
+        """Adds the work to the index, replacing the previous version of it.
+
+        Args:
+        ----
+            work (ASTFeatures): The features of the archived work.
+
+        """
+        filepath = str(work.filepath)
+        old_id = self.__ids.get(filepath)
+        if old_id is not None:
+            old_work = self.works[old_id]
+            if old_work is not None and old_work["sha256"] == work.sha256:
+                return
+            # The postings of the removed work are dropped when the index is saved.
+            self.works[old_id] = None
+            self.__features.pop(old_id, None)
+
+        work_id = len(self.works)
+        ngrams = self.get_ngrams(work)
+        for ngram in ngrams:
+            self.postings[ngram].append(work_id)
+        self.works.append(
+            IndexedWorkDict(
+                filepath=filepath, sha256=work.sha256, ngrams_count=len(ngrams), offset=None
+            )
+        )
+        self.__features[work_id] = work
+        self.__ids[filepath] = work_id
+
+    def get_work(self: Self, work_id: int) -> ASTFeatures:
+        """Returns the features of the work, deserializing them only once per index."""
+        if self.works[work_id] is None:
+            raise KeyError(f"The work with id '{work_id}' was removed from the index.")
+        work = self.__features.get(work_id)
+        if work is None:
+            with self.__open_works() as works_file:
+                work = deserialize_features_from_dict(
+                    json.loads(self.__read_work_line(works_file, work_id))
+                )
+            self.__features[work_id] = work
+        return work
+
+    def query(self: Self, work: ASTFeatures, top_k: int) -> list[IndexCandidate]:
+        """Returns the archived works with the highest Jakkar coefficient of N-grams.
+
+        The archived version of the checked work itself is never returned.
+
+        Args:
+        ----
+            work (ASTFeatures): The features of the checked work.
+            top_k (int): The maximal count of the returned candidates.
+
+        Returns:
+        -------
+            Candidates sorted in descending order of the score.
+
+        """
+        ngrams = self.get_ngrams(work)
+        shared: defaultdict[int, int] = defaultdict(int)
+        for ngram in ngrams:
+            posting = self.postings.get(ngram)
+            if posting is None:
+                continue
+            for work_id in posting:
+                shared[work_id] += 1
+
+        count_ngrams = len(ngrams)
+        own_id = self.__ids.get(str(work.filepath))
+        candidates = (
+            IndexCandidate(
+                work_id,
+                count,
+                count / (count_ngrams + indexed_work["ngrams_count"] - count),
+            )
+            for work_id, count in shared.items()
+            if work_id != own_id and (indexed_work := self.works[work_id]) is not None
+        )
+        return heapq.nlargest(top_k, candidates, key=lambda candidate: candidate.score)
+
+    def save(self: Self, path: Path) -> None:
+        """Saves the index without removed works to the JSON file.
+
+        The serialized features of the works are saved next to it in the file
+        with the '.works' suffix.
+        """
+        works_path = get_works_path(path)
+        tmp_works_path = works_path.with_name(f"{works_path.name}.tmp")
+        new_ids: dict[int, int] = {}
+        works: list[IndexedWorkDict] = []
+        with tmp_works_path.open(mode="wb") as tmp_works_file, self.__open_works() as works_file:
+            for work_id, indexed_work in enumerate(self.works):
+                if indexed_work is None:
+                    continue
+                new_ids[work_id] = len(works)
+                works.append(
+                    IndexedWorkDict(
+                        filepath=indexed_work["filepath"],
+                        sha256=indexed_work["sha256"],
+                        ngrams_count=indexed_work["ngrams_count"],
+                        offset=tmp_works_file.tell(),
+                    )
+                )
+                if indexed_work["offset"] is None:
+                    work_dict = serialize_features_to_dict(self.__features[work_id])
+                    tmp_works_file.write(json.dumps(work_dict).encode("utf-8") + b"\n")
+                else:
+                    # The archived works are copied without deserialization.
+                    tmp_works_file.write(self.__read_work_line(works_file, work_id))
+        postings: defaultdict[int, list[int]] = defaultdict(list)
+        for ngram, posting in self.postings.items():
+            new_posting = [new_ids[work_id] for work_id in posting if work_id in new_ids]
+            if new_posting:
+                postings[ngram] = new_posting
+
+        index_dict = NgramsIndexDict(
+            version=INDEX_FORMAT_VERSION,
+            ngrams_length=self.ngrams_length,
+            works=works,
+            postings={str(ngram): posting for ngram, posting in postings.items()},
+        )
+        os.replace(tmp_works_path, works_path)
+        with path.open(mode="w", encoding="utf-8") as f:
+            json.dump(index_dict, f)
+
+        # The offsets of the old works file aren't valid anymore.
+        self.postings = postings
+        self.works = list(works)
+        self.__features = {
+            new_ids[work_id]: work
+            for work_id, work in self.__features.items()
+            if work_id in new_ids
+        }
+        self.__works_path = works_path
+
+    @classmethod
+    def load(cls: type[Self], path: Path) -> Self:
+        with path.open(mode="r", encoding="utf-8") as f:
+            index_dict: NgramsIndexDict = json.load(f)
+        works_path = get_works_path(path)
+        if index_dict.get("version") != INDEX_FORMAT_VERSION or not works_path.exists():
+            raise ValueError(
+                f"Unsupported format of the N-grams index '{path}'; the index must be rebuilt."
+            )
+
+        index = cls(index_dict["ngrams_length"])  # type: ignore
+        index.works = list(index_dict["works"])
+        for ngram, posting in index_dict["postings"].items():
+            index.postings[int(ngram)] = posting
+        index.__ids = {
+            indexed_work["filepath"]: work_id
+            for work_id, indexed_work in enumerate(index.works)
+            if indexed_work is not None
+        }
+        index.__works_path = works_path
+        return index
+
+    def __open_works(self: Self) -> ContextManager[IO[bytes] | None]:
+        if self.__works_path is None:
+            return nullcontext()
+        return self.__works_path.open(mode="rb")
+
+    def __read_work_line(self: Self, works_file: IO[bytes] | None, work_id: int) -> bytes:
+        indexed_work = self.works[work_id]
+        assert works_file is not None and indexed_work is not None
+        assert indexed_work["offset"] is not None
+        works_file.seek(indexed_work["offset"])
+        return works_file.readline()
@@ -1,13 +1,89 @@
 import ast
 from contextlib import suppress
+from typing import Final, NamedTuple
 
 from typing_extensions import Self
 
 from codeplag.pyplag.const import IGNORE_NODES, KEYWORDS, LITERALS, OPERATORS, TO_TOKEN
 from codeplag.types import ASTFeatures, NodeCodePlace, NodeStructurePlace
 
+# Indexes of the counters in the tuple (operators, keywords, literals)
+OPERATORS_COUNTER: Final[int] = 0
+KEYWORDS_COUNTER: Final[int] = 1
+LITERALS_COUNTER: Final[int] = 2
 
-class ASTWalker(ast.NodeVisitor):
+
+class NodeDispatch(NamedTuple):
+    """Precomputed information about the AST node class used by the walker."""
+
+    type_name: str
+    token: int | None
+    counter: int | None
+    ignore: bool
+    has_position: bool
+    has_name: bool
+    fields: tuple[str, ...]
+
+
+_DISPATCH_TABLE: dict[type, NodeDispatch] = {}
+
+
+def _create_node_dispatch(node_class: type) -> NodeDispatch:
+    type_name = node_class.__name__
+    if type_name in OPERATORS:
+        counter = OPERATORS_COUNTER
+    elif type_name in KEYWORDS:
+        counter = KEYWORDS_COUNTER
+    elif type_name in LITERALS:
+        counter = LITERALS_COUNTER
+    else:
+        counter = None
+    attributes = getattr(node_class, "_attributes", ())
+    fields = tuple(getattr(node_class, "_fields", ()))
+
+    return NodeDispatch(
+        type_name=type_name,
+        token=TO_TOKEN.get(type_name),
+        counter=counter,
+        ignore=type_name in IGNORE_NODES,
+        has_position="lineno" in attributes and "col_offset" in attributes,
+        has_name="name" in fields,
+        fields=fields,
+    )
+
+
+def get_node_dispatch(node_class: type) -> NodeDispatch:
+    """Returns the cached dispatch record of the AST node class.
+
+    Args:
+    ----
+        node_class (type): The class of the AST node.
+
+    """
+    dispatch = _DISPATCH_TABLE.get(node_class)
+    if dispatch is None:
+        dispatch = _DISPATCH_TABLE[node_class] = _create_node_dispatch(node_class)
+    return dispatch
+
+
+def _push_children(
+    stack: list[tuple[ast.AST, int]], node: ast.AST, fields: tuple[str, ...], depth: int
+) -> None:
+    """Pushes children of the node onto the stack so that they are popped in source order."""
+    children = []
+    for field in fields:
+        value = getattr(node, field, None)
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, ast.AST):
+                    children.append((item, depth))
+        elif isinstance(value, ast.AST):
+            children.append((value, depth))
+    children.reverse()
+    stack.extend(children)
+
+
+class ASTWalker:
     def __init__(self: Self, features: ASTFeatures) -> None:
         self.features = features
         self.curr_depth = 0
@@ -49,44 +125,52 @@ class ASTWalker(ast.NodeVisitor):
                 actual_node_name = node_name
             self.features.head_nodes.append(f"{actual_node_name}[{node.lineno}]")  # type: ignore
 
-    def generic_visit(self: Self, node: ast.AST) -> None:
+    def visit(self: Self, tree: ast.AST) -> None:
         """Traverses, counts operators, keywords, and literals, and saves sequence of operators.
 
+        The tree is traversed in pre-order with an explicit stack; all decisions which depend
+        only on the node class are taken from the cached dispatch records.
+
         Args:
         ----
-            node (ast.AST): current node.
+            tree (ast.AST): root node of the traversed tree.
 
         """
-        type_name = type(node).__name__
-        if type_name in TO_TOKEN:
-            self.features.tokens.append(TO_TOKEN[type_name])
-            if "lineno" in dir(node) and "col_offset" in dir(node):
-                self.features.tokens_pos.append(
-                    NodeCodePlace(lineno=node.lineno, col_offset=node.col_offset)  # type: ignore
-                )
-            else:
-                self.features.tokens_pos.append(self.features.tokens_pos[-1])
-
-        if type_name in OPERATORS:
-            self.features.operators[type_name] += 1
-        elif type_name in KEYWORDS:
-            self.features.keywords[type_name] += 1
-        elif type_name in LITERALS:
-            self.features.literals[type_name] += 1
-
-        if type_name not in IGNORE_NODES:
-            if self.curr_depth != 0:
-                name = getattr(node, "name", None)
-                if name is not None:
-                    if name not in self.features.unodes:
-                        self.add_unique_node(name)
-                    self.add_node_to_structure(node, name)
+        features = self.features
+        tokens = features.tokens
+        tokens_pos = features.tokens_pos
+        unodes = features.unodes
+        counters = (features.operators, features.keywords, features.literals)
+        dispatch_table = _DISPATCH_TABLE
+
+        stack: list[tuple[ast.AST, int]] = [(tree, 0)]
+        while stack:
+            node, depth = stack.pop()
+            node_class = type(node)
+            dispatch = dispatch_table.get(node_class)
+            if dispatch is None:
+                dispatch = get_node_dispatch(node_class)
+
+            if dispatch.token is not None:
+                tokens.append(dispatch.token)
+                if dispatch.has_position:
+                    tokens_pos.append(NodeCodePlace(node.lineno, node.col_offset))  # type: ignore
                 else:
-                    if type_name not in self.features.unodes:
-                        self.add_unique_node(type_name)
-                    self.add_node_to_structure(node, type_name)
-                self.features.count_of_nodes += 1
-
-            self.curr_depth += 1
-            ast.NodeVisitor.generic_visit(self, node)
-            self.curr_depth -= 1
+                    tokens_pos.append(tokens_pos[-1])
+            if dispatch.counter is not None:
+                counters[dispatch.counter][dispatch.type_name] += 1
+            if dispatch.ignore:
+                continue
+
+            if depth != 0:
+                name = getattr(node, "name", None) if dispatch.has_name else None
+                if name is None:
+                    name = dispatch.type_name
+                if name not in unodes:
+                    self.add_unique_node(name)
+                self.curr_depth = depth
+                self.add_node_to_structure(node, name)
+                features.count_of_nodes += 1
+
+            _push_children(stack, node, dispatch.fields, depth + 1)
+        self.curr_depth = 0
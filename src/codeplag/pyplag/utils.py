@@ -10,11 +10,13 @@ from codeplag.featurescache import AbstractFeaturesCache
 from codeplag.getfeatures import (
     AbstractGetter,
     get_files_path_from_directory,
+    set_fingerprints,
     set_sha256,
 )
 from codeplag.logger import codeplag_logger as logger
 from codeplag.logger import log_err
 from codeplag.pyplag.astwalkers import ASTWalker
+from codeplag.stats import STAGE_CACHE, STAGE_PARSE, run_stats
 from codeplag.types import ASTFeatures
 from webparsers.types import WorkInfo
 
@@ -92,6 +94,7 @@ def get_ast_from_filename(filepath: Path) -> ast.Module | None:
 
 
 @set_sha256
+@set_fingerprints
 def get_features_from_ast(tree: ast.Module, filepath: Path | str) -> ASTFeatures:
     features = ASTFeatures(filepath)
     walker = ASTWalker(features)
@@ -111,19 +114,22 @@ def _get_works_from_filepaths(
         features = None
 
         if features_cache is not None:
-            features = features_cache.get_features_from_filepath(filename)
+            with run_stats.timer(STAGE_CACHE):
+                features = features_cache.get_features_from_filepath(filename)
 
         if features is None:
-            tree = get_ast_from_filename(filename)
-            if not tree:
-                continue
+            with run_stats.timer(STAGE_PARSE):
+                tree = get_ast_from_filename(filename)
+                if not tree:
+                    continue
 
-            features = get_features_from_ast(tree, filename)
+                features = get_features_from_ast(tree, filename)
             if features.count_of_nodes == 0:
                 logger.debug("Skipping the file '%s' due it contains no code.", filename)
                 continue
             if features_cache is not None:
-                features_cache.save_features(features)
+                with run_stats.timer(STAGE_CACHE):
+                    features_cache.save_features(features)
         works.append(features)
 
     return works
@@ -149,12 +155,15 @@ class PyFeaturesGetter(AbstractGetter):
         features = None
 
         if self.features_cache is not None:
-            features = self.features_cache.get_features_from_work_info(work_info)
+            with run_stats.timer(STAGE_CACHE):
+                features = self.features_cache.get_features_from_work_info(work_info)
 
         if features is None:
-            tree = get_ast_from_content(work_info.code, work_info.link)
-            if tree is not None:
-                features = get_features_from_ast(tree, work_info.link)
+            with run_stats.timer(STAGE_PARSE):
+                tree = get_ast_from_content(work_info.code, work_info.link)
+                if tree is not None:
+                    features = get_features_from_ast(tree, work_info.link)
+            if features is not None:
                 if features.count_of_nodes == 0:
                     self.logger.debug(
                         "Skipping the file '%s' due it contains no code.", work_info.link
@@ -162,7 +171,8 @@ class PyFeaturesGetter(AbstractGetter):
                     return None
                 features.modify_date = work_info.commit.date
                 if self.features_cache is not None:
-                    self.features_cache.save_features(features)
+                    with run_stats.timer(STAGE_CACHE):
+                        self.features_cache.save_features(features)
             else:
                 self.logger.error(
                     "Unsuccessfully attempt to get AST from the file %s.", work_info.link
@@ -120,6 +120,7 @@ def serialize_compare_result(compare_info: FullCompareInfo) -> pd.DataFrame:
             "operators": compare_info.fast.operators,
             "keywords": compare_info.fast.keywords,
             "literals": compare_info.fast.literals,
+            "fingerprints": compare_info.fast.fingerprints,
             "weighted_average": compare_info.fast.weighted_average,
             "struct_similarity": compare_info.structure.similarity,
             "first_heads": [compare_info.first_heads],
@@ -151,6 +152,7 @@ def deserialize_compare_result(compare_result: pd.Series) -> FullCompareInfo:
             operators=float(compare_result.operators),
             keywords=float(compare_result.keywords),
             literals=float(compare_result.literals),
+            fingerprints=float(compare_result.get("fingerprints", np.nan)),
             weighted_average=float(compare_result.weighted_average),
         ),
         structure=StructureCompareInfo(
@@ -207,6 +209,7 @@ def deserialize_compare_result_from_dict(result: dict) -> FullCompareInfo:
             operators=float(fast_d["operators"]),
             keywords=float(fast_d["keywords"]),
             literals=float(fast_d["literals"]),
+            fingerprints=float(fast_d.get("fingerprints", np.nan)),
             weighted_average=float(fast_d["weighted_average"]),
         ),
         structure=StructureCompareInfo(
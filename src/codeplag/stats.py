@@ -0,0 +1,116 @@
+"""This module contains per-stage timers and counters of the check runs.
+
+The statistics are collected into the process-wide `run_stats` object. It is disabled by
+default and in that state timers and counters do nothing, so the instrumented code has
+almost no overhead. Worker processes collect statistics of each task separately and
+return a snapshot which is merged into the statistics of the main process.
+"""
+
+import json
+from collections import defaultdict
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from time import perf_counter
+from typing import Final, TypedDict
+
+from typing_extensions import Self
+
+# Stages
+STAGE_SCAN: Final[str] = "scan"
+STAGE_PARSE: Final[str] = "parse"
+STAGE_CACHE: Final[str] = "cache"
+STAGE_GITHUB: Final[str] = "github"
+STAGE_FAST_METRICS: Final[str] = "fast_metrics"
+STAGE_STRUCTURE_METRICS: Final[str] = "structure_metrics"
+STAGE_REPORT: Final[str] = "report"
+STAGE_TOTAL: Final[str] = "total"
+
+# Counters
+PAIRS_SCHEDULED: Final[str] = "pairs_scheduled"
+PAIRS_PRUNED: Final[str] = "pairs_pruned"
+PAIRS_SKIPPED_BY_SIZE: Final[str] = "pairs_skipped_by_size"
+PAIRS_FROM_CACHE: Final[str] = "pairs_from_cache"
+PAIRS_COMPARED: Final[str] = "pairs_compared"
+PAIRS_IDENTICAL: Final[str] = "pairs_identical"
+PAIRS_FROM_DUPLICATES: Final[str] = "pairs_from_duplicates"
+
+
+class StatsSnapshot(TypedDict):
+    timers: dict[str, float]
+    counters: dict[str, int]
+
+
+class _StageTimer:
+    __slots__ = ("stats", "stage", "start")
+
+    def __init__(self: Self, stats: "RunStats", stage: str) -> None:
+        self.stats = stats
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self: Self) -> Self:
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self: Self, *_exc_info: object) -> None:
+        self.stats.timers[self.stage] += perf_counter() - self.start
+
+
+_NULL_TIMER: Final = nullcontext()
+
+
+class RunStats:
+    def __init__(self: Self) -> None:
+        self.enabled: bool = False
+        self.timers: defaultdict[str, float] = defaultdict(float)
+        self.counters: defaultdict[str, int] = defaultdict(int)
+
+    def enable(self: Self) -> None:
+        self.enabled = True
+
+    def disable(self: Self) -> None:
+        self.enabled = False
+
+    def reset(self: Self) -> None:
+        self.timers.clear()
+        self.counters.clear()
+
+    def timer(self: Self, stage: str) -> AbstractContextManager:
+        """Returns context manager which adds the elapsed time to the stage timer."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, stage)
+
+    def increase(self: Self, counter: str, value: int = 1) -> None:
+        if self.enabled:
+            self.counters[counter] += value
+
+    def snapshot(self: Self) -> StatsSnapshot:
+        return StatsSnapshot(timers=dict(self.timers), counters=dict(self.counters))
+
+    def merge(self: Self, snapshot: StatsSnapshot) -> None:
+        """Adds the statistics collected in another process."""
+        if not self.enabled:
+            return
+        for stage, elapsed in snapshot["timers"].items():
+            self.timers[stage] += elapsed
+        for counter, value in snapshot["counters"].items():
+            self.counters[counter] += value
+
+    def summary(self: Self) -> str:
+        lines = ["Stages (cumulative over all processes, seconds):"]
+        lines.extend(
+            f"  {stage:<20} {elapsed:.3f}" for stage, elapsed in sorted(self.timers.items())
+        )
+        lines.append("Counters:")
+        lines.extend(
+            f"  {counter:<20} {value}" for counter, value in sorted(self.counters.items())
+        )
+        return "\n".join(lines)
+
+    def write_json(self: Self, path: Path) -> None:
+        with path.open(mode="w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=4)
+
+
+run_stats = RunStats()
@@ -6,6 +6,7 @@ from enum import IntEnum
 from functools import total_ordering
 from pathlib import Path
 from typing import (
+    TYPE_CHECKING,
     DefaultDict,
     Literal,
     NamedTuple,
@@ -13,9 +14,12 @@ from typing import (
     TypedDict,
 )
 
-import numpy.typing as npt
 from typing_extensions import NotRequired, Self
 
+if TYPE_CHECKING:
+    # The numpy is loaded only by the commands which compare works
+    import numpy.typing as npt
+
 Extension = Literal["py", "cpp"]
 Extensions = tuple[Pattern, ...]
 Flag = Literal[0, 1]
@@ -24,6 +28,8 @@ Mode = Literal["many_to_many", "one_to_one"]
 NgramsLength = Literal[1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
 ReportsExtension = Literal["csv", "mongo"]
 ReportType = Literal["general", "sources"]
+StructureAssignment = Literal["greedy", "optimal"]
+StartMethod = Literal["fork", "forkserver", "spawn"]
 Language = Literal["en", "ru"]
 LogLevel = Literal["trace", "debug", "info", "warning", "error"]
 # fmt: off
@@ -50,6 +56,15 @@ class NodeStructurePlace(NamedTuple):
     uid: int
 
 
+class StructureView(NamedTuple):
+    """The structure truncated by the max depth and boundaries of its top-level sections."""
+
+    max_depth: int
+    structure: list[NodeStructurePlace]
+    # Indexes of the top-level nodes followed by the count of nodes
+    children_indexes: list[int]
+
+
 def __return_zero() -> Literal[0]:
     return 0
 
@@ -86,6 +101,9 @@ class ASTFeatures:
     structure: list[NodeStructurePlace] = field(default_factory=list)
     tokens: list[int] = field(default_factory=list)
     tokens_pos: list[NodeCodePlace] = field(default_factory=list)
+    fingerprints: list[int] = field(default_factory=list)
+    # Calculated for the used max depth before the comparison, isn't serialized
+    structure_view: StructureView | None = field(default=None, repr=False)
 
     def __post_init__(self: Self) -> None:
         if isinstance(self.filepath, Path) and self.filepath.exists():
@@ -135,6 +153,7 @@ class ASTFeaturesDict(TypedDict):
     structure: list[NodeStructurePlaceDict]
     tokens: list[int]
     tokens_pos: list[NodeCodePlaceDict]
+    fingerprints: NotRequired[list[int]]
     modify_date: str
 
 
@@ -147,12 +166,13 @@ class FastCompareInfo(NamedTuple):
     operators: float
     keywords: float
     literals: float
+    fingerprints: float
     weighted_average: float
 
 
 class StructureCompareInfo(NamedTuple):
     similarity: float
-    compliance_matrix: npt.NDArray
+    compliance_matrix: "npt.NDArray"
 
 
 class FullCompareInfo(NamedTuple):
@@ -201,14 +221,20 @@ class Settings(TypedDict):
     environment: NotRequired[Path]
     language: Language
     log_level: LogLevel
+    log_trace_sampling: int
     reports: NotRequired[Path]
     reports_extension: ReportsExtension
     show_progress: Flag
     short_output: ShortOutput
     max_depth: MaxDepth
     ngrams_length: NgramsLength
+    structure_candidates: int
+    structure_assignment: StructureAssignment
     threshold: Threshold
     workers: int
+    workers_start_method: StartMethod
+    github_concurrency: int
+    github_cache_size: int
     mongo_host: str
     mongo_port: int
     mongo_user: str
@@ -225,6 +251,14 @@ class ProcessingWorks(NamedTuple):
     work2: ASTFeatures
 
 
+class CompareSettings(NamedTuple):
+    ngrams_length: NgramsLength
+    max_depth: MaxDepth
+    threshold: Threshold | None
+    structure_candidates: int
+    structure_assignment: StructureAssignment
+
+
 SameFuncs = dict[str, list[SameHead]]
 
 
@@ -240,6 +274,7 @@ SameFuncs = dict[str, list[SameHead]]
 # To fix that you need to pass right module-name to namedtuple-factory
 NodeCodePlace.__module__ = __name__
 NodeStructurePlace.__module__ = __name__
+StructureView.__module__ = __name__
 FastCompareInfo.__module__ = __name__
 StructureCompareInfo.__module__ = __name__
 FullCompareInfo.__module__ = __name__
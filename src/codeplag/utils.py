@@ -1,21 +1,21 @@
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from typing_extensions import Self
 
 from codeplag.consts import (
     DEFAULT_MODE,
+    DEFAULT_TOP_K,
     UTIL_NAME,
     UTIL_VERSION,
 )
-from codeplag.handlers.check import IgnoreThresholdWorksComparator, WorksComparator
-from codeplag.handlers.report import (
-    html_report_create,
-)
-from codeplag.handlers.settings import settings_modify, settings_show
 from codeplag.logger import codeplag_logger as logger
 from codeplag.types import ExitCode, ReportType
 
+# Handlers are imported only by their commands, because they load heavy dependencies
+if TYPE_CHECKING:
+    from codeplag.handlers.check import WorksComparator
+
 
 class CodeplagEngine:
     def __init__(self: Self, parsed_args: dict[str, Any]) -> None:
@@ -36,18 +36,29 @@ class CodeplagEngine:
         else:
             self.github_urls: list[str] = parsed_args.pop("github_urls", [])
             self.github_user: str = parsed_args.pop("github_user", "") or ""
+            from codeplag.handlers.check import (
+                IgnoreThresholdWorksComparator,
+                WorksComparator,
+            )
+
             ignore_threshold: bool = parsed_args.pop("ignore_threshold")
             if ignore_threshold:
                 comparator_class = IgnoreThresholdWorksComparator
             else:
                 comparator_class = WorksComparator
-            self.comparator: WorksComparator = comparator_class(
+            self.comparator: "WorksComparator" = comparator_class(
                 extension=parsed_args.pop("extension"),
                 repo_regexp=parsed_args.pop("repo_regexp", None),
                 path_regexp=parsed_args.pop("path_regexp", None),
                 mode=parsed_args.pop("mode", DEFAULT_MODE),
                 set_github_parser=bool(self.github_urls or self.github_user),
                 all_branches=parsed_args.pop("all_branches", False),
+                show_stats=parsed_args.pop("show_stats", False),
+                stats_file=parsed_args.pop("stats_file", None),
+                archive=parsed_args.pop("archive", None),
+                top_k=parsed_args.pop("top_k", DEFAULT_TOP_K),
+                add_to_archive=parsed_args.pop("add_to_archive", False),
+                branch_commits=parsed_args.pop("branch_commits", False),
             )
 
             self.files: list[Path] = parsed_args.pop("files", [])
@@ -57,20 +68,27 @@ class CodeplagEngine:
         logger.info("Starting %s util (%s) ...", UTIL_NAME, UTIL_VERSION)
 
         if self.root == "settings":
+            from codeplag.handlers.settings import settings_modify, settings_show
+
             if self.command == "show":
                 settings_show()
             elif self.command == "modify":
                 settings_modify(self.parsed_args)
                 settings_show()
         elif self.root == "report":
+            from codeplag.handlers.report import html_report_create
+
             return html_report_create(
                 self.path, self.report_type, self.first_root_path, self.second_root_path
             )
         else:
-            return self.comparator.check(
-                self.files,
-                self.directories,
-                self.github_urls,
-                self.github_user,
-            )
+            try:
+                return self.comparator.check(
+                    self.files,
+                    self.directories,
+                    self.github_urls,
+                    self.github_user,
+                )
+            finally:
+                self.comparator.close()
         return ExitCode.EXIT_SUCCESS
@@ -0,0 +1,128 @@
+"""This module contains the long-lived pool of worker processes which compare works.
+
+The settings of the comparison are sent to each worker once by the initializer of the
+pool instead of being sent with each task. The pool is started on the first task and
+is reused by all the next comparisons until it is shut down or the settings change.
+The worker processes don't write to the log file.
+"""
+
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from logging.handlers import QueueHandler
+
+from typing_extensions import Self
+
+from codeplag.algorithms.compare import compare_works
+from codeplag.logger import codeplag_logger
+from codeplag.stats import StatsSnapshot, run_stats
+from codeplag.types import (
+    ASTFeatures,
+    CompareSettings,
+    FastCompareInfo,
+    FullCompareInfo,
+    StartMethod,
+)
+
+# The settings of the comparison in the worker process, set by the initializer
+_worker_settings: CompareSettings | None = None
+
+
+def _init_worker(settings: CompareSettings) -> None:
+    global _worker_settings
+
+    _worker_settings = settings
+    # A forked worker inherits the queue of the log file, but nothing reads it there
+    for handler in codeplag_logger.handlers.copy():
+        if isinstance(handler, QueueHandler):
+            codeplag_logger.removeHandler(handler)
+
+
+def compare_in_worker(
+    work1: ASTFeatures, work2: ASTFeatures, with_stats: bool = False
+) -> FullCompareInfo | FastCompareInfo | tuple[FullCompareInfo | FastCompareInfo, StatsSnapshot]:
+    """Compares works with the settings of the worker process.
+
+    Args:
+    ----
+        work1 (ASTFeatures): The features of the first work.
+        work2 (ASTFeatures): The features of the second work.
+        with_stats (bool): When True the statistics collected during the comparison
+          are returned together with its result.
+
+    """
+    assert _worker_settings is not None, "The worker process is not initialized."
+    # The worker is reused by the next checks, which may not collect statistics
+    if with_stats:
+        run_stats.enable()
+        run_stats.reset()
+    else:
+        run_stats.disable()
+    metrics = compare_works(
+        work1,
+        work2,
+        _worker_settings.ngrams_length,
+        _worker_settings.max_depth,
+        _worker_settings.threshold,
+        bounded=True,
+        structure_candidates=_worker_settings.structure_candidates,
+        structure_assignment=_worker_settings.structure_assignment,
+    )
+    if with_stats:
+        return metrics, run_stats.snapshot()
+    return metrics
+
+
+class WorkerPool:
+    def __init__(self: Self, workers: int, start_method: StartMethod) -> None:
+        """Initializes the pool without starting the worker processes.
+
+        Args:
+        ----
+            workers (int): The maximal count of the worker processes.
+            start_method (StartMethod): The method of starting the worker processes.
+
+        """
+        self.workers = workers
+        self.start_method: StartMethod = start_method
+        self.settings: CompareSettings | None = None
+        self.__executor: ProcessPoolExecutor | None = None
+
+    def submit_compare(
+        self: Self,
+        settings: CompareSettings,
+        work1: ASTFeatures,
+        work2: ASTFeatures,
+        with_stats: bool = False,
+    ) -> Future:
+        """Schedules the comparison of works and returns its future.
+
+        The worker processes are started on the first call and restarted only when
+        the settings differ from the settings of the previous calls.
+        """
+        if self.__executor is None or settings != self.settings:
+            self.shutdown()
+            self.settings = settings
+            context = multiprocessing.get_context(self.start_method)
+            if self.start_method == "forkserver":
+                # Workers are forked from the server which has already imported
+                # the algorithms, so they don't import them one by one
+                context.set_forkserver_preload([__name__])
+            self.__executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(settings,),
+            )
+        return self.__executor.submit(compare_in_worker, work1, work2, with_stats)
+
+    def shutdown(self: Self) -> None:
+        if self.__executor is None:
+            return
+        self.__executor.shutdown()
+        self.__executor = None
+
+    def __enter__(self: Self) -> Self:
+        return self
+
+    def __exit__(self: Self, *_exc_info: object) -> None:
+        self.shutdown()
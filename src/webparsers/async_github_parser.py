@@ -1,19 +1,26 @@
+import asyncio
 import base64
 import logging
 import re
 import sys
-from typing import Any, AsyncGenerator, Final
+from collections.abc import MutableMapping
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, Callable, Coroutine, Final, Iterator
 
 import aiohttp
 import aiohttp.client_exceptions
 import cachetools
+import gidgethub
 import gidgethub.aiohttp
+import gidgethub.sansio
 from typing_extensions import Self
 from uritemplate import variable
 
+from webparsers.cache import GitHubCache
 from webparsers.types import (
     BranchInfo,
     Commit,
+    Extensions,
     GitHubContentUrl,
     GitHubRepoUrl,
     PullRequest,
@@ -21,7 +28,61 @@ from webparsers.types import (
     WorkInfo,
 )
 
+_API_URL: Final[str] = "https://api.github.com"
 _GH_URL: Final[str] = "https://github.com/"
+DEFAULT_MAX_CONCURRENCY: Final[int] = 8
+
+# Schedules the coroutine which returns the fetched file or None
+Spawn = Callable[[Coroutine[Any, Any, WorkInfo | None]], None]
+# Responses of these endpoints are revalidated with their ETags from the on-disk cache
+_CONDITIONAL_URL: Final[re.Pattern] = re.compile(r"/repos/[^/]+/[^/]+/(git/trees|branches)/")
+
+
+class _ResponsesCache(MutableMapping[str, Any]):
+    """The cache of responses for the gidgethub, which keeps some of them on disk.
+
+    The gidgethub stores a tuple of the ETag, the last modification date, the data and
+    the link to the next page by the URL of the request, and sends conditional requests
+    for the cached URLs.
+    """
+
+    def __init__(self: Self, cache: GitHubCache | None) -> None:
+        self.__cache = cache
+        self.__memory: cachetools.LRUCache = cachetools.LRUCache(maxsize=500)
+
+    def __get_persistent_cache(self: Self, url: str) -> GitHubCache | None:
+        if _CONDITIONAL_URL.search(url) is None:
+            return None
+        return self.__cache
+
+    def __getitem__(self: Self, url: str) -> Any:
+        cache = self.__get_persistent_cache(url)
+        if cache is None:
+            return self.__memory[url]
+
+        cached = cache.get_response(url)
+        if cached is None:
+            raise KeyError(url)
+        return cached.etag, None, cached.data, None
+
+    def __setitem__(self: Self, url: str, value: Any) -> None:
+        etag, _last_modified, data, more = value
+        cache = self.__get_persistent_cache(url)
+        # Paginated responses are kept in memory only
+        if cache is None or etag is None or more is not None:
+            self.__memory[url] = value
+            return
+
+        cache.save_response(url, etag, data)
+
+    def __delitem__(self: Self, url: str) -> None:
+        del self.__memory[url]
+
+    def __iter__(self: Self) -> Iterator[str]:
+        return iter(self.__memory)
+
+    def __len__(self: Self) -> int:
+        return len(self.__memory)
 
 
 class AsyncGithubParser:
@@ -46,6 +107,16 @@ class AsyncGithubParser:
         ...         ...
         ...
         >>> asynio.run(loop())
+        >>> async def loop_with_own_session():
+        ...     async with AsyncGithubParser(token=<token>, max_concurrency=16) as gh_parser:
+        ...         async for ... in gh_parser.<some_async_gen_func_call>:
+        ...             ...
+        ...
+        >>> asynio.run(loop_with_own_session())
+
+    Trees are walked and files are downloaded concurrently, but no more than
+    'max_concurrency' requests are sent at the same time. When the rate limit of the
+    GitHub API is exhausted, requests wait for its reset.
 
     """
 
@@ -57,7 +128,7 @@ class AsyncGithubParser:
     BRANCH_GET = "/repos/{username}/{repo}/branches{/branch}"
 
     GIT_BLOB = "/repos/{username}/{repo}/git/blobs/{sha}"
-    GIT_TREE = "/repos/{username}/{repo}/git/trees/{sha}"
+    GIT_TREE = "/repos/{username}/{repo}/git/trees/{sha}{?recursive}"
 
     FILE_CONTENT = "/repos/{username}/{repo}/contents/{path}{?ref}"
 
@@ -70,12 +141,37 @@ class AsyncGithubParser:
 
     def __init__(
         self: Self,
-        session: aiohttp.ClientSession,
-        file_extensions: str | None = None,
+        session: aiohttp.ClientSession | None = None,
+        file_extensions: Extensions | None = None,
         check_all: bool = False,
         logger: logging.Logger | None = None,
         token: str | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        base_url: str = _API_URL,
+        branch_commits: bool = False,
+        cache: GitHubCache | None = None,
     ) -> None:
+        """Initializes the parser.
+
+        Args:
+        ----
+            session (aiohttp.ClientSession | None, optional): The session for requests.
+              When not provided, the parser creates its own session while it is used
+              as an asynchronous context manager.
+            file_extensions (Extensions | None, optional): Regular expressions for
+              filtering files. Defaults to None, which means all files.
+            check_all (bool): When True, all branches of repositories are checked.
+            logger (logging.Logger | None, optional): The logger of the parser.
+            token (str | None, optional): The GitHub access token.
+            max_concurrency (int): The maximal count of simultaneous requests.
+            base_url (str): The address of the GitHub API.
+            branch_commits (bool): When True, files get the last commit of the branch
+              instead of their own last commits, and trees are fetched with one recursive
+              request, so only blobs are downloaded per file.
+            cache (GitHubCache | None, optional): The on-disk cache of blobs and of
+              responses of the trees and branches endpoints.
+
+        """
         if logger is None:
             self.logger = logging.getLogger(__name__)
         else:
@@ -83,11 +179,40 @@ class AsyncGithubParser:
 
         self.__file_extensions = file_extensions
         self.__check_all_branches = check_all
-        self.__api = gidgethub.aiohttp.GitHubAPI(
+        self.__branch_commits = branch_commits
+        self.__cache = cache
+        self.__token = token
+        self.__base_url = base_url
+        self.__max_concurrency = max_concurrency
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+        self.__own_session: aiohttp.ClientSession | None = None
+        self.__api: gidgethub.aiohttp.GitHubAPI | None = None
+        if session is not None:
+            self.__api = self.__create_api(session)
+
+    async def __aenter__(self: Self) -> Self:
+        if self.__api is None:
+            self.__own_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.__max_concurrency)
+            )
+            self.__api = self.__create_api(self.__own_session)
+        # The semaphore may be used in another event loop before
+        self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+        return self
+
+    async def __aexit__(self: Self, *_exc_info: object) -> None:
+        if self.__own_session is not None:
+            await self.__own_session.close()
+            self.__own_session = None
+            self.__api = None
+
+    def __create_api(self: Self, session: aiohttp.ClientSession) -> gidgethub.aiohttp.GitHubAPI:
+        return gidgethub.aiohttp.GitHubAPI(
             session,
             "codeplag",
-            oauth_token=token,
-            cache=cachetools.LRUCache(maxsize=500),
+            oauth_token=self.__token,
+            cache=_ResponsesCache(self.__cache),
+            base_url=self.__base_url,
         )
 
     def _is_accepted_extension(self: Self, path: str) -> bool:
@@ -96,17 +221,70 @@ class AsyncGithubParser:
 
         return any(re.search(extension, path) for extension in self.__file_extensions)
 
+    async def _wait_for_rate_limit(self: Self, rate_limit: gidgethub.sansio.RateLimit) -> None:
+        delay = (rate_limit.reset_datetime - datetime.now(timezone.utc)).total_seconds()
+        if delay <= 0:
+            return
+        self.logger.warning(
+            "The GitHub API rate limit is exhausted, waiting %.0f seconds for its reset.", delay
+        )
+        await asyncio.sleep(delay)
+
     async def send_get_request(
         self: Self,
         api_url: str,
         url_vars: variable.VariableValueDict | None = None,
     ) -> Any:
+        if self.__api is None:
+            raise RuntimeError(
+                "The session is not provided, the parser must be used as a context manager."
+            )
+
+        async with self.__semaphore:
+            rate_limit = self.__api.rate_limit
+            if rate_limit is not None and not rate_limit:
+                await self._wait_for_rate_limit(rate_limit)
+            try:
+                return await self.__api.getitem(api_url, url_vars)
+            except gidgethub.RateLimitExceeded as err:
+                await self._wait_for_rate_limit(err.rate_limit)
+                return await self.__api.getitem(api_url, url_vars)
+            except aiohttp.client_exceptions.ClientConnectionError as err:
+                self.logger.error("Connection error. Please check the Internet connection.")
+                self.logger.debug(str(err))
+                sys.exit(1)
+
+    async def _iterate_concurrently(
+        self: Self, start: Callable[[Spawn], Coroutine[Any, Any, None]]
+    ) -> AsyncGenerator[WorkInfo, None]:
+        """Yields the fetched files in order of their downloading.
+
+        Args:
+        ----
+            start (Callable[[Spawn], Coroutine[Any, Any, None]]): The function which
+              creates the first coroutine. It and the coroutines scheduled by it get the
+              function for scheduling the walks of subtrees and downloads of files.
+
+        """
+        completed: asyncio.Queue[asyncio.Task] = asyncio.Queue()
+        pending: set[asyncio.Task] = set()
+
+        def spawn(coroutine: Coroutine[Any, Any, WorkInfo | None]) -> None:
+            task = asyncio.create_task(coroutine)
+            pending.add(task)
+            task.add_done_callback(completed.put_nowait)
+
+        spawn(start(spawn))
         try:
-            return await self.__api.getitem(api_url, url_vars)
-        except aiohttp.client_exceptions.ClientConnectionError as err:
-            self.logger.error("Connection error. Please check the Internet connection.")
-            self.logger.debug(str(err))
-            sys.exit(1)
+            while pending:
+                task = await completed.get()
+                pending.discard(task)
+                work_info = task.result()
+                if work_info is not None:
+                    yield work_info
+        finally:
+            for task in pending:
+                task.cancel()
 
     async def get_list_of_repos(
         self: Self, owner: str, reg_exp: re.Pattern | None = None
@@ -219,11 +397,15 @@ class AsyncGithubParser:
         repo: str,
         blob_sha: str,
     ) -> str:
-        response = await self.send_get_request(
-            self.GIT_BLOB, {"username": owner, "repo": repo, "sha": blob_sha}
-        )
+        file_in_bytes = None if self.__cache is None else self.__cache.get_blob(blob_sha)
+        if file_in_bytes is None:
+            response = await self.send_get_request(
+                self.GIT_BLOB, {"username": owner, "repo": repo, "sha": blob_sha}
+            )
+            file_in_bytes = base64.b64decode(response["content"])
+            if self.__cache is not None:
+                self.__cache.save_blob(blob_sha, file_in_bytes)
 
-        file_in_bytes = bytearray(base64.b64decode(response["content"]))
         return file_in_bytes.decode("utf-8", errors="ignore")
 
     async def _get_commit_info(
@@ -244,34 +426,73 @@ class AsyncGithubParser:
 
         return Commit(commit_info["sha"], commit_info["commit"]["author"]["date"])
 
-    async def get_files_generator_from_sha_commit(
+    async def _get_branch_head_commit(self: Self, owner: str, repo: str, branch: str) -> Commit:
+        commit_info = await self._get_branch_last_commit_info(owner, repo, branch)
+
+        return Commit(commit_info["sha"], commit_info["commit"]["author"]["date"])
+
+    async def _get_work_info(
         self: Self,
         owner: str,
         repo: str,
+        branch: str,
+        blob_sha: str,
+        path: str,
+        link: str,
+        commit_info: Commit | None = None,
+    ) -> WorkInfo:
+        if commit_info is not None:
+            file_content = await self.get_file_content_by_sha(owner, repo, blob_sha)
+            return WorkInfo(file_content, link, commit_info)
+
+        commit_info, file_content = await asyncio.gather(
+            self._get_commit_info(owner, repo, branch, path),
+            self.get_file_content_by_sha(owner, repo, blob_sha),
+        )
+        return WorkInfo(file_content, link, commit_info)
+
+    async def _get_tree(self: Self, owner: str, repo: str, sha: str) -> list[dict[str, Any]]:
+        url_vars: dict[str, Any] = {"username": owner, "repo": repo, "sha": sha}
+        if not self.__branch_commits:
+            response = await self.send_get_request(self.GIT_TREE, url_vars)
+            return response["tree"]
+
+        url_vars["recursive"] = 1
+        response = await self.send_get_request(self.GIT_TREE, url_vars)
+        tree: list[dict[str, Any]] = response["tree"]
+        if response.get("truncated", False):
+            self.logger.warning(
+                f"The tree '{sha}' of the repository '{owner}/{repo}' is too big for one "
+                "request, its subtrees will be fetched separately."
+            )
+            tree = [node for node in tree if "/" not in node["path"]]
+        else:
+            # Nested nodes are already listed in the full tree
+            tree = [node for node in tree if node["type"] != "tree"]
+
+        return tree
+
+    async def _walk_tree(
+        self: Self,
+        spawn: Spawn,
+        owner: str,
+        repo: str,
         branch: BranchInfo,
         sha: str,
         path: str = "",
         path_regexp: re.Pattern | None = None,
-    ) -> AsyncGenerator[WorkInfo, None]:
-        response: dict[str, Any] = await self.send_get_request(
-            self.GIT_TREE, {"username": owner, "repo": repo, "sha": sha}
-        )
-        tree: list[dict[str, Any]] = response["tree"]
-        for node in tree:
+    ) -> None:
+        commit_info = branch.last_commit if self.__branch_commits else None
+        for node in await self._get_tree(owner, repo, sha):
             current_path = f"{path}/{node['path']}"
             full_link = f"{_GH_URL}{owner}/{repo}/blob/{branch.name}{current_path}"
             node_type = node["type"]
             if node_type == "tree":
-                commit_info = await self._get_commit_info(owner, repo, branch.name, current_path)
-                async for file_gen in self.get_files_generator_from_sha_commit(
-                    owner=owner,
-                    repo=repo,
-                    branch=BranchInfo(branch.name, commit_info),
-                    sha=node["sha"],
-                    path=current_path,
-                    path_regexp=path_regexp,
-                ):
-                    yield file_gen
+                spawn(
+                    self._walk_tree(
+                        spawn, owner, repo, branch, node["sha"], current_path, path_regexp
+                    )
+                )
                 continue
             elif (
                 node_type != "blob"
@@ -280,15 +501,26 @@ class AsyncGithubParser:
             ):
                 continue
 
-            commit_info = await self._get_commit_info(owner, repo, branch.name, current_path)
-
-            file_content = await self.get_file_content_by_sha(
-                owner,
-                repo,
-                node["sha"],
+            spawn(
+                self._get_work_info(
+                    owner, repo, branch.name, node["sha"], current_path, full_link, commit_info
+                )
             )
 
-            yield WorkInfo(file_content, full_link, commit_info)
+    async def get_files_generator_from_sha_commit(
+        self: Self,
+        owner: str,
+        repo: str,
+        branch: BranchInfo,
+        sha: str,
+        path: str = "",
+        path_regexp: re.Pattern | None = None,
+    ) -> AsyncGenerator[WorkInfo, None]:
+        async def start(spawn: Spawn) -> None:
+            await self._walk_tree(spawn, owner, repo, branch, sha, path, path_regexp)
+
+        async for work_info in self._iterate_concurrently(start):
+            yield work_info
 
     async def get_files_generator_from_repo_url(
         self: Self, repo_url: str, path_regexp: re.Pattern | None = None
@@ -316,31 +548,39 @@ class AsyncGithubParser:
                 )
             ]
 
-        for branch in branches:
-            async for file in self.get_files_generator_from_sha_commit(
-                owner=repo_url.owner,
-                repo=repo_url.repo,
-                branch=branch,
-                sha=branch.last_commit.sha,
-                path_regexp=path_regexp,
-            ):
-                yield file
+        async def start(spawn: Spawn) -> None:
+            for branch in branches:
+                spawn(
+                    self._walk_tree(
+                        spawn,
+                        repo_url.owner,
+                        repo_url.repo,
+                        branch,
+                        branch.last_commit.sha,
+                        path_regexp=path_regexp,
+                    )
+                )
+
+        async for work_info in self._iterate_concurrently(start):
+            yield work_info
 
     async def _get_file_from_node(self: Self, node: dict, file_url: GitHubContentUrl) -> WorkInfo:
-        return WorkInfo(
-            await self.get_file_content_by_sha(file_url.owner, file_url.repo, node["sha"]),
-            file_url,
-            await self._get_commit_info(
-                file_url.owner, file_url.repo, file_url.branch, file_url.path
-            ),
+        return await self._get_work_info(
+            file_url.owner, file_url.repo, file_url.branch, node["sha"], file_url.path, file_url
         )
 
-    async def _get_files_generator_from_node_list(
+    async def _walk_node_list(
         self: Self,
+        spawn: Spawn,
         node_list: list[dict],
         dir_url: GitHubContentUrl,
         path_regexp: re.Pattern | None = None,
-    ) -> AsyncGenerator[WorkInfo, None]:
+    ) -> None:
+        head_commit: Commit | None = None
+        if self.__branch_commits:
+            head_commit = await self._get_branch_head_commit(
+                dir_url.owner, dir_url.repo, dir_url.branch
+            )
         for node in node_list:
             current_path = f"/{node['path']}"
             full_link = (
@@ -348,18 +588,17 @@ class AsyncGithubParser:
             )
             node_type = node["type"]
             if node_type == "dir":
-                commit_info = await self._get_commit_info(
-                    dir_url.owner, dir_url.repo, dir_url.branch, current_path
+                spawn(
+                    self._walk_tree(
+                        spawn,
+                        dir_url.owner,
+                        dir_url.repo,
+                        BranchInfo(dir_url.branch, head_commit or Commit("", "")),
+                        node["sha"],
+                        current_path,
+                        path_regexp,
+                    )
                 )
-                async for work_info in self.get_files_generator_from_sha_commit(
-                    owner=dir_url.owner,
-                    repo=dir_url.repo,
-                    branch=BranchInfo(dir_url.branch, commit_info),
-                    sha=node["sha"],
-                    path=current_path,
-                    path_regexp=path_regexp,
-                ):
-                    yield work_info
             if (
                 node_type != "file"
                 or not self._is_accepted_extension(node["name"])
@@ -367,17 +606,29 @@ class AsyncGithubParser:
             ):
                 continue
 
-            commit_info = await self._get_commit_info(
-                dir_url.owner, dir_url.repo, dir_url.branch, current_path
+            spawn(
+                self._get_work_info(
+                    dir_url.owner,
+                    dir_url.repo,
+                    dir_url.branch,
+                    node["sha"],
+                    current_path,
+                    full_link,
+                    head_commit,
+                )
             )
 
-            file_content = await self.get_file_content_by_sha(
-                owner=dir_url.owner,
-                repo=dir_url.repo,
-                blob_sha=node["sha"],
-            )
+    async def _get_files_generator_from_node_list(
+        self: Self,
+        node_list: list[dict],
+        dir_url: GitHubContentUrl,
+        path_regexp: re.Pattern | None = None,
+    ) -> AsyncGenerator[WorkInfo, None]:
+        async def start(spawn: Spawn) -> None:
+            await self._walk_node_list(spawn, node_list, dir_url, path_regexp)
 
-            yield WorkInfo(file_content, full_link, commit_info)
+        async for work_info in self._iterate_concurrently(start):
+            yield work_info
 
     async def get_files_generator_from_url(
         self: Self, url: str, path_regexp: re.Pattern | None = None
@@ -0,0 +1,140 @@
+"""This module contains the on-disk cache of responses of the GitHub API.
+
+Blobs are immutable, so their content is stored by the sha of the blob and is used
+without any requests. Responses of the mutable endpoints (trees and branches) are stored
+together with their ETags and are revalidated with conditional requests, which are cheap
+and do not consume the rate limit of the GitHub API when the content was not changed.
+When the size of the cache exceeds the limit, the least recently used files are removed.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Final, NamedTuple
+
+from typing_extensions import Self
+
+DEFAULT_MAX_SIZE: Final[int] = 256 * 2**20
+# The part of the maximal size which remains after eviction, so eviction is not
+# repeated on each saving
+_EVICTION_RATIO: Final[float] = 0.75
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    data: Any
+
+
+class GitHubCache:
+    def __init__(
+        self: Self,
+        directory: Path,
+        max_size: int = DEFAULT_MAX_SIZE,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """Initializes the cache.
+
+        Args:
+        ----
+            directory (Path): The directory of the cache, it is created when needed.
+            max_size (int): The maximal total size of the cached files in bytes.
+            logger (logging.Logger | None, optional): The logger of the cache.
+
+        """
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.directory = directory
+        self.max_size = max_size
+        # Is counted lazily on the first saving
+        self.__size: int | None = None
+
+    def _get_blob_path(self: Self, sha: str) -> Path:
+        return self.directory / "blobs" / sha[:2] / sha
+
+    def _get_response_path(self: Self, url: str) -> Path:
+        url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / "responses" / url_hash[:2] / f"{url_hash}.json"
+
+    def get_blob(self: Self, sha: str) -> bytes | None:
+        path = self._get_blob_path(sha)
+        try:
+            content = path.read_bytes()
+        except OSError:
+            return None
+        self._touch(path)
+
+        return content
+
+    def save_blob(self: Self, sha: str, content: bytes) -> None:
+        self._write(self._get_blob_path(sha), content)
+
+    def get_response(self: Self, url: str) -> CachedResponse | None:
+        path = self._get_response_path(url)
+        try:
+            with path.open(mode="r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url:
+            return None
+        self._touch(path)
+
+        return CachedResponse(entry["etag"], entry["data"])
+
+    def save_response(self: Self, url: str, etag: str, data: Any) -> None:
+        entry = {"url": url, "etag": etag, "data": data}
+        self._write(self._get_response_path(url), json.dumps(entry).encode("utf-8"))
+
+    def _touch(self: Self, path: Path) -> None:
+        # The modification time orders files for the eviction
+        with contextlib.suppress(OSError):
+            os.utime(path)
+
+    def _write(self: Self, path: Path, content: bytes) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # The file is renamed only after writing, so other processes
+            # never read a partially written file
+            with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+                f.write(content)
+            os.replace(f.name, path)
+        except OSError as err:
+            self.logger.debug(f"Failed to save '{path}' to the GitHub cache: {err}.")
+            return
+
+        if self.__size is None:
+            self.__size = sum(size for _, _, size in self._list_files())
+        else:
+            self.__size += len(content)
+        if self.__size > self.max_size:
+            self.evict()
+
+    def _list_files(self: Self) -> list[tuple[float, Path, int]]:
+        files = []
+        for path in self.directory.glob("*/*/*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path, stat.st_size))
+
+        return files
+
+    def evict(self: Self) -> None:
+        """Removes the least recently used files until the size of the cache drops."""
+        files = sorted(self._list_files())
+        size = sum(file_size for _, _, file_size in files)
+        limit = self.max_size * _EVICTION_RATIO
+        for _, path, file_size in files:
+            if size <= limit:
+                break
+            path.unlink(missing_ok=True)
+            size -= file_size
+        self.__size = size
@@ -7,6 +7,7 @@ from typing import Any, Final, Iterator
 import requests
 from typing_extensions import Self
 
+from webparsers.cache import GitHubCache
 from webparsers.types import (
     BranchInfo,
     Commit,
@@ -30,6 +31,8 @@ class GitHubParser:
         access_token: str = "",
         logger: logging.Logger | None = None,
         session: requests.Session | None = None,
+        branch_commits: bool = False,
+        cache: GitHubCache | None = None,
     ) -> None:
         if logger is None:
             self.logger = logging.getLogger(__name__)
@@ -39,6 +42,10 @@ class GitHubParser:
         self.__session = session
         self.__file_extensions = file_extensions
         self.__check_all_branches = check_all
+        # Files get the last commit of the branch, and trees are fetched recursively
+        # with one request instead of searching for the last commit of each file
+        self.__branch_commits = branch_commits
+        self.__cache = cache
         self.__headers = {
             # Recommended
             "accept": "application/vnd.github.v3+json"
@@ -58,10 +65,15 @@ class GitHubParser:
             self.__session = None
 
     def send_get_request(
-        self: Self, api_url: str, params: dict | None = None, address: str = _API_URL
+        self: Self,
+        api_url: str,
+        params: dict | None = None,
+        address: str = _API_URL,
+        headers: dict[str, str] | None = None,
     ) -> requests.Response:
         if params is None:
             params = {}
+        headers = self.__headers if headers is None else {**self.__headers, **headers}
 
         if address and len(api_url) and api_url[0] != "/":
             address += "/"
@@ -71,9 +83,9 @@ class GitHubParser:
         # Check Ethernet connection and requests limit
         try:
             if self.__session is not None:
-                response = self.__session.get(url, headers=self.__headers, params=params)
+                response = self.__session.get(url, headers=headers, params=params)
             else:
-                response = requests.get(url, headers=self.__headers, params=params)
+                response = requests.get(url, headers=headers, params=params)
         except requests.exceptions.ConnectionError as err:
             self.logger.error("Connection error. Please check the Internet connection.")
             self.logger.debug(str(err))
@@ -92,6 +104,27 @@ class GitHubParser:
 
         return response
 
+    def _send_conditional_get_request(self: Self, api_url: str, params: dict | None = None) -> Any:
+        """Returns JSON of the response, revalidating the cached one with its ETag."""
+        if self.__cache is None:
+            if params is None:
+                return self.send_get_request(api_url).json()
+            return self.send_get_request(api_url, params=params).json()
+
+        url = requests.Request("GET", _API_URL + api_url, params=params).prepare().url
+        cached = self.__cache.get_response(url)
+        headers = None if cached is None else {"If-None-Match": cached.etag}
+        response = self.send_get_request(api_url, params=params, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            return cached.data
+
+        data = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            self.__cache.save_response(url, etag, data)
+
+        return data
+
     def get_list_of_repos(
         self: Self, owner: str, reg_exp: re.Pattern | None = None
     ) -> list[Repository]:
@@ -162,17 +195,20 @@ class GitHubParser:
         self: Self, owner: str, repo: str, branch: str = "main"
     ) -> dict:
         api_url = f"/repos/{owner}/{repo}/branches/{branch}"
-        response: dict[str, Any] = self.send_get_request(api_url).json()
+        response: dict[str, Any] = self._send_conditional_get_request(api_url)
 
         return response["commit"]
 
     def get_file_content_by_sha(
         self: Self, owner: str, repo: str, blob_sha: str, commit_info: Commit, file_path: str
     ) -> WorkInfo:
-        api_url = f"/repos/{owner}/{repo}/git/blobs/{blob_sha}"
-        response: dict[str, Any] = self.send_get_request(api_url).json()
-
-        file_in_bytes: bytearray = bytearray(base64.b64decode(response["content"]))
+        file_in_bytes = None if self.__cache is None else self.__cache.get_blob(blob_sha)
+        if file_in_bytes is None:
+            api_url = f"/repos/{owner}/{repo}/git/blobs/{blob_sha}"
+            response: dict[str, Any] = self.send_get_request(api_url).json()
+            file_in_bytes = base64.b64decode(response["content"])
+            if self.__cache is not None:
+                self.__cache.save_blob(blob_sha, file_in_bytes)
         code = file_in_bytes.decode("utf-8", errors="ignore")
 
         return WorkInfo(code, file_path, commit_info)
@@ -185,6 +221,32 @@ class GitHubParser:
 
         return Commit(commit_info["sha"], commit_info["commit"]["author"]["date"])
 
+    def _get_branch_head_commit(self: Self, owner: str, repo: str, branch: str) -> Commit:
+        commit_info = self._get_branch_last_commit_info(owner, repo, branch)
+
+        return Commit(commit_info["sha"], commit_info["commit"]["author"]["date"])
+
+    def _get_tree(self: Self, owner: str, repo: str, sha: str) -> list[dict[str, Any]]:
+        api_url = f"/repos/{owner}/{repo}/git/trees/{sha}"
+        if not self.__branch_commits:
+            return self._send_conditional_get_request(api_url)["tree"]
+
+        jresponse: dict[str, Any] = self._send_conditional_get_request(
+            api_url, params={"recursive": 1}
+        )
+        tree: list[dict[str, Any]] = jresponse["tree"]
+        if jresponse.get("truncated", False):
+            self.logger.warning(
+                f"The tree '{sha}' of the repository '{owner}/{repo}' is too big for one "
+                "request, its subtrees will be fetched separately."
+            )
+            tree = [node for node in tree if "/" not in node["path"]]
+        else:
+            # Nested nodes are already listed in the full tree
+            tree = [node for node in tree if node["type"] != "tree"]
+
+        return tree
+
     def get_files_generator_from_sha_commit(
         self: Self,
         owner: str,
@@ -194,19 +256,19 @@ class GitHubParser:
         path: str = "",
         path_regexp: re.Pattern | None = None,
     ) -> Iterator[WorkInfo]:
-        api_url = f"/repos/{owner}/{repo}/git/trees/{sha}"
-        jresponse: dict[str, Any] = self.send_get_request(api_url).json()
-        tree: list[dict[str, Any]] = jresponse["tree"]
-        for node in tree:
+        for node in self._get_tree(owner, repo, sha):
             current_path = f"{path}/{node['path']}"
             full_link = f"{_GH_URL}{owner}/{repo}/blob/{branch.name}{current_path}"
             node_type = node["type"]
             if node_type == "tree":
-                commit_info = self._get_commit_info(owner, repo, branch.name, current_path)
+                subtree_branch = branch
+                if not self.__branch_commits:
+                    commit_info = self._get_commit_info(owner, repo, branch.name, current_path)
+                    subtree_branch = BranchInfo(branch.name, commit_info)
                 yield from self.get_files_generator_from_sha_commit(
                     owner=owner,
                     repo=repo,
-                    branch=BranchInfo(branch.name, commit_info),
+                    branch=subtree_branch,
                     sha=node["sha"],
                     path=current_path,
                     path_regexp=path_regexp,
@@ -219,7 +281,10 @@ class GitHubParser:
             ):
                 continue
 
-            commit_info = self._get_commit_info(owner, repo, branch.name, current_path)
+            if self.__branch_commits:
+                commit_info = branch.last_commit
+            else:
+                commit_info = self._get_commit_info(owner, repo, branch.name, current_path)
 
             yield self.get_file_content_by_sha(owner, repo, node["sha"], commit_info, full_link)
 
@@ -302,6 +367,9 @@ class GitHubParser:
         dir_url: GitHubContentUrl,
         path_regexp: re.Pattern | None = None,
     ) -> Iterator[WorkInfo]:
+        head_commit: Commit | None = None
+        if self.__branch_commits:
+            head_commit = self._get_branch_head_commit(dir_url.owner, dir_url.repo, dir_url.branch)
         for node in node_list:
             current_path = f"/{node['path']}"
             full_link = (
@@ -309,7 +377,7 @@ class GitHubParser:
             )
             node_type = node["type"]
             if node_type == "dir":
-                commit_info = self._get_commit_info(
+                commit_info = head_commit or self._get_commit_info(
                     dir_url.owner, dir_url.repo, dir_url.branch, current_path
                 )
                 yield from self.get_files_generator_from_sha_commit(
@@ -327,7 +395,7 @@ class GitHubParser:
             ):
                 continue
 
-            commit_info = self._get_commit_info(
+            commit_info = head_commit or self._get_commit_info(
                 dir_url.owner, dir_url.repo, dir_url.branch, current_path
             )
 
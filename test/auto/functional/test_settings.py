@@ -6,7 +6,21 @@ import pytest
 from typing_extensions import Self
 from utils import MaxDepth, NgramsLength, modify_settings
 
-from codeplag.consts import CONFIG_PATH, NGRAMS_LENGTH_CHOICE, UTIL_NAME
+from codeplag.consts import (
+    CONFIG_PATH,
+    DEFAULT_GITHUB_CACHE_SIZE,
+    DEFAULT_GITHUB_CONCURRENCY,
+    DEFAULT_LOG_TRACE_SAMPLING,
+    DEFAULT_STRUCTURE_ASSIGNMENT,
+    DEFAULT_STRUCTURE_CANDIDATES,
+    DEFAULT_WORKERS_START_METHOD,
+    GITHUB_CACHE_SIZE_CHOICE,
+    GITHUB_CONCURRENCY_CHOICE,
+    LOG_TRACE_SAMPLING_CHOICE,
+    NGRAMS_LENGTH_CHOICE,
+    STRUCTURE_CANDIDATES_CHOICE,
+    UTIL_NAME,
+)
 from codeplag.types import Flag, Language, LogLevel, ReportsExtension, ShortOutput, Threshold
 
 
@@ -135,11 +149,17 @@ class TestSettingsModify:
             "threshold": threshold,
             "max_depth": max_depth,
             "ngrams_length": ngrams_length,
+            "structure_candidates": DEFAULT_STRUCTURE_CANDIDATES,
+            "structure_assignment": DEFAULT_STRUCTURE_ASSIGNMENT,
             "show_progress": show_progress,
             "short_output": short_output,
             "workers": workers,
+            "workers_start_method": DEFAULT_WORKERS_START_METHOD,
+            "github_concurrency": DEFAULT_GITHUB_CONCURRENCY,
+            "github_cache_size": DEFAULT_GITHUB_CACHE_SIZE,
             "language": language,
             "log_level": log_level,
+            "log_trace_sampling": DEFAULT_LOG_TRACE_SAMPLING,
             "reports_extension": reports_extension,
             "mongo_host": mongo_host,
             "mongo_port": mongo_port,
@@ -192,6 +212,49 @@ class TestSettingsModify:
     ) -> None:
         modify_settings(ngrams_length=ngrams_length).assert_failed()
 
+    @pytest.mark.parametrize(
+        "structure_candidates",
+        [STRUCTURE_CANDIDATES_CHOICE[0] - 1, STRUCTURE_CANDIDATES_CHOICE[-1] + 1],
+        ids=["Less than minimal value.", "More than maximal value."],
+    )
+    def test_modify_settings_with_invalid_structure_candidates(
+        self: Self, structure_candidates: int
+    ) -> None:
+        modify_settings(structure_candidates=structure_candidates).assert_failed()
+
+    @pytest.mark.parametrize(
+        "github_concurrency",
+        [GITHUB_CONCURRENCY_CHOICE[0] - 1, GITHUB_CONCURRENCY_CHOICE[-1] + 1],
+        ids=["Less than minimal value.", "More than maximal value."],
+    )
+    def test_modify_settings_with_invalid_github_concurrency(
+        self: Self, github_concurrency: int
+    ) -> None:
+        modify_settings(github_concurrency=github_concurrency).assert_failed()
+
+    def test_modify_settings_with_invalid_workers_start_method(self: Self) -> None:
+        modify_settings(workers_start_method="thread").assert_failed()
+
+    @pytest.mark.parametrize(
+        "log_trace_sampling",
+        [LOG_TRACE_SAMPLING_CHOICE[0] - 1, LOG_TRACE_SAMPLING_CHOICE[-1] + 1],
+        ids=["Less than minimal value.", "More than maximal value."],
+    )
+    def test_modify_settings_with_invalid_log_trace_sampling(
+        self: Self, log_trace_sampling: int
+    ) -> None:
+        modify_settings(log_trace_sampling=log_trace_sampling).assert_failed()
+
+    @pytest.mark.parametrize(
+        "github_cache_size",
+        [GITHUB_CACHE_SIZE_CHOICE[0] - 1, GITHUB_CACHE_SIZE_CHOICE[-1] + 1],
+        ids=["Less than minimal value.", "More than maximal value."],
+    )
+    def test_modify_settings_with_invalid_github_cache_size(
+        self: Self, github_cache_size: int
+    ) -> None:
+        modify_settings(github_cache_size=github_cache_size).assert_failed()
+
     @pytest.mark.parametrize(
         "mongo_port",
         [0, 65536],
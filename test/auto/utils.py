@@ -16,6 +16,7 @@ from codeplag.types import (
     ReportsExtension,
     ReportType,
     ShortOutput,
+    StructureAssignment,
     Threshold,
 )
 
@@ -91,12 +92,18 @@ def modify_settings(
     threshold: Threshold | None = None,
     max_depth: MaxDepth | None = None,
     ngrams_length: NgramsLength | None = None,
+    structure_candidates: int | None = None,
+    structure_assignment: StructureAssignment | None = None,
     show_progress: Flag | None = None,
     short_output: ShortOutput | None = None,
     reports_extension: ReportsExtension | None = None,
     language: Language | None = None,
     log_level: LogLevel | None = None,
+    log_trace_sampling: int | None = None,
     workers: int | None = None,
+    workers_start_method: str | None = None,
+    github_concurrency: int | None = None,
+    github_cache_size: int | None = None,
     mongo_host: str | None = None,
     mongo_port: int | None = None,
     mongo_user: str | None = None,
@@ -109,12 +116,18 @@ def modify_settings(
         + create_opt("threshold", threshold)
         + create_opt("max-depth", max_depth)
         + create_opt("ngrams-length", ngrams_length)
+        + create_opt("structure-candidates", structure_candidates)
+        + create_opt("structure-assignment", structure_assignment)
         + create_opt("show_progress", show_progress)
         + create_opt("short-output", short_output)
         + create_opt("reports_extension", reports_extension)
         + create_opt("language", language)
         + create_opt("log-level", log_level)
+        + create_opt("log-trace-sampling", log_trace_sampling)
         + create_opt("workers", workers)
+        + create_opt("workers-start-method", workers_start_method)
+        + create_opt("github-concurrency", github_concurrency)
+        + create_opt("github-cache-size", github_cache_size)
         + create_opt("mongo-host", mongo_host)
         + create_opt("mongo-port", mongo_port)
         + create_opt("mongo-user", mongo_user)
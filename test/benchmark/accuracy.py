@@ -0,0 +1,145 @@
+"""Accuracy of the approximate structure comparison against the exact one.
+
+Usage:
+    python3 test/benchmark/accuracy.py [--candidates K [K ...]] [--functions N [N ...]]
+        [--assignment {greedy,optimal}]
+
+Pairs of generated modules with different similarity and order of functions, and pairs of
+the package source files are compared with the exact structure comparison and with the
+approximate one for each provided count of candidates. For each count the mean and the
+maximal absolute errors of the structure similarity and the speedup are printed.
+"""
+
+import argparse
+import ast
+import random
+import sys
+from time import perf_counter
+from typing import Final, NamedTuple
+
+from corpus import generate_module, generate_similar_module, get_py_fixtures
+
+from codeplag.algorithms.featurebased import struct_compare
+from codeplag.consts import DEFAULT_STRUCTURE_ASSIGNMENT, STRUCTURE_ASSIGNMENT_CHOICE
+from codeplag.pyplag.utils import get_ast_from_filename, get_features_from_ast
+from codeplag.types import ASTFeatures, StructureAssignment
+
+DEFAULT_CANDIDATES: Final[tuple[int, ...]] = (1, 3, 5, 10)
+DEFAULT_FUNCTIONS: Final[tuple[int, ...]] = (10, 20)
+SIMILARITIES: Final[tuple[float, ...]] = (0.3, 0.7, 0.95)
+STATEMENTS: Final[int] = 5
+FIXTURE_PAIRS: Final[int] = 10
+# The exact comparison of bigger files takes minutes
+MAX_FIXTURE_NODES: Final[int] = 1500
+
+
+class Measurement(NamedTuple):
+    similarity: float
+    elapsed: float
+
+
+def _features_from_source(source: str, name: str) -> ASTFeatures:
+    return get_features_from_ast(ast.parse(source), name)
+
+
+def _shuffle_functions(source: str, seed: int) -> str:
+    functions = source.split("\n\n\n")
+    random.Random(seed).shuffle(functions)
+    return "\n\n\n".join(functions)
+
+
+def generate_pairs(functions: list[int]) -> list[tuple[ASTFeatures, ASTFeatures]]:
+    pairs = []
+    for count in functions:
+        first = generate_module(1, functions=count, statements=STATEMENTS)
+        for similarity in SIMILARITIES:
+            second = generate_similar_module(
+                1, 2, similarity, functions=count, statements=STATEMENTS
+            )
+            for source in (second, _shuffle_functions(second, count)):
+                pairs.append(
+                    (
+                        _features_from_source(first, "first.py"),
+                        _features_from_source(source, "second.py"),
+                    )
+                )
+
+    works = []
+    for path in get_py_fixtures():
+        tree = get_ast_from_filename(path)
+        if tree is None:
+            continue
+        work = get_features_from_ast(tree, path)
+        if len(work.structure) <= MAX_FIXTURE_NODES:
+            works.append(work)
+    rnd = random.Random(0)
+    for _ in range(min(FIXTURE_PAIRS, len(works) // 2)):
+        first, second = rnd.sample(works, 2)
+        pairs.append((first, second))
+
+    return pairs
+
+
+def measure(
+    work1: ASTFeatures,
+    work2: ASTFeatures,
+    candidates: int,
+    assignment: StructureAssignment = DEFAULT_STRUCTURE_ASSIGNMENT,
+) -> Measurement:
+    start = perf_counter()
+    res = struct_compare(
+        work1.structure, work2.structure, candidates=candidates, assignment=assignment
+    )
+    return Measurement(res[0] / res[1], perf_counter() - start)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-c", "--candidates", type=int, nargs="+", default=list(DEFAULT_CANDIDATES)
+    )
+    parser.add_argument(
+        "-f",
+        "--functions",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_FUNCTIONS),
+        help="Counts of the top-level functions in the generated modules.",
+    )
+    parser.add_argument(
+        "-a",
+        "--assignment",
+        choices=STRUCTURE_ASSIGNMENT_CHOICE,
+        default=DEFAULT_STRUCTURE_ASSIGNMENT,
+        help="The algorithm of matching of the top-level nodes.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = create_parser().parse_args(argv)
+    pairs = generate_pairs(args.functions)
+    exact = [measure(work1, work2, 0, args.assignment) for work1, work2 in pairs]
+    exact_elapsed = sum(measurement.elapsed for measurement in exact)
+
+    print(f"Compared pairs: {len(pairs)}, exact comparison: {exact_elapsed:.3f} s")
+    print(f"{'candidates':>10} {'mean error':>12} {'max error':>12} {'speedup':>10}")
+    for candidates in args.candidates:
+        approximate = [
+            measure(work1, work2, candidates, args.assignment) for work1, work2 in pairs
+        ]
+        errors = [
+            abs(first.similarity - second.similarity)
+            for first, second in zip(exact, approximate, strict=True)
+        ]
+        elapsed = sum(measurement.elapsed for measurement in approximate)
+        print(
+            f"{candidates:>10} {sum(errors) / len(errors):>12.4f} {max(errors):>12.4f} "
+            f"{exact_elapsed / elapsed:>9.1f}x"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Corpora of controlled size and similarity for the benchmarks."""
+
+import random
+from pathlib import Path
+from typing import Final
+
+ROOT_PATH: Final[Path] = Path(__file__).resolve().parents[2]
+PY_FIXTURES_PATH: Final[Path] = ROOT_PATH / "src"
+CPP_FIXTURES_PATH: Final[Path] = ROOT_PATH / "test" / "unit" / "codeplag" / "cplag" / "data"
+
+_STATEMENTS: Final[tuple[str, ...]] = (
+    "{a} = {b} + {c} * {n}",
+    "{a} += {n}",
+    "{a} = [{b} for {b} in range({n})]",
+    "{a} = {{'{b}': {c}, 'key': {n}}}",
+    "if {a} > {n}:\n{i}    {b} = {a} - {c}\n{i}else:\n{i}    {b} = {c}",
+    "for {a} in range({n}):\n{i}    {b} = {b} + {a}",
+    "while {a} < {n}:\n{i}    {a} += 1",
+    "{a} = {b} if {c} else {n}",
+    "try:\n{i}    {a} = {b} / {c}\n{i}except ZeroDivisionError:\n{i}    {a} = 0",
+    "{a} = f'{{{b}}} and {{{c}}}'",
+    "{a} = not {b} and {c} or {n} == {a}",
+    "print({a}, {b}, {c})",
+)
+_NAMES: Final[tuple[str, ...]] = (
+    "value",
+    "total",
+    "index",
+    "result",
+    "item",
+    "count",
+    "buffer",
+    "left",
+    "right",
+    "data",
+)
+
+
+def _generate_statement(rnd: random.Random, indent: str) -> str:
+    a, b, c = rnd.sample(_NAMES, 3)
+    template = rnd.choice(_STATEMENTS)
+    return indent + template.format(a=a, b=b, c=c, n=rnd.randint(0, 100), i=indent)
+
+
+def _generate_function(rnd: random.Random, name: str, statements: int) -> str:
+    indent = " " * 4
+    lines = [f"def {name}({', '.join(_NAMES[:3])}):"]
+    lines.extend(_generate_statement(rnd, indent) for _ in range(statements))
+    lines.append(f"{indent}return {rnd.choice(_NAMES)}")
+    return "\n".join(lines)
+
+
+def generate_module(seed: int, functions: int = 10, statements: int = 10) -> str:
+    """Generates syntactically correct Python module.
+
+    Args:
+    ----
+        seed (int): The seed of the pseudo-random generator.
+        functions (int): Count of the top-level functions in the module.
+        statements (int): Count of the statements in each function.
+
+    """
+    rnd = random.Random(seed)
+    return "\n\n\n".join(
+        _generate_function(rnd, f"func_{seed}_{i}", statements) for i in range(functions)
+    )
+
+
+def generate_similar_module(
+    source_seed: int, seed: int, similarity: float, functions: int = 10, statements: int = 10
+) -> str:
+    """Generates a module whose functions partially copied from the source module.
+
+    Copied functions are renamed, so only the structure of the code is kept.
+
+    Args:
+    ----
+        source_seed (int): The seed which was used to generate the source module.
+        seed (int): The seed of the generated module.
+        similarity (float): The fraction of the functions copied from the source module.
+        functions (int): Count of the top-level functions in the module.
+        statements (int): Count of the statements in each function.
+
+    """
+    source_rnd = random.Random(source_seed)
+    own_rnd = random.Random(seed)
+    copied = round(functions * similarity)
+    parts = []
+    for i in range(functions):
+        source_function = _generate_function(source_rnd, f"copy_{seed}_{i}", statements)
+        if i < copied:
+            parts.append(source_function)
+        else:
+            parts.append(_generate_function(own_rnd, f"func_{seed}_{i}", statements))
+    return "\n\n\n".join(parts)
+
+
+def generate_corpus(
+    count: int, similarity: float, functions: int = 10, statements: int = 10, seed: int = 0
+) -> list[str]:
+    """Generates modules where every module shares the given fraction with the first one.
+
+    Args:
+    ----
+        count (int): Count of the generated modules.
+        similarity (float): The fraction of the functions copied from the first module.
+        functions (int): Count of the top-level functions in each module.
+        statements (int): Count of the statements in each function.
+        seed (int): The seed of the first module.
+
+    """
+    corpus = [generate_module(seed, functions, statements)]
+    corpus.extend(
+        generate_similar_module(seed, seed + i, similarity, functions, statements)
+        for i in range(1, count)
+    )
+    return corpus
+
+
+def write_corpus(corpus: list[str], directory: Path, extension: str = "py") -> list[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i, source in enumerate(corpus):
+        path = directory / f"work_{i}.{extension}"
+        path.write_text(source, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def get_py_fixtures() -> list[Path]:
+    """Returns the source files of the package, used as a corpus of real code."""
+    return sorted(
+        path
+        for path in PY_FIXTURES_PATH.rglob("*.py")
+        if path.stat().st_size > 0 and not path.name.endswith(".tmp.py")
+    )
+
+
+def get_cpp_fixtures() -> list[Path]:
+    return sorted(path for path in CPP_FIXTURES_PATH.glob("*.cpp") if path.stat().st_size > 0)
@@ -0,0 +1,390 @@
+"""Benchmarks of the features extraction, comparison algorithms and the check command.
+
+Usage:
+    python3 test/benchmark/run.py [--output FILE] [--baseline FILE] [--filter REGEXP]
+
+The results are printed and saved in the JSON format. When a baseline file is provided,
+every benchmark is compared with it and the exit code is non-zero if some of them became
+slower than the allowed tolerance.
+"""
+
+import argparse
+import ast
+import io
+import json
+import logging
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from contextlib import ExitStack, redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Final, NamedTuple
+
+import numpy as np
+from corpus import (
+    generate_corpus,
+    generate_module,
+    generate_similar_module,
+    get_cpp_fixtures,
+    get_py_fixtures,
+    write_corpus,
+)
+
+from codeplag.algorithms.compare import compare_works, fast_compare
+from codeplag.algorithms.featurebased import (
+    counter_metric,
+    matrix_value,
+    op_shift_metric,
+    struct_compare,
+)
+from codeplag.algorithms.stringbased import LevenshteinDistance, gst
+from codeplag.algorithms.tokenbased import (
+    get_fingerprints,
+    lcs_based_coeff,
+    value_fingerprints_coef,
+    value_jakkar_coef,
+)
+from codeplag.logger import codeplag_logger
+from codeplag.pyplag.utils import get_ast_from_filename, get_features_from_ast
+from codeplag.types import ASTFeatures, ShortOutput
+
+DEFAULT_REPEAT: Final[int] = 5
+DEFAULT_TOLERANCE: Final[float] = 0.25
+SIMILARITY: Final[float] = 0.7
+STATEMENTS: Final[int] = 5
+STRUCTURE_CANDIDATES: Final[int] = 3
+ASSIGNMENT_SIZE: Final[int] = 100
+
+Setup = Callable[[int], Callable[[], object] | None]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Setup
+
+
+BENCHMARKS: list[Benchmark] = []
+# Temporary files of the set up benchmark are removed after its measurement
+_cleanup = ExitStack()
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Registers the setup function which returns the measured callable.
+
+    The setup function may return None when the benchmark can't be run in the environment.
+    """
+
+    def decorator(setup: Setup) -> Setup:
+        BENCHMARKS.append(Benchmark(name, setup))
+        return setup
+
+    return decorator
+
+
+def _temp_directory() -> Path:
+    temp_dir = tempfile.TemporaryDirectory(prefix="codeplag-benchmark-")
+    return Path(_cleanup.enter_context(temp_dir))
+
+
+def _features_from_source(source: str, name: str) -> ASTFeatures:
+    return get_features_from_ast(ast.parse(source), name)
+
+
+def _similar_pair(scale: int) -> tuple[ASTFeatures, ASTFeatures]:
+    functions = 4 * scale
+    first = generate_module(1, functions=functions, statements=STATEMENTS)
+    second = generate_similar_module(1, 2, SIMILARITY, functions=functions, statements=STATEMENTS)
+    return _features_from_source(first, "first.py"), _features_from_source(second, "second.py")
+
+
+@benchmark("extraction.py.synthetic")
+def _extraction_py_synthetic(scale: int) -> Callable[[], object]:
+    tree = ast.parse(generate_module(0, functions=50 * scale, statements=20))
+    return lambda: get_features_from_ast(tree, "synthetic.py")
+
+
+@benchmark("extraction.py.fixtures")
+def _extraction_py_fixtures(scale: int) -> Callable[[], object]:
+    trees = [(get_ast_from_filename(path), path) for path in get_py_fixtures()]
+
+    def run() -> None:
+        for tree, path in trees:
+            if tree is not None:
+                get_features_from_ast(tree, path)
+
+    return run
+
+
+@benchmark("extraction.cpp.fixtures")
+def _extraction_cpp_fixtures(scale: int) -> Callable[[], object] | None:
+    try:
+        from codeplag.cplag.tree import get_features
+        from codeplag.cplag.utils import get_cursor_from_file
+    except Exception:
+        return None
+    cursors = [(get_cursor_from_file(path), path) for path in get_cpp_fixtures()]
+
+    def run() -> None:
+        for cursor, path in cursors:
+            if cursor is not None:
+                get_features(cursor, path)
+
+    return run
+
+
+@benchmark("metric.jakkar")
+def _metric_jakkar(scale: int) -> Callable[[], object]:
+    work1, work2 = _similar_pair(scale)
+    return lambda: value_jakkar_coef(work1.tokens, work2.tokens)
+
+
+@benchmark("metric.fingerprints")
+def _metric_fingerprints(scale: int) -> Callable[[], object]:
+    work1, work2 = _similar_pair(scale)
+    return lambda: value_fingerprints_coef(
+        get_fingerprints(work1.tokens), get_fingerprints(work2.tokens)
+    )
+
+
+@benchmark("metric.counter")
+def _metric_counter(scale: int) -> Callable[[], object]:
+    work1, work2 = _similar_pair(scale)
+
+    def run() -> None:
+        counter_metric(work1.operators, work2.operators)
+        counter_metric(work1.keywords, work2.keywords)
+        counter_metric(work1.literals, work2.literals)
+
+    return run
+
+
+@benchmark("metric.op_shift")
+def _metric_op_shift(scale: int) -> Callable[[], object]:
+    work1, work2 = _similar_pair(scale)
+    ops1 = [str(token) for token in work1.tokens[: 200 * scale]]
+    ops2 = [str(token) for token in work2.tokens[: 200 * scale]]
+    return lambda: op_shift_metric(ops1, ops2)
+
+
+@benchmark("metric.lcs")
+def _metric_lcs(scale: int) -> Callable[[], object]:
+    work1, work2 = _similar_pair(scale)
+    tokens1 = work1.tokens[: 300 * scale]
+    tokens2 = work2.tokens[: 300 * scale]
+    return lambda: lcs_based_coeff(tokens1, tokens2)
+
+
+@benchmark("metric.levenshtein")
+def _metric_levenshtein(scale: int) -> Callable[[], object]:
+    work1, work2 = _similar_pair(scale)
+    tokens1 = work1.tokens[: 100 * scale]
+    tokens2 = work2.tokens[: 100 * scale]
+    return lambda: LevenshteinDistance(tokens1, tokens2).get_similarity_value()
+
+
+@benchmark("metric.gst")
+def _metric_gst(scale: int) -> Callable[[], object]:
+    work1, work2 = _similar_pair(scale)
+    tokens1 = work1.tokens[: 100 * scale]
+    tokens2 = work2.tokens[: 100 * scale]
+    return lambda: gst(tokens1, tokens2, 6)
+
+
+@benchmark("metric.structure")
+def _metric_structure(scale: int) -> Callable[[], object]:
+    work1, work2 = _similar_pair(scale)
+    return lambda: struct_compare(work1.structure, work2.structure)
+
+
+@benchmark("metric.structure.approximate")
+def _metric_structure_approximate(scale: int) -> Callable[[], object]:
+    work1, work2 = _similar_pair(scale)
+    return lambda: struct_compare(
+        work1.structure, work2.structure, candidates=STRUCTURE_CANDIDATES
+    )
+
+
+def _compliance_matrix(scale: int) -> np.ndarray:
+    rnd = np.random.default_rng(0)
+    size = ASSIGNMENT_SIZE * scale
+    denominators = rnd.integers(1, 100, (size, size, 1))
+    numerators = rnd.integers(1, 100, (size, size, 1)) % denominators + 1
+    return np.concatenate((numerators, denominators), axis=2)
+
+
+@benchmark("assignment.greedy")
+def _assignment_greedy(scale: int) -> Callable[[], object]:
+    array = _compliance_matrix(scale)
+    return lambda: matrix_value(array, assignment="greedy")
+
+
+@benchmark("assignment.optimal")
+def _assignment_optimal(scale: int) -> Callable[[], object]:
+    array = _compliance_matrix(scale)
+    return lambda: matrix_value(array, assignment="optimal")
+
+
+@benchmark("compare.fast")
+def _compare_fast(scale: int) -> Callable[[], object]:
+    work1, work2 = _similar_pair(scale)
+    return lambda: fast_compare(work1, work2)
+
+
+@benchmark("compare.full")
+def _compare_full(scale: int) -> Callable[[], object]:
+    work1, work2 = _similar_pair(scale)
+    return lambda: compare_works(work1, work2)
+
+
+@benchmark("check.many_to_many")
+def _check_many_to_many(scale: int) -> Callable[[], object]:
+    from codeplag.handlers.check import WorksComparator
+
+    directory = _temp_directory()
+    write_corpus(
+        generate_corpus(6 * scale, SIMILARITY, functions=4, statements=STATEMENTS), directory
+    )
+    comparator = WorksComparator("py")
+    comparator.reporter = None
+    comparator.short_output = ShortOutput.NO_SHOW
+    return lambda: comparator.check(directories=[directory])
+
+
+@benchmark("check.small")
+def _check_small(scale: int) -> Callable[[], object]:
+    """Returns repeated checks of a few works, where the start of the workers dominates."""
+    from codeplag.handlers.check import WorksComparator
+
+    directory = _temp_directory()
+    write_corpus(generate_corpus(3, SIMILARITY, functions=2, statements=STATEMENTS), directory)
+    comparator = WorksComparator("py")
+    comparator.reporter = None
+    comparator.short_output = ShortOutput.NO_SHOW
+    return lambda: [comparator.check(directories=[directory]) for _ in range(5 * scale)]
+
+
+def _startup(parsed_args: str) -> Callable[[], object]:
+    """Returns the run of the command in a new interpreter, so its imports are measured."""
+    code = (
+        "import gettext\n"
+        "from pathlib import Path\n"
+        "from codeplag.utils import CodeplagEngine\n"
+        # The installed translations may be absent in the source tree
+        "gettext.NullTranslations().install()\n"
+        f"CodeplagEngine({parsed_args}).run()\n"
+    )
+    return lambda: subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+
+
+@benchmark("startup.settings_show")
+def _startup_settings_show(scale: int) -> Callable[[], object]:
+    return _startup("{'root': 'settings', 'settings': 'show'}")
+
+
+@benchmark("startup.check_py")
+def _startup_check_py(scale: int) -> Callable[[], object]:
+    directory = _temp_directory()
+    (directory / "single.py").write_text(generate_module(0, functions=4, statements=STATEMENTS))
+    return _startup(
+        f"{{'root': 'check', 'extension': 'py', 'directories': [Path('{directory}')], "
+        "'ignore_threshold': False}"
+    )
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict[str, float | int]:
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "max": max(times),
+        "repeat": repeat,
+    }
+
+
+def compare_with_baseline(
+    results: dict[str, dict], baseline: dict[str, dict], tolerance: float
+) -> list[str]:
+    """Returns names of the benchmarks which are slower than in the baseline."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["median"] / baseline[name]["median"]
+        result["baseline_ratio"] = ratio
+        if ratio > 1.0 + tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", type=Path, help="Path to save results in JSON.")
+    parser.add_argument("-b", "--baseline", type=Path, help="Path to the baseline results.")
+    parser.add_argument("-f", "--filter", type=re.compile, help="Run only matched benchmarks.")
+    parser.add_argument("-r", "--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        "-s", "--scale", type=int, default=1, help="Multiplier of the corpora sizes."
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed relative slowdown compared with the baseline.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = create_parser().parse_args(argv)
+    codeplag_logger.setLevel(logging.ERROR)
+
+    results: dict[str, dict] = {}
+    for bench in BENCHMARKS:
+        if args.filter is not None and not args.filter.search(bench.name):
+            continue
+        with _cleanup, redirect_stdout(io.StringIO()):
+            func = bench.setup(args.scale)
+            if func is None:
+                print(f"{bench.name:<30} skipped", file=sys.stderr)
+                continue
+            results[bench.name] = measure(func, args.repeat)
+        print(f"{bench.name:<30} {results[bench.name]['median']:.6f} s")
+
+    regressions = []
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for name in regressions:
+            print(
+                f"Regression in '{name}': {results[name]['baseline_ratio']:.2f}x of the baseline.",
+                file=sys.stderr,
+            )
+
+    if args.output is not None:
+        report = {
+            "meta": {
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "scale": args.scale,
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=4))
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,20 @@
+from dataclasses import replace
+
 import pytest
+from pytest_mock import MockerFixture
 from typing_extensions import Self
 
-from codeplag.algorithms.compare import compare_works, fast_compare
+from codeplag.algorithms.compare import (
+    _create_fast_compare_info,
+    _is_below_threshold,
+    bounded_fast_compare,
+    calc_min_ngrams_ratio,
+    compare_works,
+    fast_compare,
+    get_features_structure_view,
+    is_same_structure,
+)
+from codeplag.consts import DEFAULT_WEIGHTS
 from codeplag.types import ASTFeatures, FastCompareInfo, FullCompareInfo
 
 
@@ -35,6 +48,138 @@ class TestCompareWorks:
         assert compare_info.literals == 0.0
         assert compare_info.weighted_average == pytest.approx(0.218, 0.001)
 
+    def test_bounded_compare_works_without_structure(
+        self: Self,
+        first_features: ASTFeatures,
+        third_features: ASTFeatures,
+    ):
+        compare_info = compare_works(
+            features1=first_features, features2=third_features, threshold=60, bounded=True
+        )
+
+        assert isinstance(compare_info, FastCompareInfo)
+        assert compare_info.weighted_average * 100 < 60
+
+    def test_bounded_compare_works_with_structure(
+        self: Self, first_features: ASTFeatures, second_features: ASTFeatures
+    ):
+        compare_info = compare_works(
+            features1=first_features, features2=second_features, threshold=60, bounded=True
+        )
+
+        assert isinstance(compare_info, FullCompareInfo)
+        assert compare_info.fast == fast_compare(first_features, second_features)
+
+    def test_compare_works_with_max_depth(
+        self: Self, first_features: ASTFeatures, second_features: ASTFeatures
+    ):
+        deep_info = compare_works(first_features, second_features)
+        shallow_info = compare_works(first_features, second_features, max_depth=3)
+
+        assert isinstance(shallow_info, FullCompareInfo)
+        assert first_features.structure_view is not None
+        assert first_features.structure_view.max_depth == 3
+        assert shallow_info.structure.similarity != deep_info.structure.similarity
+
+    def test_compare_works_with_same_structure(self: Self, first_features: ASTFeatures):
+        copy = replace(first_features, filepath="copy.py")
+
+        compare_info = compare_works(first_features, copy)
+
+        assert isinstance(compare_info, FullCompareInfo)
+        assert compare_info.structure.similarity == 1.0
+        assert compare_info.fast.weighted_average == 1.0
+        assert compare_info.structure.compliance_matrix.tolist() == [
+            [[19, 19], [0, 1]],
+            [[0, 1], [8, 8]],
+        ]
+
+    @pytest.mark.parametrize("bounded", [False, True])
+    @pytest.mark.parametrize("offset", [0, 1])
+    def test_compare_works_at_threshold_boundary(
+        self: Self,
+        first_features: ASTFeatures,
+        second_features: ASTFeatures,
+        offset: int,
+        bounded: bool,
+    ):
+        weighted_average = fast_compare(first_features, second_features).weighted_average
+        threshold = int(weighted_average * 100) + offset
+
+        compare_info = compare_works(
+            first_features, second_features, threshold=threshold, bounded=bounded
+        )
+
+        if _is_below_threshold(weighted_average, threshold):
+            assert isinstance(compare_info, FastCompareInfo)
+        else:
+            assert isinstance(compare_info, FullCompareInfo)
+
+    @pytest.mark.parametrize("bounded", [False, True])
+    def test_compare_works_same_works_at_max_threshold(
+        self: Self, first_features: ASTFeatures, bounded: bool
+    ):
+        copy = replace(first_features, filepath="copy.py")
+
+        compare_info = compare_works(first_features, copy, threshold=100, bounded=bounded)
+
+        assert isinstance(compare_info, FullCompareInfo)
+
+    @pytest.mark.parametrize(
+        "value, threshold, expected_type",
+        [
+            (0.57, 57, FastCompareInfo),
+            (0.58, 58, FullCompareInfo),
+        ],
+    )
+    @pytest.mark.parametrize("bounded", [False, True])
+    def test_compare_works_uses_bounded_check(
+        self: Self,
+        mocker: MockerFixture,
+        first_features: ASTFeatures,
+        second_features: ASTFeatures,
+        value: float,
+        threshold: int,
+        expected_type: type,
+        bounded: bool,
+    ):
+        fast_compare_info = _create_fast_compare_info([value] * 4, DEFAULT_WEIGHTS)
+        mocker.patch("codeplag.algorithms.compare.fast_compare", return_value=fast_compare_info)
+        mocker.patch(
+            "codeplag.algorithms.compare.bounded_fast_compare", return_value=fast_compare_info
+        )
+
+        compare_info = compare_works(
+            first_features, second_features, threshold=threshold, bounded=bounded
+        )
+
+        assert isinstance(compare_info, expected_type)
+        assert _is_below_threshold(fast_compare_info.weighted_average, threshold) is (
+            expected_type is FastCompareInfo
+        )
+
+
+def test_is_same_structure(first_features: ASTFeatures, second_features: ASTFeatures):
+    assert is_same_structure(first_features, replace(first_features))
+    assert not is_same_structure(first_features, second_features)
+    assert not is_same_structure(
+        first_features, replace(first_features, structure=first_features.structure[:-1])
+    )
+    assert not is_same_structure(replace(first_features, sha256=""), first_features)
+
+
+def test_get_features_structure_view(first_features: ASTFeatures):
+    view = get_features_structure_view(first_features, 999)
+
+    assert view.structure is first_features.structure
+    assert get_features_structure_view(first_features, 999) is view
+
+    shallow_view = get_features_structure_view(first_features, 3)
+
+    assert shallow_view is not view
+    assert shallow_view.structure == [node for node in first_features.structure if node.depth <= 3]
+    assert first_features.structure_view is shallow_view
+
 
 class TestFastCompare:
     def test_fast_compare_with_default_weights(
@@ -54,3 +199,46 @@ class TestFastCompare:
         metrics = fast_compare(first_features, second_features, weights=(0.5, 0.6, 0.7, 0.8))
 
         assert metrics.weighted_average == pytest.approx(0.796, 0.001)
+
+
+class TestBoundedFastCompare:
+    @pytest.mark.parametrize("threshold", [10, 50, 65, 77, 78, 90])
+    def test_bounded_fast_compare_same_decision(
+        self: Self, first_features: ASTFeatures, second_features: ASTFeatures, threshold: int
+    ):
+        metrics = fast_compare(first_features, second_features)
+        bounded_metrics = bounded_fast_compare(first_features, second_features, threshold)
+
+        if metrics.weighted_average * 100 < threshold:
+            assert bounded_metrics.weighted_average * 100 < threshold
+            assert bounded_metrics.weighted_average >= metrics.weighted_average
+        else:
+            assert bounded_metrics == metrics
+
+    def test_bounded_fast_compare_stops_early(
+        self: Self, first_features: ASTFeatures, third_features: ASTFeatures
+    ):
+        metrics = bounded_fast_compare(first_features, third_features, 60)
+
+        assert metrics.jakkar == 1.0
+        assert metrics.operators == 0.0
+        assert metrics.keywords == 0.6
+        assert metrics.literals == 0.0
+
+
+@pytest.mark.parametrize(
+    "threshold, weights, expected",
+    [
+        (None, (1.0, 0.4, 0.4, 0.4), 0.0),
+        (0, (1.0, 0.4, 0.4, 0.4), 0.0),
+        (50, (1.0, 0.4, 0.4, 0.4), 0.0),
+        (65, (1.0, 0.4, 0.4, 0.4), 0.23),
+        (100, (1.0, 0.4, 0.4, 0.4), 1.0),
+        (80, (1.0, 0.0, 0.0, 0.0), 0.8),
+        (80, (0.0, 1.0, 1.0, 1.0), 0.0),
+    ],
+)
+def test_calc_min_ngrams_ratio(
+    threshold: int | None, weights: tuple[float, float, float, float], expected: float
+):
+    assert calc_min_ngrams_ratio(threshold, weights) == pytest.approx(expected)  # type: ignore
@@ -5,11 +5,22 @@ from typing_extensions import Self
 
 from codeplag.algorithms.featurebased import (
     add_not_counted,
+    compare_sections,
     counter_metric,
+    counter_metric_upper_bound,
     find_max_index,
     get_children_indexes,
+    get_ratios,
+    get_sections_boundaries,
+    get_sections_histograms,
+    get_structure_view,
+    greedy_assignment,
+    identical_compare_sections,
     matrix_value,
     op_shift_metric,
+    optimal_assignment,
+    select_candidates,
+    sparse_matrix_value,
     struct_compare,
 )
 
@@ -33,6 +44,19 @@ class TestFeaturebased(unittest.TestCase):
         self.assertEqual(res3, 0.0)
         self.assertEqual(res4, 1.0)
 
+    def test_counter_metric_upper_bound(self: Self) -> None:
+        example1 = {'a': 2, 'b': 1, 'c': 5, 'd': 7}
+        example2 = {'a': 10, 'c': 8, 'e': 2, 'f': 12}
+
+        res1 = counter_metric_upper_bound(example1, example2)
+        res2 = counter_metric_upper_bound({}, example2)
+        res3 = counter_metric_upper_bound({}, {})
+
+        self.assertEqual(res1, 0.46875)
+        self.assertGreaterEqual(res1, counter_metric(example1, example2))
+        self.assertEqual(res2, 0.0)
+        self.assertEqual(res3, 1.0)
+
     def test_op_shift_metric_normal(self: Self) -> None:
         empty_list = []
         example1 = ['+', '-', '=']
@@ -119,6 +143,42 @@ class TestFeaturebased(unittest.TestCase):
         self.assertEqual(metric3[1], 1)
         self.assertEqual(indexes3, [])
 
+    def test_matrix_value_optimal(self: Self) -> None:
+        arr = np.array([[[9, 10], [8, 10]],
+                        [[8, 10], [1, 10]]])
+
+        greedy_metric, _ = matrix_value(arr, assignment="greedy")
+        optimal_metric, indexes = matrix_value(arr, assignment="optimal")
+
+        self.assertEqual(greedy_metric, [11, 21])
+        self.assertEqual(optimal_metric, [17, 21])
+        self.assertEqual([index.tolist() for index in indexes], [[0, 1], [1, 0]])
+
+    def test_get_ratios(self: Self) -> None:
+        arr = np.array([[[1, 2], [0, 0]],
+                        [[3, 4], [5, 10]]])
+
+        self.assertEqual(get_ratios(arr).tolist(), [[0.5, 0.0], [0.75, 0.5]])
+        self.assertEqual(get_ratios(np.array([[]])).shape, (1, 0))
+
+    def test_greedy_assignment(self: Self) -> None:
+        ratios = np.array([[0.5, 0.9, 0.9],
+                           [0.9, 0.1, 0.0],
+                           [0.0, 0.0, 0.0]])
+
+        self.assertEqual(greedy_assignment(ratios), [(0, 1), (1, 0)])
+        self.assertEqual(greedy_assignment(ratios.T), [(0, 1), (1, 0)])
+        self.assertEqual(greedy_assignment(np.zeros((0, 3))), [])
+
+    def test_optimal_assignment(self: Self) -> None:
+        ratios = np.array([[0.9, 0.8, 0.1],
+                           [0.8, 0.1, 0.1]])
+
+        self.assertEqual(optimal_assignment(ratios), [(0, 1), (1, 0)])
+        self.assertEqual(optimal_assignment(ratios.T), [(0, 1), (1, 0)])
+        self.assertEqual(optimal_assignment(np.zeros((3, 3))), [(0, 0), (1, 1), (2, 2)])
+        self.assertEqual(optimal_assignment(np.zeros((0, 3))), [])
+
     def test_add_not_counted(self: Self) -> None:
         structure = [(1, 2), (2, 1), (1, 3), (2, 4),
                      (3, 5), (1, 4), (2, 2), (2, 5)]
@@ -191,3 +251,99 @@ class TestFeaturebased(unittest.TestCase):
                       (5, 7), (4, 12), (4, 12)]
         res = struct_compare(structure1, structure3)
         self.assertEqual(res, [1, 28])
+
+    def test_get_sections_histograms(self: Self) -> None:
+        structure1 = [(1, 5), (2, 7), (2, 7), (1, 9)]
+        structure2 = [(1, 9), (1, 5), (2, 8)]
+
+        res1, res2 = get_sections_histograms(structure1, [0, 3, 4],
+                                             structure2, [0, 1, 3])
+
+        self.assertEqual(res1.tolist(), [[1, 2], [1, 0]])
+        self.assertEqual(res2.tolist(), [[1, 0], [1, 1]])
+
+    def test_select_candidates(self: Self) -> None:
+        histograms1 = np.array([[1, 2, 0], [0, 0, 3]])
+        histograms2 = np.array([[0, 0, 3], [1, 1, 0], [1, 2, 0]])
+
+        res = select_candidates(histograms1, histograms2, 2)
+
+        self.assertEqual([columns.tolist() for columns in res], [[2, 1], [0, 1]])
+
+    def test_sparse_matrix_value(self: Self) -> None:
+        array = np.array([[[1, 2], [15, 20], [8, 64]],
+                          [[3, 3], [4, 8], [10, 10]]])
+        cells = {
+            (i, j): array[i][j].tolist()
+            for i in range(array.shape[0])
+            for j in range(array.shape[1])
+        }
+
+        same_struct_metric, indexes = sparse_matrix_value(cells, array.shape[:2])
+        expected_metric, expected_indexes = matrix_value(array)
+
+        self.assertEqual(same_struct_metric, expected_metric)
+        self.assertEqual([index.tolist() for index in indexes],
+                         [index.tolist() for index in expected_indexes])
+
+    def test_struct_compare_with_candidates(self: Self) -> None:
+        structure1 = [(1, 0), (2, 1), (3, 2), (3, 2),
+                      (1, 3), (2, 4), (2, 5),
+                      (1, 6), (2, 7), (3, 8), (4, 9),
+                      (1, 10)]
+        structure2 = [(1, 6), (2, 7), (3, 8), (4, 9),
+                      (1, 0), (2, 1), (3, 2),
+                      (1, 3), (2, 4), (2, 5), (2, 5)]
+        exact = struct_compare(structure1, structure2)
+        compliance_matrix = np.empty((4, 3, 2), dtype=np.int64)
+
+        res1 = struct_compare(structure1, structure2, compliance_matrix, candidates=1)
+        res2 = struct_compare(structure1, structure2, candidates=3)
+
+        self.assertEqual(res1, exact)
+        self.assertEqual(res2, exact)
+        self.assertEqual(compliance_matrix[0][1].tolist(), [3, 4])
+        self.assertEqual(compliance_matrix[0][0].tolist(), [0, 1])
+
+    def test_get_sections_boundaries(self: Self) -> None:
+        structure = [(1, 2), (2, 1), (1, 3), (2, 4), (3, 5)]
+
+        self.assertEqual(get_sections_boundaries(structure), [0, 2, 5])
+        self.assertEqual(get_sections_boundaries([]), [0])
+
+    def test_get_structure_view(self: Self) -> None:
+        structure = [(1, 2), (2, 1), (1, 3), (2, 4), (3, 5), (1, 6)]
+
+        view1 = get_structure_view(structure, 2)
+        view2 = get_structure_view(structure, 3)
+
+        self.assertEqual(view1.max_depth, 2)
+        self.assertEqual(view1.structure, [(1, 2), (2, 1), (1, 3), (2, 4), (1, 6)])
+        self.assertEqual(view1.children_indexes, [0, 2, 4, 5])
+        self.assertIs(view2.structure, structure)
+        self.assertEqual(view2.children_indexes, [0, 2, 5, 6])
+
+    def test_compare_sections(self: Self) -> None:
+        structure1 = [(1, 0), (2, 1), (3, 2), (1, 3), (2, 4), (2, 5)]
+        structure2 = [(1, 3), (2, 4), (1, 0), (2, 1), (3, 2), (3, 2)]
+
+        res = compare_sections(structure1, get_sections_boundaries(structure1),
+                               structure2, get_sections_boundaries(structure2))
+
+        self.assertEqual(res, struct_compare(structure1, structure2))
+
+    def test_identical_compare_sections(self: Self) -> None:
+        structure = [(1, 0), (2, 1), (3, 2), (1, 3), (2, 4), (2, 5), (1, 0), (2, 1), (3, 2)]
+        key_indexes = get_sections_boundaries(structure)
+        expected_matrix = np.empty((3, 3, 2), dtype=np.int64)
+        matrix = np.empty((3, 3, 2), dtype=np.int64)
+
+        expected = struct_compare(structure, structure, expected_matrix)
+        res = identical_compare_sections(key_indexes, matrix)
+
+        self.assertEqual(res, expected)
+        self.assertEqual(
+            np.diagonal(matrix).T.tolist(), np.diagonal(expected_matrix).T.tolist()
+        )
+        self.assertEqual(matrix[0][1].tolist(), [0, 1])
+        self.assertEqual(identical_compare_sections(get_sections_boundaries([])), [1, 1])
@@ -1,16 +1,30 @@
 import unittest
+from typing import Sequence
 
+import numpy as np
 from typing_extensions import Self
 
 from codeplag.algorithms.tokenbased import (
     generate_ngrams,
-    get_imprints_from_hashes,
+    get_fingerprints,
+    get_ngrams_hashes,
+    jakkar_coef_from_ngrams,
+    jakkar_coef_upper_bound,
     lcs,
     lcs_based_coeff,
+    value_fingerprints_coef,
     value_jakkar_coef,
+    winnow,
 )
 
 
+def polynomial_hash(ngram: Sequence[int]) -> int:
+    value = 0
+    for token in ngram:
+        value = value * 0x100000001B3 + token
+    return value % 2**63
+
+
 class TestTokenbased(unittest.TestCase):
     def test_generate_unique_ngrams(self: Self) -> None:
         res1 = generate_ngrams([1, 2, 3, 4, 5], 2, unique=True)
@@ -47,15 +61,15 @@ class TestTokenbased(unittest.TestCase):
     def test_generate_ngrams_and_hashit(self: Self) -> None:
         for_bigrams = [1, 2, 3, 4, 5]
         res1 = generate_ngrams(for_bigrams, 2, hashit=True)
-        wait1 = [hash(tuple(for_bigrams[i : i + 2])) for i in range(len(for_bigrams) - 1)]
+        wait1 = [polynomial_hash(for_bigrams[i : i + 2]) for i in range(len(for_bigrams) - 1)]
 
         for_trigrams = [3, 4, 7, 8, 15, 3]
         res2 = generate_ngrams(for_trigrams, 3, hashit=True)
-        wait2 = [hash(tuple(for_trigrams[i : i + 3])) for i in range(len(for_trigrams) - 2)]
+        wait2 = [polynomial_hash(for_trigrams[i : i + 3]) for i in range(len(for_trigrams) - 2)]
 
         for_fourgrams = [1, 3, 5, 7, 9, 7, 5]
         res3 = generate_ngrams(for_fourgrams, 4, hashit=True)
-        wait3 = [hash(tuple(for_fourgrams[i : i + 4])) for i in range(len(for_fourgrams) - 3)]
+        wait3 = [polynomial_hash(for_fourgrams[i : i + 4]) for i in range(len(for_fourgrams) - 3)]
 
         self.assertEqual(res1, wait1)
         self.assertEqual(res2, wait2)
@@ -64,40 +78,59 @@ class TestTokenbased(unittest.TestCase):
     def test_generate_unique_ngrams_and_hashit(self: Self) -> None:
         for_bigrams = [1, 2, 2, 2, 5]
         res1 = generate_ngrams(for_bigrams, 2, unique=True, hashit=True)
-        wait1 = {hash(tuple(for_bigrams[i : i + 2])) for i in range(len(for_bigrams) - 1)}
+        wait1 = {polynomial_hash(for_bigrams[i : i + 2]) for i in range(len(for_bigrams) - 1)}
 
         for_trigrams = [3, 4, 3, 3, 3, 3]
         res2 = generate_ngrams(for_trigrams, 3, unique=True, hashit=True)
-        wait2 = {hash(tuple(for_trigrams[i : i + 3])) for i in range(len(for_trigrams) - 2)}
+        wait2 = {polynomial_hash(for_trigrams[i : i + 3]) for i in range(len(for_trigrams) - 2)}
 
         for_fourgrams = [1, 3, 5, 7, 9, 7, 5]
         res3 = generate_ngrams(for_fourgrams, 4, unique=True, hashit=True)
-        wait3 = {hash(tuple(for_fourgrams[i : i + 4])) for i in range(len(for_fourgrams) - 3)}
+        wait3 = {polynomial_hash(for_fourgrams[i : i + 4]) for i in range(len(for_fourgrams) - 3)}
 
         self.assertEqual(res1, wait1)
         self.assertEqual(res2, wait2)
         self.assertEqual(res3, wait3)
 
-    def test_get_imprints_from_hashes(self: Self) -> None:
-        test_cases = [
-            {
-                "arguments": {"hashes": [1, 2, 3, 4, 5]},
-                "expected_result": [1, 3, 5],
-            },
-            {
-                "arguments": {"hashes": [3, 4, 7, 8, 15, 3]},
-                "expected_result": [3, 7, 15],
-            },
-            {
-                "arguments": {"hashes": [1, 3, 5, 7, 9, 7, 5, 9]},
-                "expected_result": [1, 7, 5],
-            },
-        ]
-
-        for test_case in test_cases:
-            with self.subTest(test_case=test_case):
-                result = get_imprints_from_hashes(**test_case["arguments"])
-                self.assertEqual(test_case["expected_result"], result)
+    def test_get_ngrams_hashes(self: Self) -> None:
+        tokens = [3, 1, 2, 7, 4, 5, 1, 2, 7]
+
+        res1 = get_ngrams_hashes(tokens, 3).tolist()
+        res2 = get_ngrams_hashes(tokens, 10).tolist()
+        res3 = get_ngrams_hashes([256, 1024], 1).tolist()
+        res4 = get_ngrams_hashes([700, 650, 600, 550, 500, 450, 400, 350, 300, 250], 10).tolist()
+
+        self.assertEqual(len(res1), 7)
+        # Equal N-grams have equal hashes
+        self.assertEqual(res1[1], res1[6])
+        self.assertEqual(len(set(res1)), 6)
+        self.assertEqual(res1[0], polynomial_hash([3, 1, 2]))
+        self.assertEqual(res2, [])
+        self.assertEqual(res3, [256, 1024])
+        self.assertEqual(res4, [polynomial_hash(range(700, 200, -50))])
+        self.assertLess(res4[0], 2**63)
+
+    def test_winnow(self: Self) -> None:
+        hashes = [77, 74, 42, 17, 98, 50, 17, 98, 8, 88, 67, 39, 77, 74, 42, 17, 98]
+
+        self.assertEqual(winnow(hashes, 4), [17, 17, 8, 39, 17])
+        self.assertEqual(winnow(hashes[:3], 4), [42])
+        self.assertEqual(winnow([5, 5, 5, 5], 2), [5, 5, 5])
+        self.assertEqual(winnow([], 4), [])
+        self.assertEqual(winnow(np.array(hashes, dtype=np.uint64), 4), [17, 17, 8, 39, 17])
+
+    def test_get_fingerprints(self: Self) -> None:
+        common = [3, 1, 2, 7, 4, 5, 1, 2, 7, 9]
+        tokens1 = [10, 11, 12, *common, 13]
+        tokens2 = [14, *common, 15, 16, 17, 18]
+
+        res1 = get_fingerprints(tokens1, ngrams_length=3, window=4)
+        res2 = get_fingerprints(tokens2, ngrams_length=3, window=4)
+
+        self.assertTrue(set(res1) & set(res2))
+        self.assertGreater(value_fingerprints_coef(res1, res2), 0.0)
+        self.assertEqual(value_fingerprints_coef(res1, res1), 1.0)
+        self.assertEqual(value_fingerprints_coef([], []), 0.0)
 
     def test_value_jakkar_coef(self: Self) -> None:
         res1 = value_jakkar_coef([1, 2, 3, 4, 5, 4], [1, 2, 3, 2, 5, 2])
@@ -108,6 +141,26 @@ class TestTokenbased(unittest.TestCase):
         self.assertAlmostEqual(res2, 0.286, 3)
         self.assertAlmostEqual(res3, 0.091, 3)
 
+    def test_jakkar_coef_from_ngrams(self: Self) -> None:
+        res1 = jakkar_coef_from_ngrams({(1, 2), (2, 3), (3, 4)}, {(2, 3), (3, 4), (4, 5)})
+        res2 = jakkar_coef_from_ngrams(set(), set())
+
+        self.assertEqual(res1, 0.5)
+        self.assertEqual(res2, 0.0)
+
+    def test_jakkar_coef_upper_bound(self: Self) -> None:
+        tokens1 = [3, 1, 2, 7, 4, 5, 1, 2]
+        tokens2 = [4, 5, 1, 3, 4, 6, 3, 1, 2, 3, 4, 5]
+        ngrams1 = generate_ngrams(tokens1, 3, unique=True)
+        ngrams2 = generate_ngrams(tokens2, 3, unique=True)
+
+        res1 = jakkar_coef_upper_bound(len(ngrams1), len(ngrams2))
+
+        self.assertGreaterEqual(res1, value_jakkar_coef(tokens1, tokens2))
+        self.assertEqual(res1, 0.6)
+        self.assertEqual(jakkar_coef_upper_bound(0, 5), 0.0)
+        self.assertEqual(jakkar_coef_upper_bound(0, 0), 0.0)
+
     def test_lcs(self: Self) -> None:
         res1 = lcs([1, 2, 2, 3, 1, 4], [2, 5, 3, 5, 1, 6, 4])
         res2 = lcs([1, 2, 3, 4, 5, 6, 7], [1, 3, 4, 4, 5, 7])
@@ -0,0 +1,98 @@
+import os
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from codeplag.cplag import toolchain
+from codeplag.cplag.toolchain import find_libclang_library_file, get_system_include_paths
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path) -> Path:
+    return tmp_path / "cache" / "toolchain.json"
+
+
+@pytest.fixture
+def compiler(tmp_path: Path) -> Path:
+    compiler = tmp_path / "clang++"
+    compiler.write_text("#!/bin/sh\n")
+    compiler.chmod(0o755)
+
+    return compiler
+
+
+@pytest.fixture
+def include_paths(tmp_path: Path) -> list[bytes]:
+    paths = [tmp_path / "include", tmp_path / "include" / "c++" / "12"]
+    for path in paths:
+        path.mkdir(parents=True)
+
+    return [os.fsencode(path) for path in paths]
+
+
+def test_system_include_paths_are_cached(
+    mocker: MockerFixture, cache_path: Path, compiler: Path, include_paths: list[bytes]
+):
+    system_include_paths = mocker.patch.object(
+        toolchain.ccsyspath, "system_include_paths", return_value=include_paths
+    )
+
+    for _ in range(2):
+        assert get_system_include_paths(str(compiler), cache_path) == include_paths
+    system_include_paths.assert_called_once_with(str(compiler))
+
+    # The changed compiler invalidates the cached paths
+    os.utime(compiler, ns=(0, 0))
+    system_include_paths.return_value = include_paths[:1]
+
+    assert get_system_include_paths(str(compiler), cache_path) == include_paths[:1]
+    assert system_include_paths.call_count == 2
+
+
+def test_system_include_paths_after_headers_upgrade(
+    mocker: MockerFixture, cache_path: Path, compiler: Path, include_paths: list[bytes]
+):
+    system_include_paths = mocker.patch.object(
+        toolchain.ccsyspath, "system_include_paths", return_value=include_paths
+    )
+    get_system_include_paths(str(compiler), cache_path)
+
+    os.rmdir(include_paths[1])
+    upgraded_path = include_paths[1].replace(b"12", b"13")
+    os.mkdir(upgraded_path)
+    system_include_paths.return_value = [include_paths[0], upgraded_path]
+
+    for _ in range(2):
+        assert get_system_include_paths(str(compiler), cache_path) == [
+            include_paths[0],
+            upgraded_path,
+        ]
+    assert system_include_paths.call_count == 2
+
+
+def test_system_include_paths_with_broken_cache(
+    mocker: MockerFixture, cache_path: Path, compiler: Path, include_paths: list[bytes]
+):
+    mocker.patch.object(toolchain.ccsyspath, "system_include_paths", return_value=include_paths)
+    cache_path.parent.mkdir()
+    cache_path.write_text("{")
+
+    assert get_system_include_paths(str(compiler), cache_path) == include_paths
+    assert get_system_include_paths(str(compiler), cache_path) == include_paths
+    toolchain.ccsyspath.system_include_paths.assert_called_once()
+
+
+def test_libclang_library_file_is_cached(mocker: MockerFixture, tmp_path: Path, cache_path: Path):
+    libclang = tmp_path / "lib" / "llvm-18" / "lib" / "libclang-18.so.1"
+    libclang.parent.mkdir(parents=True)
+    libclang.touch()
+    mocker.patch.object(toolchain, "LIBCLANG_DIR", tmp_path / "lib")
+
+    assert find_libclang_library_file(cache_path) == libclang
+
+    mocker.patch.object(toolchain, "LIBCLANG_DIR", tmp_path / "empty")
+    assert find_libclang_library_file(cache_path) == libclang
+
+    libclang.unlink()
+    assert find_libclang_library_file(cache_path) is None
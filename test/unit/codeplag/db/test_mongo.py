@@ -101,6 +101,72 @@ class TestReportRepository:
         )
         assert result is None
 
+    def test_report_repository_indexes(self: Self, report_repository: ReportRepository):
+        report_repository.create_indexes()
+
+        assert {
+            "first_path_1_second_path_1",
+            "second_path_1",
+            "first_sha256_1",
+            "second_sha256_1",
+            "compare_result.fast.weighted_average_-1",
+            "compare_result.structure.similarity_-1",
+        } <= set(report_repository.collection.index_information())
+
+    def test_report_repository_find_compare_infos(
+        self: Self,
+        report_repository: ReportRepository,
+        first_features: ASTFeatures,
+        second_features: ASTFeatures,
+        first_compare_result: FullCompareInfo,
+    ):
+        report_repository.write_compare_info(first_compare_result)
+        root_path = str(first_features.filepath.parent)
+
+        documents = list(report_repository.find_compare_infos(root_path, root_path))
+        assert [document["second_path"] for document in documents] == [
+            str(second_features.filepath)
+        ]
+        assert "_id" not in documents[0]
+        # The root paths are prefixes and their special characters are not a pattern
+        assert list(report_repository.find_compare_infos(root_path[1:], root_path)) == []
+        assert list(report_repository.find_compare_infos(f"{root_path}.*", root_path)) == []
+
+    @pytest.mark.parametrize(("threshold", "found"), [(80, True), (90, False)])
+    def test_report_repository_find_compare_infos_with_threshold(
+        self: Self,
+        report_repository: ReportRepository,
+        first_compare_result: FullCompareInfo,
+        threshold: int,
+        found: bool,
+    ):
+        report_repository.write_compare_info(first_compare_result)
+
+        assert len(list(report_repository.find_compare_infos(threshold=threshold))) == found
+
+    def test_report_repository_get_max_similarities(
+        self: Self,
+        report_repository: ReportRepository,
+        first_features: ASTFeatures,
+        second_features: ASTFeatures,
+        third_features: ASTFeatures,
+        first_compare_result: FullCompareInfo,
+    ):
+        report_repository.write_compare_info(first_compare_result)
+        first_path = str(first_features.filepath)
+        second_path = str(second_features.filepath)
+
+        assert report_repository.get_max_similarities([first_path], [second_path]) == {
+            first_path: first_compare_result.fast.weighted_average
+        }
+        assert report_repository.get_max_similarities([second_path], [first_path]) == {
+            second_path: first_compare_result.fast.weighted_average
+        }
+        assert (
+            report_repository.get_max_similarities([first_path], [str(third_features.filepath)])
+            == {}
+        )
+
 
 class TestFeaturesRepository:
     @pytest.fixture(scope="class")
@@ -1,13 +1,30 @@
+from concurrent.futures import Future
+
 import numpy as np
 import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
+from pytest_mock import MockerFixture
 
+from codeplag.config import DefaultSettingsConfig
 from codeplag.handlers.check import (
+    WorksComparator,
     _calc_iterations,
+    _fan_out_compare_info,
+    _get_window_starts,
+    _group_duplicates,
     compliance_matrix_to_df,
 )
-from codeplag.types import Mode
+from codeplag.types import (
+    ASTFeatures,
+    FastCompareInfo,
+    FullCompareInfo,
+    Mode,
+    NodeStructurePlace,
+    ProcessingWorks,
+    ShortOutput,
+    StructureCompareInfo,
+)
 
 
 @pytest.mark.parametrize(
@@ -29,6 +46,21 @@ def test__calc_iterations_bad():
         _calc_iterations(100, "bad_mode")  # type: ignore
 
 
+@pytest.mark.parametrize(
+    "sizes, min_ratio, expected",
+    [
+        ([], 0.5, []),
+        ([1, 2, 3, 10], 0.0, [0, 0, 0, 0]),
+        ([1, 2, 3, 10], 0.5, [0, 0, 1, 3]),
+        ([4, 4, 4, 9], 0.5, [0, 0, 0, 3]),
+        ([4, 4, 4, 9], 1.0, [0, 0, 0, 3]),
+        ([0, 0, 5], 0.3, [0, 0, 2]),
+    ],
+)
+def test__get_window_starts(sizes: list[int], min_ratio: float, expected: list[int]):
+    assert _get_window_starts(sizes, min_ratio) == expected
+
+
 def test_compliance_matrix_to_df():
     compliance_matrix = np.array([[[1, 2], [1, 10], [3, 4]], [[1, 8], [1, 4], [3, 5]]])
     heads1 = ["get_value", "set_value"]
@@ -38,3 +70,168 @@ def test_compliance_matrix_to_df():
         compliance_matrix_to_df(compliance_matrix, heads1, heads2),
         pd.DataFrame(data=[[0.5, 0.1, 0.75], [0.125, 0.25, 0.6]], index=heads1, columns=heads2),
     )
+
+
+def create_work(filepath: str, tokens: list[int], sha256: str) -> ASTFeatures:
+    return ASTFeatures(
+        filepath,
+        sha256=sha256,
+        head_nodes=[f"{filepath}_func"],
+        structure=[NodeStructurePlace(1, token) for token in tokens],
+        tokens=tokens,
+    )
+
+
+def test__group_duplicates():
+    first = create_work("first.py", [1, 2, 3], "a")
+    copy = create_work("copy.py", [1, 2, 3], "a")
+    collision = create_work("collision.py", [1, 2, 4], "a")
+    other = create_work("other.py", [1, 2], "b")
+    without_hash = create_work("without_hash.py", [1, 2, 3], "")
+
+    groups = _group_duplicates([first, other, collision, copy, without_hash])
+
+    assert groups == [[first, copy], [other], [collision], [without_hash]]
+
+
+def test__fan_out_compare_info():
+    first = create_work("a.py", [1], "a")
+    second = create_work("b.py", [1, 2], "b")
+    metrics = FullCompareInfo(
+        date="",
+        first_modify_date="",
+        first_sha256="b",
+        first_path="b_copy.py",
+        first_heads=["b_copy.py_func"],
+        second_modify_date="",
+        second_sha256="a",
+        second_path="c.py",
+        second_heads=["c.py_func"],
+        fast=FastCompareInfo(0.5, 0.5, 0.5, 0.5, 0.5, 0.5),
+        structure=StructureCompareInfo(0.5, np.array([[[1, 2], [3, 4]]])),
+    )
+
+    work1, work2, fanned_out = _fan_out_compare_info(metrics, second, first)
+
+    assert (work1, work2) == (first, second)
+    assert isinstance(fanned_out, FullCompareInfo)
+    assert (fanned_out.first_path, fanned_out.second_path) == ("a.py", "b.py")
+    assert fanned_out.first_heads == ["a.py_func"]
+    assert fanned_out.fast == metrics.fast
+    assert fanned_out.structure.compliance_matrix.tolist() == [[[1, 2]], [[3, 4]]]
+
+    fast_metrics = metrics.fast
+    assert _fan_out_compare_info(fast_metrics, second, first) == (first, second, fast_metrics)
+
+
+def test_results_are_handled_while_submitting(mocker: MockerFixture):
+    mocker.patch("codeplag.handlers.check.read_settings_conf", return_value=DefaultSettingsConfig)
+    comparator = WorksComparator("py")
+    comparator.workers = 1
+    comparator.reporter = None
+    max_pending = 0
+
+    def create_future_compare(_work1: ASTFeatures, _work2: ASTFeatures) -> Future:
+        nonlocal max_pending
+        max_pending = max(max_pending, len(pending) + 1)
+        future = Future()
+        future.set_result(FastCompareInfo(0.1, 0.1, 0.1, 0.1, 0.1, 0.1))
+        return future
+
+    mocker.patch.object(comparator, "_create_future_compare", create_future_compare)
+    handle_compare_result = mocker.spy(comparator, "_handle_compare_result")
+    works = [create_work(f"{i}.py", [i], str(i)) for i in range(6)]
+    pending: dict[Future, ProcessingWorks] = {}
+
+    for i, work1 in enumerate(works):
+        for work2 in works[:i]:
+            comparator._do_step(pending, work1, work2)
+
+    assert max_pending == 4
+    assert handle_compare_result.call_count + len(pending) == 15
+
+    comparator._handle_completed_futures(pending)
+
+    assert handle_compare_result.call_count == 15
+    assert not pending
+
+
+def create_compare_info(work1: ASTFeatures, work2: ASTFeatures) -> FullCompareInfo:
+    return FullCompareInfo(
+        date="",
+        first_modify_date=work1.modify_date,
+        first_sha256=work1.sha256,
+        first_path=work1.filepath,
+        first_heads=work1.head_nodes,
+        second_modify_date=work2.modify_date,
+        second_sha256=work2.sha256,
+        second_path=work2.filepath,
+        second_heads=work2.head_nodes,
+        fast=FastCompareInfo(0.9, 0.9, 0.9, 0.9, 0.9, 0.9),
+        structure=StructureCompareInfo(0.9, np.array([[[9, 10]]])),
+    )
+
+
+def test_handle_duplicates_of_both_works(mocker: MockerFixture):
+    mocker.patch("codeplag.handlers.check.read_settings_conf", return_value=DefaultSettingsConfig)
+    comparator = WorksComparator("py")
+    comparator.reporter = mocker.Mock()
+    comparator.short_output = ShortOutput.NO_SHOW
+    group1 = [create_work(f"{name}.py", [1, 2, 3], "a") for name in ("a", "d", "f")]
+    group2 = [create_work(f"{name}.py", [1, 2], "c") for name in ("c", "e")]
+    comparator.duplicates = {id(group1[0]): group1, id(group2[0]): group2}
+    compliance_matrix = np.array([[[1, 2], [3, 4]]])
+    metrics = create_compare_info(group1[0], group2[0])._replace(
+        structure=StructureCompareInfo(0.9, compliance_matrix)
+    )
+
+    comparator._handle_duplicates(group1[0], group2[0], metrics)
+
+    saved = {
+        (str(info.first_path), str(info.second_path)): info
+        for info in (call.args[0] for call in comparator.reporter.save_result.call_args_list)
+    }
+    assert comparator.reporter.save_result.call_count == 5
+    assert sorted(saved) == [
+        ("a.py", "e.py"),
+        ("c.py", "d.py"),
+        ("c.py", "f.py"),
+        ("d.py", "e.py"),
+        ("e.py", "f.py"),
+    ]
+    for (first_path, second_path), info in saved.items():
+        assert info.first_heads == [f"{first_path}_func"]
+        assert info.second_heads == [f"{second_path}_func"]
+        assert info.fast == metrics.fast
+        if first_path in ("c.py", "e.py"):
+            expected_matrix = compliance_matrix.transpose(1, 0, 2)
+        else:
+            expected_matrix = compliance_matrix
+        assert info.structure.compliance_matrix.tolist() == expected_matrix.tolist()
+
+
+@pytest.mark.parametrize("copy_cached", [False, True], ids=["new copy", "cached copy"])
+def test_copy_added_after_cached_check(mocker: MockerFixture, copy_cached: bool):
+    mocker.patch("codeplag.handlers.check.read_settings_conf", return_value=DefaultSettingsConfig)
+    comparator = WorksComparator("py")
+    first = create_work("a.py", [1, 2, 3], "a")
+    second = create_work("b.py", [1, 2], "b")
+    copy = create_work("c.py", [1, 2, 3], "a")
+    cache = {("a.py", "b.py"): create_compare_info(first, second)}
+    if copy_cached:
+        cache[("b.py", "c.py")] = create_compare_info(second, copy)
+    comparator.reporter = mocker.Mock()
+    comparator.reporter.get_result.side_effect = lambda work1, work2: cache.get(
+        (str(work1.filepath), str(work2.filepath))
+    )
+    comparator.duplicates = {id(first): [first, copy]}
+    create_future_compare = mocker.patch.object(comparator, "_create_future_compare")
+
+    comparator._do_step({}, first, second)
+
+    create_future_compare.assert_not_called()
+    saved = [
+        (str(call.args[0].first_path), str(call.args[0].second_path))
+        for call in comparator.reporter.save_result.call_args_list
+    ]
+    assert saved == ([] if copy_cached else [("b.py", "c.py")])
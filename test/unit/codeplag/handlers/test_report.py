@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 import pytest
 from numpy.typing import NDArray
+from pytest_mock import MockerFixture
 
 from codeplag.handlers.report import (
     CntHeadNodes,
@@ -14,6 +15,8 @@ from codeplag.handlers.report import (
     _get_resulting_same_percentages,
     _get_same_funcs,
     _replace_minimal_value,
+    _scan_same_funcs,
+    _search_sources,
     calculate_general_total_similarity,
     calculate_sources_total_similarity,
 )
@@ -70,6 +73,19 @@ def test_calculate_sources_total_similarity(
             np.array(["a.py", "b.py"]),
             18.33,
         ),
+        (
+            pd.DataFrame(
+                {
+                    "first_path": ["a.py", "b.py", "c.py", "a.py", "a.py"],
+                    "second_path": ["c.py", "d.py", "b.py", "d.py", "b.py"],
+                    "weighted_average": ["0.15", "0.1", "0.45", "0.2", "0.9"],
+                },
+                dtype=object,
+            ),
+            np.array(["a.py", "b.py"]),
+            np.array(["c.py", "d.py"]),
+            32.5,
+        ),
     ],
 )
 def test_calculate_general_total_similarity(
@@ -140,7 +156,10 @@ def test__replace_minimal_value(
         "Same functions without less threshold.",
     ],
 )
+@pytest.mark.parametrize("vectorized", [False, True], ids=["scan", "vectorized"])
 def test__get_same_funcs(
+    mocker: MockerFixture,
+    vectorized: bool,
     first_heads: list[str],
     second_heads: list[str],
     threshold: int,
@@ -156,6 +175,8 @@ def test__get_same_funcs(
             [40.0, 30.0, 20.0, 10.0, 10.0],
         ]
     )
+    if vectorized:
+        mocker.patch("codeplag.handlers.report._VECTORIZED_SAME_FUNCS_MIN_SIZE", 0)
 
     result = _get_same_funcs(
         first_heads,
@@ -168,6 +189,54 @@ def test__get_same_funcs(
     assert expected == result
 
 
+@pytest.mark.parametrize("include_funcs_less_threshold", [True, False])
+@pytest.mark.parametrize("n", [1, 3, 5])
+def test__get_same_funcs_with_equal_percents(include_funcs_less_threshold: bool, n: int):
+    rng = np.random.default_rng(0)
+    percent_matrix = rng.choice([0.0, 25.0, 50.0, 75.0, 100.0], size=(16, 24))
+    first_heads = [f"first_{i}[{i}]" for i in range(16)]
+    second_heads = [f"second_{j}[{j}]" for j in range(24)]
+
+    for heads1, heads2, matrix in (
+        (first_heads, second_heads, percent_matrix),
+        (second_heads, first_heads, percent_matrix.T),
+    ):
+        assert _get_same_funcs(
+            heads1, heads2, matrix, 50, include_funcs_less_threshold, n
+        ) == _scan_same_funcs(heads1, heads2, matrix, 50, include_funcs_less_threshold, n)
+
+
+def test__search_sources(first_compare_result: FullCompareInfo) -> None:
+    compare_df = serialize_compare_result(first_compare_result)
+    compare_df.iloc[0].first_heads = str(compare_df.iloc[0].first_heads)
+    compare_df.iloc[0].second_heads = str(compare_df.iloc[0].second_heads)
+    first_path = str(first_compare_result.first_path)
+    second_path = str(first_compare_result.second_path)
+
+    same_parts_of_all, cnt_head_nodes = _search_sources(compare_df, compare_df.iterrows, 80)
+
+    assert same_parts_of_all == {
+        first_path: {
+            second_path: {
+                "cnt_elements": 1,
+                "same_parts": {"If[7]": [SameHead(name="If[7]", percent=88.89)]},
+                "max_funcs_same_percentages": {"If[7]": 88.89},
+            }
+        },
+        second_path: {
+            first_path: {
+                "cnt_elements": 1,
+                "same_parts": {"If[7]": [SameHead(name="If[7]", percent=88.89)]},
+                "max_funcs_same_percentages": {"If[7]": 88.89},
+            }
+        },
+    }
+    assert cnt_head_nodes == {
+        first_path: len(first_compare_result.first_heads),
+        second_path: len(first_compare_result.second_heads),
+    }
+
+
 def test__get_parsed_line(first_compare_result: FullCompareInfo) -> None:
     compare_df = serialize_compare_result(first_compare_result)
     compare_df.iloc[0].first_heads = str(compare_df.iloc[0].first_heads)
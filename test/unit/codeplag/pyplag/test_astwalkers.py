@@ -0,0 +1,69 @@
+import ast
+
+import pytest
+
+from codeplag.pyplag.astwalkers import (
+    KEYWORDS_COUNTER,
+    LITERALS_COUNTER,
+    OPERATORS_COUNTER,
+    ASTWalker,
+    NodeDispatch,
+    get_node_dispatch,
+)
+from codeplag.types import ASTFeatures, NodeCodePlace, NodeStructurePlace
+
+
+@pytest.mark.parametrize(
+    "node_class, expected",
+    [
+        (
+            ast.Add,
+            NodeDispatch("Add", 1, OPERATORS_COUNTER, False, False, False, ()),
+        ),
+        (
+            ast.Return,
+            NodeDispatch("Return", 9, KEYWORDS_COUNTER, False, True, False, ("value",)),
+        ),
+        (
+            ast.Constant,
+            NodeDispatch("Constant", 27, LITERALS_COUNTER, False, True, False, ("value", "kind")),
+        ),
+        (
+            ast.Import,
+            NodeDispatch("Import", 12, None, True, True, False, ("names",)),
+        ),
+        (
+            ast.Call,
+            NodeDispatch("Call", None, None, False, True, False, ("func", "args", "keywords")),
+        ),
+    ],
+)
+def test_get_node_dispatch(node_class: type, expected: NodeDispatch):
+    dispatch = get_node_dispatch(node_class)
+
+    assert dispatch == expected
+    assert get_node_dispatch(node_class) is dispatch
+
+
+def test_ast_walker_visit():
+    tree = ast.parse("import os\n\ndef foo(a):\n    return a + 1\n")
+    features = ASTFeatures("<string>")
+    ASTWalker(features).visit(tree)
+
+    assert features.count_of_nodes == 9
+    assert features.head_nodes == ["foo[3]"]
+    assert features.operators == {"Add": 1}
+    assert features.keywords == {"FunctionDef": 1, "Return": 1}
+    assert features.literals == {"Constant": 1}
+    assert features.tokens == [12, 7, 23, 24, 9, 35, 1, 27]
+    assert features.tokens_pos[:3] == [
+        NodeCodePlace(1, 0),
+        NodeCodePlace(3, 0),
+        # 'arguments' has no position, so the previous one is repeated
+        NodeCodePlace(3, 0),
+    ]
+    assert features.structure[:3] == [
+        NodeStructurePlace(1, 0),
+        NodeStructurePlace(2, 1),
+        NodeStructurePlace(3, 2),
+    ]
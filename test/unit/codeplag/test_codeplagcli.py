@@ -6,7 +6,7 @@ from typing import Final
 
 import pytest
 
-from codeplag.codeplagcli import CodeplagCLI, DirPath, FilePath
+from codeplag.codeplagcli import CodeplagCLI, DirPath, FilePath, IntRange
 
 CWD: Final[Path] = Path(os.getcwd())
 
@@ -56,6 +56,17 @@ def test_file_path_bad(path: str):
         FilePath(path)
 
 
+@pytest.mark.parametrize("value, expected", [("0", 0), ("5", 5), ("10240", 10240)])
+def test_int_range(value: str, expected: int):
+    assert IntRange(range(0, 10241))(value) == expected
+
+
+@pytest.mark.parametrize("value", ["-1", "10241", "1.5", "bad_value"])
+def test_int_range_bad(value: str):
+    with pytest.raises(argparse.ArgumentTypeError, match="from 0 to 10240"):
+        IntRange(range(0, 10241))(value)
+
+
 @pytest.mark.parametrize(
     "args",
     [
@@ -78,6 +89,10 @@ def test_file_path_bad(path: str):
         ],
         ["check", "--extension", "py", "--files", "setup.py", "setup.py"],
         ["check", "--extension", "pypy"],
+        ["check", "--extension", "py", "--add-to-archive"],
+        ["check", "--extension", "py", "--archive", "archive.json", "--top-k", "0"],
+        ["settings", "modify", "--github-cache-size", "99999"],
+        ["settings", "modify", "--log-trace-sampling", "0"],
     ],
     ids=[
         "Twice repeated directory.",
@@ -85,6 +100,10 @@ def test_file_path_bad(path: str):
         "Twice repeated GitHub file.",
         "Twice repeated file.",
         "Invalid extension.",
+        "Adding to archive without archive.",
+        "Non-positive top-k.",
+        "Too large GitHub cache size.",
+        "Non-positive log trace sampling.",
     ],
 )
 def test_get_parsed_args_failed(args: list[str]):
@@ -10,15 +10,21 @@ from pytest_mock import MockerFixture
 from codeplag import config
 from codeplag.consts import (
     CONFIG_PATH,
+    DEFAULT_GITHUB_CACHE_SIZE,
+    DEFAULT_GITHUB_CONCURRENCY,
     DEFAULT_LANGUAGE,
     DEFAULT_LOG_LEVEL,
+    DEFAULT_LOG_TRACE_SAMPLING,
     DEFAULT_MAX_DEPTH,
     DEFAULT_MONGO_HOST,
     DEFAULT_MONGO_PORT,
     DEFAULT_MONGO_USER,
     DEFAULT_NGRAMS_LENGTH,
     DEFAULT_REPORT_EXTENSION,
+    DEFAULT_STRUCTURE_ASSIGNMENT,
+    DEFAULT_STRUCTURE_CANDIDATES,
     DEFAULT_THRESHOLD,
+    DEFAULT_WORKERS_START_METHOD,
     UTIL_NAME,
 )
 from codeplag.types import Settings
@@ -126,13 +132,19 @@ def test_read_default_settings_conf(settings_config: Settings | None):
                 "threshold": DEFAULT_THRESHOLD,
                 "max_depth": DEFAULT_MAX_DEPTH,
                 "ngrams_length": DEFAULT_NGRAMS_LENGTH,
+                "structure_candidates": DEFAULT_STRUCTURE_CANDIDATES,
+                "structure_assignment": DEFAULT_STRUCTURE_ASSIGNMENT,
                 "reports": Path("/home/bukabyka/reports"),
                 "show_progress": 0,
                 "short_output": 0,
                 "reports_extension": DEFAULT_REPORT_EXTENSION,
                 "language": DEFAULT_LANGUAGE,
                 "log_level": DEFAULT_LOG_LEVEL,
+                "log_trace_sampling": DEFAULT_LOG_TRACE_SAMPLING,
                 "workers": os.cpu_count() or 1,
+                "workers_start_method": DEFAULT_WORKERS_START_METHOD,
+                "github_concurrency": DEFAULT_GITHUB_CONCURRENCY,
+                "github_cache_size": DEFAULT_GITHUB_CACHE_SIZE,
                 "mongo_host": DEFAULT_MONGO_HOST,
                 "mongo_port": DEFAULT_MONGO_PORT,
                 "mongo_user": DEFAULT_MONGO_USER,
@@ -143,13 +155,19 @@ def test_read_default_settings_conf(settings_config: Settings | None):
                 "threshold": 99,
                 "max_depth": 6,
                 "ngrams_length": 5,
+                "structure_candidates": 3,
+                "structure_assignment": "optimal",
                 "environment": "/home/bukabyka/.env",
                 "show_progress": 1,
                 "short_output": 1,
                 "reports_extension": "json",
                 "language": "ru",
                 "log_level": "error",
+                "log_trace_sampling": 100,
                 "workers": 128,
+                "workers_start_method": "forkserver",
+                "github_concurrency": 16,
+                "github_cache_size": 64,
                 "mongo_host": "localhost",
                 "mongo_port": 27017,
                 "mongo_user": "user",
@@ -159,13 +177,19 @@ def test_read_default_settings_conf(settings_config: Settings | None):
                 "threshold": 99,
                 "max_depth": 6,
                 "ngrams_length": 5,
+                "structure_candidates": 3,
+                "structure_assignment": "optimal",
                 "environment": Path("/home/bukabyka/.env"),
                 "show_progress": 1,
                 "short_output": 1,
                 "reports_extension": "json",
                 "language": "ru",
                 "log_level": "error",
+                "log_trace_sampling": 100,
                 "workers": 128,
+                "workers_start_method": "forkserver",
+                "github_concurrency": 16,
+                "github_cache_size": 64,
                 "mongo_host": "localhost",
                 "mongo_port": 27017,
                 "mongo_user": "user",
@@ -182,13 +206,19 @@ def test_read_default_settings_conf(settings_config: Settings | None):
                 "threshold": DEFAULT_THRESHOLD,
                 "max_depth": DEFAULT_MAX_DEPTH,
                 "ngrams_length": DEFAULT_NGRAMS_LENGTH,
+                "structure_candidates": DEFAULT_STRUCTURE_CANDIDATES,
+                "structure_assignment": DEFAULT_STRUCTURE_ASSIGNMENT,
                 "reports": Path("/home/bukabyka/reports"),
                 "show_progress": 0,
                 "short_output": 2,
                 "reports_extension": DEFAULT_REPORT_EXTENSION,
                 "language": DEFAULT_LANGUAGE,
                 "log_level": DEFAULT_LOG_LEVEL,
+                "log_trace_sampling": DEFAULT_LOG_TRACE_SAMPLING,
                 "workers": os.cpu_count() or 1,
+                "workers_start_method": DEFAULT_WORKERS_START_METHOD,
+                "github_concurrency": DEFAULT_GITHUB_CONCURRENCY,
+                "github_cache_size": DEFAULT_GITHUB_CACHE_SIZE,
                 "mongo_host": DEFAULT_MONGO_HOST,
                 "mongo_port": DEFAULT_MONGO_PORT,
                 "mongo_user": DEFAULT_MONGO_USER,
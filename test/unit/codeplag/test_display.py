@@ -1,7 +1,17 @@
+import json
+
+import numpy as np
+import pandas as pd
 import pytest
 from typing_extensions import Self
 
-from codeplag.display import ComplexProgress, Progress
+from codeplag.display import (
+    ComplexProgress,
+    Progress,
+    ProgressPrinter,
+    print_compare_result,
+)
+from codeplag.types import FastCompareInfo, FullCompareInfo, StructureCompareInfo
 
 
 def create_progress(iterations: int, iteration: int = 0) -> Progress:
@@ -17,12 +27,15 @@ def create_complex_progress(
     internal_iterations: int = 0,
     internal_iteration: int = 0,
 ) -> ComplexProgress:
-    internal_progress = create_progress(internal_iterations, internal_iteration)
     complex_progress = ComplexProgress(common_iterations)
     assert complex_progress.iterations == common_iterations
-    complex_progress._ComplexProgress__internal_progresses = [internal_progress]
+    if common_iterations == 0:
+        return complex_progress
+    complex_progress.add_internal_progress(internal_iterations)
     for _ in range(common_iteration):
         complex_progress.add_internal_progress(0)
+    for _ in range(internal_iteration + 1):
+        next(complex_progress)
     return complex_progress
 
 
@@ -130,3 +143,98 @@ class TestComplexProgress:
             assert str(progress) == f"Progress: {expect_percent:.2%}"
         with pytest.raises(StopIteration):
             next(progress)
+
+    def test_completed_progress_is_exact(self: Self) -> None:
+        progress = ComplexProgress(3)
+        for internal_iterations in (2, 2, 3):
+            progress.add_internal_progress(internal_iterations)
+
+        percents = list(progress)
+
+        assert percents[-1] == 1.0
+        assert len(percents) == 8
+        with pytest.raises(StopIteration):
+            next(progress)
+
+
+class TestProgressPrinter:
+    def test_prints_records_on_percentage_change(
+        self: Self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        printer = ProgressPrinter(Progress(1000), 2)
+        assert not printer.interactive
+
+        for _ in range(999):
+            printer.update()
+
+        records = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+        assert [record["progress"] for record in records] == [0.001] + [
+            percent / 100 for percent in range(1, 100)
+        ]
+        assert records[-1]["workers"] == 2
+
+        printer.update()
+
+        records = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+        assert [record["progress"] for record in records] == [1.0]
+
+    def test_redraws_not_often_than_interval(
+        self: Self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        printer = ProgressPrinter(Progress(1000), 2, interval=3600.0)
+        printer.interactive = True
+
+        for _ in range(999):
+            printer.update()
+
+        captured = capsys.readouterr()
+        assert captured.out.count("\r") == 1
+        assert captured.out.startswith("Progress: 0.10%")
+        assert not captured.err
+
+        printer.update()
+
+        captured = capsys.readouterr()
+        assert captured.out.startswith("Progress: 100.00%")
+
+    def test_redraws_completed_complex_progress(
+        self: Self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        progress = ComplexProgress(3)
+        for internal_iterations in (2, 2, 3):
+            progress.add_internal_progress(internal_iterations)
+        printer = ProgressPrinter(progress, 2, interval=3600.0)
+        printer.interactive = True
+
+        for _ in range(7):
+            printer.update()
+
+        captured = capsys.readouterr()
+        assert captured.out.count("\r") == 2
+        assert captured.out.split("\r")[-2].startswith("Progress: 100.00%")
+
+
+def test_print_compare_result_shows_all_metrics(capsys: pytest.CaptureFixture[str]) -> None:
+    compare_info = FullCompareInfo(
+        date="",
+        first_modify_date="",
+        first_sha256="",
+        first_path="first.py",
+        first_heads=["first_func"],
+        second_modify_date="",
+        second_sha256="",
+        second_path="second.py",
+        second_heads=["second_func"],
+        fast=FastCompareInfo(0.91, 0.82, 0.73, 0.64, 0.55, 0.8),
+        structure=StructureCompareInfo(0.9, np.array([[[9, 10]]])),
+    )
+
+    print_compare_result(compare_info)
+
+    output = capsys.readouterr().out
+    assert "..." not in output
+    for metric in ("91.00%", "82.00%", "73.00%", "64.00%", "55.00%", "80.00%", "90.00%"):
+        assert metric in output
+    # The options of pandas are not changed by the printing
+    assert pd.get_option("display.float_format") is None
+    assert pd.get_option("display.max_colwidth") == 50
@@ -28,3 +28,15 @@ class TestSerialization:
         assert first_features.structure == deserialized.structure
         assert first_features.tokens == deserialized.tokens
         assert first_features.tokens_pos == deserialized.tokens_pos
+        assert first_features.fingerprints == deserialized.fingerprints
+
+    def test_deserialize_astfeatures_without_fingerprints(
+        self: Self, first_features: ASTFeatures
+    ) -> None:
+        serialized = serialize_features_to_dict(first_features)
+        del serialized["fingerprints"]
+
+        deserialized = deserialize_features_from_dict(serialized)
+
+        assert first_features.fingerprints
+        assert first_features.fingerprints == deserialized.fingerprints
@@ -1,12 +1,18 @@
+import asyncio
 import re
 from pathlib import Path
+from typing import AsyncGenerator
 from unittest.mock import MagicMock
 
 import pytest
 from pytest_mock import MockerFixture
+from typing_extensions import Self
 
 from codeplag.getfeatures import get_files_path_from_directory, set_sha256
+from codeplag.pyplag.utils import PyFeaturesGetter
 from codeplag.types import ASTFeatures, Extensions
+from webparsers.async_github_parser import AsyncGithubParser
+from webparsers.types import Commit, WorkInfo
 
 
 @pytest.fixture
@@ -95,3 +101,39 @@ class TestASTFeatures:
             features.sha256 == "4f53cda18c2baa0c0354bb5f9a3ecbe5ed12ab4d8e11ba873c2f11161202b945"
         )
         assert features.modify_date
+
+
+class FakeAsyncGithubParser(AsyncGithubParser):
+    def __init__(self: Self, files: dict[str, list[WorkInfo]]) -> None:
+        super().__init__()
+        self.files = files
+
+    async def get_files_generator_from_url(
+        self: Self, url: str, path_regexp: re.Pattern | None = None
+    ) -> AsyncGenerator[WorkInfo, None]:
+        # The files come in reverse order as if they were downloaded concurrently
+        for work_info in reversed(self.files[url]):
+            await asyncio.sleep(0)
+            yield work_info
+
+
+def test_get_from_github_urls_with_async_parser():
+    commit = Commit("sha", "2022-12-20T20:13:58Z")
+    files = {
+        "first": [
+            WorkInfo("a = 1", "https://github.com/OSLL/first/blob/main/a.py", commit),
+            WorkInfo("b = 2", "https://github.com/OSLL/first/blob/main/b.py", commit),
+        ],
+        "second": [WorkInfo("c = 3", "https://github.com/OSLL/second/blob/main/c.py", commit)],
+    }
+    getter = PyFeaturesGetter()
+    getter.set_github_parser(FakeAsyncGithubParser(files))
+
+    nested_works = getter.get_from_github_urls(["first", "second"], independent=True)
+    works = getter.get_from_github_urls(["first", "second"])
+
+    assert [[work.filepath for work in group] for group in nested_works] == [
+        [work_info.link for work_info in files["first"]],
+        [work_info.link for work_info in files["second"]],
+    ]
+    assert works == [work for group in nested_works for work in group]
@@ -0,0 +1,79 @@
+import logging
+import time
+
+import pytest
+from typing_extensions import Self
+
+from codeplag.logger import TRACE_LEVELNO, get_queue_handler, set_trace
+
+
+class ListHandler(logging.Handler):
+    def __init__(self: Self) -> None:
+        super().__init__(level=TRACE_LEVELNO)
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self: Self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def handler() -> ListHandler:
+    return ListHandler()
+
+
+@pytest.fixture
+def logger(handler: ListHandler) -> logging.Logger:
+    logger = logging.getLogger("codeplag.tests")
+    logger.propagate = False
+    logger.handlers = [handler]
+    logger.setLevel(TRACE_LEVELNO)
+    return logger
+
+
+def test_trace_disabled(logger: logging.Logger, handler: ListHandler):
+    logger.setLevel(logging.INFO)
+    set_trace(logger)
+
+    logger.trace("Compare '%s' with '%s'.", "a.py", "b.py")  # type: ignore
+
+    assert handler.records == []
+
+
+def test_trace(logger: logging.Logger, handler: ListHandler):
+    set_trace(logger)
+
+    for _ in range(3):
+        logger.trace("Compare '%s' with '%s'.", "a.py", "b.py")  # type: ignore
+
+    assert [record.getMessage() for record in handler.records] == [
+        "Compare 'a.py' with 'b.py'."
+    ] * 3
+    assert handler.records[0].funcName == "test_trace"
+
+
+def test_sampled_trace(logger: logging.Logger, handler: ListHandler):
+    set_trace(logger, 3)
+
+    for i in range(7):
+        logger.trace("Compare '%s'.", f"{i}.py")  # type: ignore
+    logger.trace("Found similarity.")  # type: ignore
+
+    assert [record.getMessage() for record in handler.records] == [
+        "Compare '0.py'.",
+        "Compare '3.py'. [2 similar records skipped]",
+        "Compare '6.py'. [2 similar records skipped]",
+        "Found similarity.",
+    ]
+
+
+def test_queue_handler(logger: logging.Logger, handler: ListHandler):
+    logger.handlers = [get_queue_handler(handler)]
+
+    logger.info("Starting searching for plagiarism ...")
+    deadline = time.monotonic() + 5.0
+    while not handler.records and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert [record.getMessage() for record in handler.records] == [
+        "Starting searching for plagiarism ..."
+    ]
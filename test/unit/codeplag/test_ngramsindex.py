@@ -0,0 +1,147 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from codeplag.algorithms.tokenbased import value_jakkar_coef
+from codeplag.featurescache import deserialize_features_from_dict
+from codeplag.ngramsindex import NgramsIndex, get_works_path
+from codeplag.types import ASTFeatures
+
+
+def create_work(filepath: str, tokens: list[int], sha256: str = "") -> ASTFeatures:
+    return ASTFeatures(filepath, sha256=sha256 or filepath, tokens=tokens)
+
+
+@pytest.fixture
+def index() -> NgramsIndex:
+    index = NgramsIndex(ngrams_length=3)
+    index.add(create_work("first.py", [1, 2, 3, 4, 5, 6, 7]))
+    index.add(create_work("second.py", [1, 2, 3, 4, 8, 9, 10]))
+    index.add(create_work("third.py", [11, 12, 13, 14, 15]))
+    return index
+
+
+def test_query_returns_most_similar(index: NgramsIndex):
+    work = create_work("query.py", [1, 2, 3, 4, 5, 6, 0])
+
+    candidates = index.query(work, top_k=5)
+
+    assert [index.get_work(candidate.work_id).filepath for candidate in candidates] == [
+        "first.py",
+        "second.py",
+    ]
+    assert candidates[0].shared == 4
+    assert candidates[0].score == value_jakkar_coef(work.tokens, [1, 2, 3, 4, 5, 6, 7])
+
+
+def test_query_limits_candidates(index: NgramsIndex):
+    candidates = index.query(create_work("query.py", [1, 2, 3, 4]), top_k=1)
+
+    assert len(candidates) == 1
+
+
+def test_query_without_hits(index: NgramsIndex):
+    assert index.query(create_work("query.py", [20, 21, 22]), top_k=5) == []
+
+
+@pytest.mark.parametrize("sha256", ["", "changed"], ids=["same", "changed"])
+def test_query_skips_archived_version_of_work(index: NgramsIndex, sha256: str):
+    work = create_work("first.py", [1, 2, 3, 4, 5, 6, 7], sha256=sha256)
+
+    candidates = index.query(work, top_k=5)
+
+    assert [index.get_work(candidate.work_id).filepath for candidate in candidates] == [
+        "second.py"
+    ]
+
+
+def test_add_replaces_changed_work(index: NgramsIndex):
+    index.add(create_work("third.py", [11, 12, 13, 14, 15]))
+    assert len(index) == 3
+
+    index.add(create_work("third.py", [1, 2, 3, 4, 5, 6, 7], sha256="changed"))
+    candidates = index.query(create_work("query.py", [11, 12, 13, 14]), top_k=5)
+
+    assert len(index) == 3
+    assert candidates == []
+
+
+def test_save_and_load(index: NgramsIndex, tmp_path: Path):
+    index.add(create_work("third.py", [16, 17, 18, 19], sha256="changed"))
+    path = tmp_path / "archive.json"
+    work = create_work("query.py", [1, 2, 3, 4, 8, 9])
+
+    index.save(path)
+    loaded = NgramsIndex.load(path)
+
+    assert len(loaded) == len(index)
+    assert loaded.ngrams_length == index.ngrams_length
+    assert [
+        (loaded.get_work(candidate.work_id).filepath, candidate.shared, candidate.score)
+        for candidate in loaded.query(work, top_k=5)
+    ] == [
+        (index.get_work(candidate.work_id).filepath, candidate.shared, candidate.score)
+        for candidate in index.query(work, top_k=5)
+    ]
+    assert loaded.get_work(2).tokens == [16, 17, 18, 19]
+
+
+def test_load_deserializes_only_requested_works(
+    index: NgramsIndex, tmp_path: Path, mocker: MockerFixture
+):
+    path = tmp_path / "archive.json"
+    index.save(path)
+    deserialize = mocker.patch(
+        "codeplag.ngramsindex.deserialize_features_from_dict",
+        side_effect=deserialize_features_from_dict,
+    )
+
+    loaded = NgramsIndex.load(path)
+    candidates = loaded.query(create_work("query.py", [1, 2, 3, 4, 5, 6, 7]), top_k=1)
+    assert deserialize.call_count == 0
+
+    work = loaded.get_work(candidates[0].work_id)
+
+    assert work.filepath == "first.py"
+    assert loaded.get_work(candidates[0].work_id) is work
+    assert deserialize.call_count == 1
+
+
+def test_save_loaded_index_to_same_path(index: NgramsIndex, tmp_path: Path):
+    path = tmp_path / "archive.json"
+    index.save(path)
+    loaded = NgramsIndex.load(path)
+    loaded.add(create_work("first.py", [20, 21, 22, 23], sha256="changed"))
+    loaded.add(create_work("fourth.py", [24, 25, 26, 27]))
+
+    loaded.save(path)
+    reloaded = NgramsIndex.load(path)
+
+    assert get_works_path(path).exists()
+    assert sorted(reloaded.get_work(work_id).filepath for work_id in range(len(reloaded))) == [
+        "first.py",
+        "fourth.py",
+        "second.py",
+        "third.py",
+    ]
+    assert loaded.get_work(2).tokens == [20, 21, 22, 23]
+    assert reloaded.get_work(2).tokens == [20, 21, 22, 23]
+    assert reloaded.get_work(0).tokens == [1, 2, 3, 4, 8, 9, 10]
+
+
+def test_load_unsupported_version(tmp_path: Path):
+    path = tmp_path / "archive.json"
+    path.write_text('{"version": 0}')
+
+    with pytest.raises(ValueError):
+        NgramsIndex.load(path)
+
+
+def test_load_without_works_file(index: NgramsIndex, tmp_path: Path):
+    path = tmp_path / "archive.json"
+    index.save(path)
+    get_works_path(path).unlink()
+
+    with pytest.raises(ValueError):
+        NgramsIndex.load(path)
@@ -0,0 +1,90 @@
+import json
+from pathlib import Path
+
+import pytest
+from typing_extensions import Self
+
+from codeplag.stats import (
+    PAIRS_COMPARED,
+    PAIRS_PRUNED,
+    STAGE_PARSE,
+    STAGE_TOTAL,
+    RunStats,
+    StatsSnapshot,
+)
+
+
+@pytest.fixture
+def stats() -> RunStats:
+    run_stats = RunStats()
+    run_stats.enable()
+    return run_stats
+
+
+class TestRunStats:
+    def test_disabled_stats_do_nothing(self: Self) -> None:
+        run_stats = RunStats()
+
+        with run_stats.timer(STAGE_PARSE):
+            pass
+        run_stats.increase(PAIRS_COMPARED)
+        run_stats.merge(StatsSnapshot(timers={STAGE_PARSE: 1.0}, counters={PAIRS_PRUNED: 1}))
+
+        assert run_stats.snapshot() == StatsSnapshot(timers={}, counters={})
+
+    def test_timer_accumulates(self: Self, stats: RunStats) -> None:
+        with stats.timer(STAGE_PARSE):
+            pass
+        first = stats.timers[STAGE_PARSE]
+        with stats.timer(STAGE_PARSE):
+            pass
+
+        assert first > 0.0
+        assert stats.timers[STAGE_PARSE] > first
+        assert STAGE_TOTAL not in stats.timers
+
+    def test_timer_accumulates_on_exception(self: Self, stats: RunStats) -> None:
+        with pytest.raises(ValueError), stats.timer(STAGE_PARSE):
+            raise ValueError
+
+        assert stats.timers[STAGE_PARSE] > 0.0
+
+    def test_increase(self: Self, stats: RunStats) -> None:
+        stats.increase(PAIRS_COMPARED)
+        stats.increase(PAIRS_COMPARED, 3)
+
+        assert stats.snapshot()["counters"] == {PAIRS_COMPARED: 4}
+
+    def test_merge(self: Self, stats: RunStats) -> None:
+        stats.increase(PAIRS_PRUNED)
+        stats.merge(
+            StatsSnapshot(timers={STAGE_PARSE: 1.5}, counters={PAIRS_PRUNED: 2, PAIRS_COMPARED: 1})
+        )
+
+        assert stats.snapshot() == StatsSnapshot(
+            timers={STAGE_PARSE: 1.5}, counters={PAIRS_PRUNED: 3, PAIRS_COMPARED: 1}
+        )
+
+    def test_reset(self: Self, stats: RunStats) -> None:
+        stats.increase(PAIRS_PRUNED)
+        with stats.timer(STAGE_PARSE):
+            pass
+        stats.reset()
+
+        assert stats.snapshot() == StatsSnapshot(timers={}, counters={})
+
+    def test_summary(self: Self, stats: RunStats) -> None:
+        stats.merge(StatsSnapshot(timers={STAGE_PARSE: 2.0}, counters={PAIRS_COMPARED: 5}))
+
+        summary = stats.summary()
+
+        assert f"{STAGE_PARSE:<20} 2.000" in summary
+        assert f"{PAIRS_COMPARED:<20} 5" in summary
+
+    def test_write_json(self: Self, stats: RunStats, tmp_path: Path) -> None:
+        stats.merge(StatsSnapshot(timers={STAGE_PARSE: 2.0}, counters={PAIRS_COMPARED: 5}))
+        path = tmp_path / "stats.json"
+
+        stats.write_json(path)
+
+        assert json.loads(path.read_text()) == stats.snapshot()
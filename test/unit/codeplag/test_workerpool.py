@@ -0,0 +1,69 @@
+import logging
+from logging.handlers import QueueHandler
+from queue import SimpleQueue
+
+import pytest
+
+from codeplag.algorithms.compare import compare_works
+from codeplag.consts import DEFAULT_STRUCTURE_ASSIGNMENT, DEFAULT_STRUCTURE_CANDIDATES
+from codeplag.logger import codeplag_logger
+from codeplag.types import ASTFeatures, CompareSettings, FastCompareInfo, FullCompareInfo
+from codeplag.workerpool import WorkerPool, _init_worker
+
+
+def create_settings(threshold: int | None) -> CompareSettings:
+    return CompareSettings(
+        3, 999, threshold, DEFAULT_STRUCTURE_CANDIDATES, DEFAULT_STRUCTURE_ASSIGNMENT
+    )
+
+
+@pytest.mark.parametrize("start_method", ["fork", "forkserver"])
+def test_compare_with_settings_of_pool(
+    start_method: str, first_features: ASTFeatures, second_features: ASTFeatures
+):
+    settings = create_settings(60)
+    expected = compare_works(first_features, second_features, *settings[:3], bounded=True)
+
+    with WorkerPool(2, start_method) as pool:  # type: ignore
+        result = pool.submit_compare(settings, first_features, second_features).result()
+        metrics, stats = pool.submit_compare(
+            settings, first_features, second_features, with_stats=True
+        ).result()
+
+    assert isinstance(result, FullCompareInfo)
+    assert result.fast == expected.fast
+    assert result.structure.compliance_matrix.tolist() == (
+        expected.structure.compliance_matrix.tolist()  # type: ignore
+    )
+    assert metrics.fast == expected.fast
+    assert stats["timers"]
+
+
+def test_pool_is_reused_until_settings_change(
+    first_features: ASTFeatures, third_features: ASTFeatures
+):
+    with WorkerPool(1, "fork") as pool:  # type: ignore
+        pool.submit_compare(create_settings(None), first_features, third_features).result()
+        executor = pool._WorkerPool__executor  # type: ignore
+        result = pool.submit_compare(
+            create_settings(None), first_features, third_features
+        ).result()
+
+        assert pool._WorkerPool__executor is executor  # type: ignore
+        assert isinstance(result, FullCompareInfo)
+
+        result = pool.submit_compare(create_settings(60), first_features, third_features).result()
+
+        assert pool._WorkerPool__executor is not executor  # type: ignore
+        assert isinstance(result, FastCompareInfo)
+
+    assert pool._WorkerPool__executor is None  # type: ignore
+
+
+def test_init_worker_drops_queue_handlers(monkeypatch: pytest.MonkeyPatch):
+    stream_handler = logging.StreamHandler()
+    monkeypatch.setattr(codeplag_logger, "handlers", [QueueHandler(SimpleQueue()), stream_handler])
+
+    _init_worker(create_settings(None))
+
+    assert codeplag_logger.handlers == [stream_handler]
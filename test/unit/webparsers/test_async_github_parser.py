@@ -0,0 +1,264 @@
+import asyncio
+import base64
+import re
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Final, Iterator
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from typing_extensions import Self
+
+from webparsers.async_github_parser import AsyncGithubParser
+from webparsers.cache import GitHubCache
+from webparsers.types import Commit, WorkInfo
+
+_OWNER: Final[str] = "OSLL"
+_REPO: Final[str] = "code-plagiarism"
+_COMMIT: Final[Commit] = Commit("zkueqwrkjsalu", "2022-12-20T20:13:58Z")
+_COMMIT_RESP: Final[dict] = {"sha": _COMMIT.sha, "commit": {"author": {"date": _COMMIT.date}}}
+_TREES: Final[dict[str, list[dict[str, str]]]] = {
+    _COMMIT.sha: [
+        {"path": "main.py", "type": "blob", "sha": "blob1"},
+        {"path": "README.md", "type": "blob", "sha": "blob2"},
+        {"path": "src", "type": "tree", "sha": "tree1"},
+    ],
+    "tree1": [
+        {"path": "utils.py", "type": "blob", "sha": "blob3"},
+        {"path": "tests.py", "type": "blob", "sha": "blob4"},
+        {"path": "lib", "type": "tree", "sha": "tree2"},
+    ],
+    "tree2": [{"path": "core.py", "type": "blob", "sha": "blob5"}],
+}
+_GH_BLOB_URL: Final[str] = f"https://github.com/{_OWNER}/{_REPO}/blob/main"
+_EXPECTED_WORKS: Final[list[WorkInfo]] = sorted(
+    WorkInfo(f"Code of {blob}", f"{_GH_BLOB_URL}{path}", _COMMIT)
+    for blob, path in [
+        ("blob1", "/main.py"),
+        ("blob3", "/src/utils.py"),
+        ("blob4", "/src/tests.py"),
+        ("blob5", "/src/lib/core.py"),
+    ]
+)
+
+
+class GitHubStub:
+    """Local HTTP server which imitates the required part of the GitHub REST API."""
+
+    def __init__(self: Self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.requests: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.rate_limited: set[str] = set()
+        self.not_modified = 0
+
+    def create_app(self: Self) -> web.Application:
+        prefix = f"/repos/{_OWNER}/{_REPO}"
+        app = web.Application(middlewares=[self.middleware])
+        app.router.add_get(f"/users/{_OWNER}", self.user)
+        app.router.add_get(f"/users/{_OWNER}/repos", self.repos)
+        app.router.add_get(prefix, self.repo)
+        app.router.add_get(f"{prefix}/branches/main", self.branch)
+        app.router.add_get(f"{prefix}/git/trees/{{sha}}", self.tree)
+        app.router.add_get(f"{prefix}/git/blobs/{{sha}}", self.blob)
+        app.router.add_get(f"{prefix}/commits", self.commits)
+        return app
+
+    @web.middleware
+    async def middleware(
+        self: Self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        self.requests.append(request.path)
+        if request.path in self.rate_limited:
+            self.rate_limited.discard(request.path)
+            return web.json_response(
+                {"message": "API rate limit exceeded"},
+                status=403,
+                headers={
+                    "X-RateLimit-Limit": "60",
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(time.time() + 0.2),
+                },
+            )
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    async def user(self: Self, _request: web.Request) -> web.Response:
+        return web.json_response({"type": "User"})
+
+    async def repos(self: Self, _request: web.Request) -> web.Response:
+        return web.json_response(
+            [{"name": _REPO, "html_url": f"https://github.com/{_OWNER}/{_REPO}"}]
+        )
+
+    async def repo(self: Self, _request: web.Request) -> web.Response:
+        return web.json_response({"default_branch": "main"})
+
+    def json_with_etag(self: Self, request: web.Request, data: Any) -> web.Response:
+        etag = f'"{request.path_qs}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response(data, headers={"ETag": etag})
+
+    async def branch(self: Self, request: web.Request) -> web.Response:
+        return self.json_with_etag(request, {"name": "main", "commit": _COMMIT_RESP})
+
+    async def tree(self: Self, request: web.Request) -> web.Response:
+        sha = request.match_info["sha"]
+        if request.query.get("recursive") is None:
+            return self.json_with_etag(request, {"tree": _TREES[sha]})
+        return self.json_with_etag(request, {"tree": list(self._walk(sha)), "truncated": False})
+
+    def _walk(self: Self, sha: str, path: str = "") -> Iterator[dict[str, str]]:
+        for node in _TREES[sha]:
+            full_node = {**node, "path": f"{path}{node['path']}"}
+            yield full_node
+            if node["type"] == "tree":
+                yield from self._walk(node["sha"], f"{full_node['path']}/")
+
+    async def blob(self: Self, request: web.Request) -> web.Response:
+        content = f"Code of {request.match_info['sha']}".encode()
+        return web.json_response({"content": base64.b64encode(content).decode()})
+
+    async def commits(self: Self, _request: web.Request) -> web.Response:
+        return web.json_response([_COMMIT_RESP])
+
+
+def run_with_stub(
+    stub: GitHubStub,
+    test: Callable[[AsyncGithubParser], Awaitable[Any]],
+    max_concurrency: int = 4,
+    branch_commits: bool = False,
+    cache: GitHubCache | None = None,
+) -> Any:
+    async def main() -> Any:
+        async with TestServer(stub.create_app()) as server:
+            parser = AsyncGithubParser(
+                file_extensions=(re.compile(r"\.py$"),),
+                max_concurrency=max_concurrency,
+                base_url=str(server.make_url("")),
+                branch_commits=branch_commits,
+                cache=cache,
+            )
+            async with parser:
+                return await test(parser)
+
+    return asyncio.run(main())
+
+
+async def collect(work_infos: AsyncIterator[WorkInfo]) -> list[WorkInfo]:
+    return sorted([work_info async for work_info in work_infos])
+
+
+class TestAsyncGithubParser:
+    def test_get_files_generator_from_repo_url(self: Self) -> None:
+        stub = GitHubStub()
+
+        works = run_with_stub(
+            stub,
+            lambda parser: collect(
+                parser.get_files_generator_from_repo_url(f"https://github.com/{_OWNER}/{_REPO}")
+            ),
+        )
+
+        assert works == _EXPECTED_WORKS
+        assert stub.requests.count(f"/repos/{_OWNER}/{_REPO}/commits") == len(_EXPECTED_WORKS)
+
+    def test_get_files_generator_from_repo_url_branch_commits(self: Self) -> None:
+        stub = GitHubStub()
+
+        works = run_with_stub(
+            stub,
+            lambda parser: collect(
+                parser.get_files_generator_from_repo_url(f"https://github.com/{_OWNER}/{_REPO}")
+            ),
+            branch_commits=True,
+        )
+
+        assert works == _EXPECTED_WORKS
+        assert f"/repos/{_OWNER}/{_REPO}/commits" not in stub.requests
+        # The repository, its branch, the whole tree and the blobs
+        assert len(stub.requests) == 2 + 1 + len(_EXPECTED_WORKS)
+
+    def test_repeated_fetching_with_cache(self: Self, tmp_path: Path) -> None:
+        stub = GitHubStub()
+
+        async def fetch_twice(parser: AsyncGithubParser) -> list[list[WorkInfo]]:
+            results = []
+            for _ in range(2):
+                stub.requests.clear()
+                results.append(
+                    await collect(
+                        parser.get_files_generator_from_repo_url(
+                            f"https://github.com/{_OWNER}/{_REPO}"
+                        )
+                    )
+                )
+            return results
+
+        results = run_with_stub(
+            stub, fetch_twice, branch_commits=True, cache=GitHubCache(tmp_path)
+        )
+
+        assert results == [_EXPECTED_WORKS, _EXPECTED_WORKS]
+        # The repository, its branch and the whole tree
+        assert len(stub.requests) == 3
+        assert stub.not_modified == 2
+
+    def test_requests_are_concurrent_and_limited(self: Self) -> None:
+        stub = GitHubStub(delay=0.02)
+
+        works = run_with_stub(
+            stub,
+            lambda parser: collect(
+                parser.get_files_generator_from_repo_url(f"https://github.com/{_OWNER}/{_REPO}")
+            ),
+            max_concurrency=3,
+        )
+
+        assert works == _EXPECTED_WORKS
+        assert stub.max_in_flight == 3
+
+    def test_waits_for_rate_limit_reset(self: Self) -> None:
+        stub = GitHubStub()
+        stub.rate_limited.add(f"/repos/{_OWNER}/{_REPO}/git/blobs/blob1")
+
+        start = time.monotonic()
+        content = run_with_stub(
+            stub, lambda parser: parser.get_file_content_by_sha(_OWNER, _REPO, "blob1")
+        )
+
+        assert content == "Code of blob1"
+        assert time.monotonic() - start >= 0.1
+        assert stub.requests.count(f"/repos/{_OWNER}/{_REPO}/git/blobs/blob1") == 2
+
+    def test_get_list_of_repos(self: Self) -> None:
+        repos = run_with_stub(GitHubStub(), lambda parser: parser.get_list_of_repos(_OWNER))
+
+        assert [repo.name for repo in repos] == [_REPO]
+
+    def test_closing_generator_cancels_requests(self: Self) -> None:
+        stub = GitHubStub(delay=0.02)
+
+        async def take_first(parser: AsyncGithubParser) -> WorkInfo:
+            generator = parser.get_files_generator_from_repo_url(
+                f"https://github.com/{_OWNER}/{_REPO}"
+            )
+            work_info = await generator.__anext__()
+            await generator.aclose()
+            return work_info
+
+        work_info = run_with_stub(stub, take_first, max_concurrency=1)
+
+        assert work_info in _EXPECTED_WORKS
+        assert stub.requests.count(f"/repos/{_OWNER}/{_REPO}/git/blobs/blob5") == 0
@@ -0,0 +1,57 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from webparsers.cache import GitHubCache
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> GitHubCache:
+    return GitHubCache(tmp_path / "github", max_size=1000)
+
+
+def test_blob(cache: GitHubCache):
+    assert cache.get_blob("a1b2c3") is None
+
+    cache.save_blob("a1b2c3", b"print('Hello')")
+
+    assert cache.get_blob("a1b2c3") == b"print('Hello')"
+    assert cache.get_blob("a1b2c4") is None
+
+
+def test_response(cache: GitHubCache):
+    url = "https://api.github.com/repos/OSLL/code-plagiarism/branches/main"
+    assert cache.get_response(url) is None
+
+    cache.save_response(url, '"etag1"', {"commit": {"sha": "a1b2c3"}})
+    cached = cache.get_response(url)
+
+    assert cached is not None
+    assert cached.etag == '"etag1"'
+    assert cached.data == {"commit": {"sha": "a1b2c3"}}
+    assert cache.get_response(f"{url}/") is None
+
+
+def test_evicts_least_recently_used(cache: GitHubCache):
+    for i in range(4):
+        cache.save_blob(f"blob{i}", b"x" * 250)
+        # The times of modification must differ on file systems with low resolution
+        os.utime(cache._get_blob_path(f"blob{i}"), (i, i))
+    cache.get_blob("blob0")
+
+    cache.save_blob("blob4", b"x" * 250)
+
+    assert [cache.get_blob(f"blob{i}") is not None for i in range(5)] == [
+        True,
+        False,
+        False,
+        True,
+        True,
+    ]
+
+
+def test_shared_between_instances(cache: GitHubCache):
+    cache.save_blob("a1b2c3", b"print('Hello')")
+
+    assert GitHubCache(cache.directory).get_blob("a1b2c3") == b"print('Hello')"
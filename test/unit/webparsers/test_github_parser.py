@@ -1,13 +1,16 @@
 import base64
 import io
 import re
+import tempfile
 import unittest
 from contextlib import redirect_stdout
+from pathlib import Path
 from typing import Final
 from unittest.mock import MagicMock, call, patch
 
 from typing_extensions import Self
 
+from webparsers.cache import GitHubCache
 from webparsers.github_parser import GitHubParser
 from webparsers.types import BranchInfo, Commit, PullRequest, Repository, WorkInfo
 
@@ -48,8 +51,10 @@ class Response:
         response_json: list | dict | None = None,
         status_code: int = 200,
         message: str | None = None,
+        headers: dict[str, str] | None = None,
     ) -> None:
         self.status_code = status_code
+        self.headers = headers if headers else {}
         self.message = message
         self.response_json = response_json if response_json else {}
         if self.message and isinstance(self.response_json, dict):
@@ -520,6 +525,31 @@ class TestGitHubParser(unittest.TestCase):
 
                 self.assertEqual(mock_send_get_request.mock_calls, test_case["send_calls"])
 
+    @patch("webparsers.github_parser.GitHubParser.send_get_request")
+    def test__get_branch_last_commit_info_with_cache(
+        self: Self, mock_send_get_request: MagicMock
+    ) -> None:
+        api_url = "/repos/OSLL/code-plagiarism/branches/main"
+        commit = {"sha": "jsfjsdkljwijer", "commit": {"author": {"date": "2022-12-29"}}}
+        mock_send_get_request.side_effect = [
+            Response({"commit": commit}, headers={"ETag": '"etag1"'}),
+            Response(status_code=304),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            parser = GitHubParser(cache=GitHubCache(Path(directory)))
+            for _ in range(2):
+                rv = parser._get_branch_last_commit_info("OSLL", "code-plagiarism", "main")
+                self.assertEqual(rv, commit)
+
+        self.assertEqual(
+            mock_send_get_request.mock_calls,
+            [
+                call(api_url, params=None, headers=None),
+                call(api_url, params=None, headers={"If-None-Match": '"etag1"'}),
+            ],
+        )
+
     @patch("webparsers.github_parser.GitHubParser.send_get_request")
     def test_get_file_content_by_sha(self: Self, mock_send_get_request: MagicMock) -> None:
         test_cases = [
@@ -563,6 +593,29 @@ class TestGitHubParser(unittest.TestCase):
 
                 self.assertEqual(mock_send_get_request.mock_calls, test_case["send_calls"])
 
+    @patch("webparsers.github_parser.GitHubParser.send_get_request")
+    def test_get_file_content_by_sha_with_cache(
+        self: Self, mock_send_get_request: MagicMock
+    ) -> None:
+        mock_send_get_request.return_value = Response(
+            {"content": base64.b64encode(b"print('Hello')").decode()}
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            parser = GitHubParser(cache=GitHubCache(Path(directory)))
+            rvs = [
+                parser.get_file_content_by_sha(
+                    "OSLL", "code-plagiarism", "kljsdfkiwe0341", _COMMIT1, "main.py"
+                )
+                for _ in range(2)
+            ]
+
+        self.assertEqual(rvs, [WorkInfo("print('Hello')", "main.py", _COMMIT1)] * 2)
+        self.assertEqual(
+            mock_send_get_request.mock_calls,
+            [call("/repos/OSLL/code-plagiarism/git/blobs/kljsdfkiwe0341")],
+        )
+
     @patch("webparsers.github_parser.GitHubParser.get_file_content_by_sha")
     @patch("webparsers.github_parser.GitHubParser.send_get_request")
     def test_get_files_generator_from_sha_commit(
@@ -794,6 +847,89 @@ class TestGitHubParser(unittest.TestCase):
                     mock_get_file_content_by_sha.mock_calls == test_case["get_file_content_calls"]
                 )
 
+    @patch("webparsers.github_parser.GitHubParser.get_file_content_by_sha")
+    @patch("webparsers.github_parser.GitHubParser.send_get_request")
+    def test_get_files_generator_from_sha_commit_branch_commits(
+        self: Self, mock_send_get_request: MagicMock, mock_get_file_content_by_sha: MagicMock
+    ) -> None:
+        _FULL_TREE = [
+            {"type": "tree", "path": "src", "sha": "jslkfjjeuwijsdmvd"},
+            {"type": "blob", "path": "src/utils.py", "sha": "uwrcbasrew94"},
+            {"type": "blob", "path": "src/tests.py", "sha": "vbuqcvxpiwe"},
+            {"type": "blob", "path": "main.py", "sha": "ixiuerjs9430"},
+            {"type": "blob", "path": "README.md", "sha": "kdfjlsfowe"},
+        ]
+        test_cases = [
+            {
+                "send_calls": [
+                    call(
+                        "/repos/OSLL/aido-auto-feedback/git/trees/zkueqwrkjsalu",
+                        params={"recursive": 1},
+                    ),
+                ],
+                "send_se": [Response({"tree": _FULL_TREE, "truncated": False})],
+            },
+            {
+                "send_calls": [
+                    call(
+                        "/repos/OSLL/aido-auto-feedback/git/trees/zkueqwrkjsalu",
+                        params={"recursive": 1},
+                    ),
+                    call(
+                        "/repos/OSLL/aido-auto-feedback/git/trees/jslkfjjeuwijsdmvd",
+                        params={"recursive": 1},
+                    ),
+                ],
+                "send_se": [
+                    Response({"tree": _FULL_TREE[:2] + _FULL_TREE[3:], "truncated": True}),
+                    Response(
+                        {
+                            "tree": [
+                                {"type": "blob", "path": "utils.py", "sha": "uwrcbasrew94"},
+                                {"type": "blob", "path": "tests.py", "sha": "vbuqcvxpiwe"},
+                            ],
+                            "truncated": False,
+                        }
+                    ),
+                ],
+            },
+        ]
+        get_file_content_calls = [
+            call(
+                "OSLL",
+                "aido-auto-feedback",
+                sha,
+                _COMMIT1,
+                f"https://github.com/OSLL/aido-auto-feedback/blob/iss76/{path}",
+            )
+            for sha, path in [
+                ("uwrcbasrew94", "src/utils.py"),
+                ("vbuqcvxpiwe", "src/tests.py"),
+            ]
+        ]
+
+        parser = GitHubParser(file_extensions=(re.compile(r"\.py$"),), branch_commits=True)
+        for test_case in test_cases:
+            mock_send_get_request.reset_mock()
+            mock_send_get_request.side_effect = test_case["send_se"]
+            mock_get_file_content_by_sha.reset_mock()
+            mock_get_file_content_by_sha.side_effect = _GET_FILE_CONTENT_RES
+
+            with self.subTest(test_case=test_case):
+                rv = list(
+                    parser.get_files_generator_from_sha_commit(
+                        owner="OSLL",
+                        repo="aido-auto-feedback",
+                        branch=_BRANCH1,
+                        sha=_BRANCH1.last_commit.sha,
+                    )
+                )
+                self.assertEqual(rv, _GET_FILE_CONTENT_RES)
+
+                assert mock_send_get_request.mock_calls == test_case["send_calls"]
+                assert mock_get_file_content_by_sha.mock_calls[:2] == get_file_content_calls
+                assert mock_get_file_content_by_sha.call_count == 3
+
     @patch("webparsers.github_parser.GitHubParser.send_get_request")
     def test_get_list_repo_branches(self: Self, mock_send_get_request: MagicMock) -> None:
         _COMMIT_DATE = "2022-12-29T10:10:41Z"